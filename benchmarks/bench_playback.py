@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Playback scheduler benchmark.
+
+Plays a synthetic sequence through an in-memory backend and reports
+throughput, scheduling lateness and inter-key jitter. No real input
+device is touched, so this runs on headless machines and in CI.
+
+Usage: python benchmarks/bench_playback.py [keys] [time_between_presses_ms] [event_gap_ms]
+"""
+
+import sys
+import os
+import time
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.key_player import KeyPlayer
+from core.output_backend import RecordingBackend
+from data.key_sequence import KeySequence, KeyAction, ActionType
+
+
+def percentile(values, fraction):
+    """Get the value at the given fraction of a sorted list."""
+    if not values:
+        return 0
+    index = min(len(values) - 1, int(fraction * len(values)))
+    return values[index]
+
+
+def run(key_count: int, time_between_presses: int, event_gap_ms: float):
+    """Run the benchmark and print a summary."""
+    sequence = KeySequence("benchmark")
+    for i in range(key_count):
+        key = chr(ord('a') + i % 26)
+        sequence.add_action(KeyAction(ActionType.KEY_PRESS, f"char:{key}", i * 0.001))
+    
+    backend = RecordingBackend()
+    player = KeyPlayer(backend=backend)
+    player.set_timing(time_between_presses)
+    player.set_event_gap(event_gap_ms)
+    
+    start = time.perf_counter()
+    player.start_playback(sequence)
+    while player.is_playing:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    
+    lateness_us = sorted(ns / 1000.0 for ns in player.get_action_lateness())
+    presses = backend.get_press_times()
+    intervals_us = [(b - a) / 1000.0 for a, b in zip(presses, presses[1:])]
+    target_us = time_between_presses * 1000.0
+    jitter_us = sorted(abs(i - target_us) for i in intervals_us)
+    drift_us = ((presses[-1] - presses[0]) / 1000.0 - target_us * (len(presses) - 1)
+                if presses else 0.0)
+    
+    print(f"keys:            {key_count}")
+    print(f"elapsed:         {elapsed:.3f} s")
+    print(f"events/sec:      {len(backend.events) / elapsed:.1f}")
+    print(f"lateness p50:    {percentile(lateness_us, 0.50):.1f} us")
+    print(f"lateness p99:    {percentile(lateness_us, 0.99):.1f} us")
+    print(f"lateness max:    {lateness_us[-1] if lateness_us else 0:.1f} us")
+    print(f"jitter p99:      {percentile(jitter_us, 0.99):.1f} us")
+    print(f"end-to-end drift: {drift_us:.1f} us")
+    print(f"timer:           {player.get_timer_accuracy()}")
+    print(f"telemetry:       {player.get_playback_stats()}")
+
+
+if __name__ == "__main__":
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    timing = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    gap = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    run(keys, timing, gap)
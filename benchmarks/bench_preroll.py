@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Pre-roll buffer cost benchmark.
+
+Measures the per-event cost of the always-on pre-roll buffer's push and
+of freezing a full buffer, then projects the CPU share for all-day
+typing. No listener or input device is involved.
+
+Usage: python benchmarks/bench_preroll.py [events] [capacity] [events_per_sec]
+"""
+
+import sys
+import os
+import time
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.preroll_buffer import PrerollBuffer
+
+
+def run(event_count: int, capacity: int, typing_rate: float):
+    """Run the benchmark and print a summary."""
+    buffer = PrerollBuffer(capacity, window_seconds=3600)
+    keys = [object() for _ in range(64)]
+    
+    start = time.perf_counter_ns()
+    for i in range(event_count):
+        buffer.push(i & 1, keys[i & 63], start + i)
+    push_ns = (time.perf_counter_ns() - start) / event_count
+    
+    start = time.perf_counter_ns()
+    events = buffer.snapshot(time.perf_counter_ns())
+    snapshot_ms = (time.perf_counter_ns() - start) / 1_000_000
+    
+    print(f"events:          {event_count}")
+    print(f"push:            {push_ns:.0f} ns/event")
+    print(f"snapshot:        {snapshot_ms:.2f} ms for {len(events)} events")
+    print(f"cpu at {typing_rate:g}/s:    {push_ns * typing_rate / 1e7:.6f} %")
+
+
+if __name__ == "__main__":
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    capacity = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    run(events, capacity, rate)
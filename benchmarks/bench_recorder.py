@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Recorder pairing benchmark.
+
+Feeds a synthetic stream of presses, auto-repeats and releases straight
+into the recorder's consumer-side handler and reports the per-event cost
+for each slice of the stream. With O(1) pairing the cost stays flat as
+the recording grows. No input device or listener is involved.
+
+Usage: python benchmarks/bench_recorder.py [events] [slices]
+"""
+
+import sys
+import os
+import time
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from pynput import keyboard
+
+from core.key_recorder import KeyRecorder
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+
+
+def synthetic_events(count: int):
+    """Yield (kind, key) events: press, one auto-repeat, release."""
+    keys = [keyboard.KeyCode.from_char(chr(ord('a') + i)) for i in range(26)]
+    pattern = (EVENT_PRESS, EVENT_PRESS, EVENT_RELEASE)
+    for i in range(count):
+        yield pattern[i % 3], keys[(i // 3) % 26]
+
+
+def run(event_count: int, slices: int):
+    """Run the benchmark and print a summary."""
+    recorder = KeyRecorder()
+    recorder.start_ns = time.perf_counter_ns()
+    slice_size = max(1, event_count // slices)
+    
+    timestamp_ns = recorder.start_ns
+    slice_start = time.perf_counter_ns()
+    costs_ns = []
+    for i, (kind, key) in enumerate(synthetic_events(event_count), 1):
+        timestamp_ns += 1000
+        recorder._process_event(kind, key, timestamp_ns)
+        if i % slice_size == 0:
+            now = time.perf_counter_ns()
+            costs_ns.append((now - slice_start) / slice_size)
+            slice_start = now
+    
+    print(f"events:          {event_count}")
+    print(f"actions:         {len(recorder.current_sequence.actions)}")
+    for index, cost in enumerate(costs_ns):
+        print(f"slice {index + 1:>2}:        {cost:.0f} ns/event")
+    if costs_ns:
+        print(f"last/first:      {costs_ns[-1] / costs_ns[0]:.2f}x")
+
+
+if __name__ == "__main__":
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    slice_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    run(events, slice_count)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+KeySequence storage benchmark.
+
+Builds the same recording two ways: as a plain list of KeyAction objects
+(the layout KeySequence used before it went columnar) and as a columnar
+KeySequence, and reports memory per action and append throughput for
+each. Memory is measured with tracemalloc, so it includes the action
+objects, their strings and the containers. It then takes the second half
+of the columnar sequence as a copied KeySequence and as a SequenceView.
+
+Usage: python benchmarks/bench_sequence.py [actions]
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from data.key_sequence import KeySequence, KeyAction, ActionType
+from data.sequence_view import SequenceView
+
+
+def synthetic_actions(count: int):
+    """Yield alternating press/release actions over 26 keys."""
+    keys = [f"char:{chr(ord('a') + i)}" for i in range(26)]
+    types = (ActionType.KEY_PRESS, ActionType.KEY_RELEASE)
+    for i in range(count):
+        yield KeyAction(types[i % 2], keys[(i // 2) % 26],
+                        timestamp_ns=i * 1_000_000, duration_ns=(i % 2) * 50_000_000)
+
+
+def build_list(count: int):
+    """Store actions the old way."""
+    actions = []
+    for action in synthetic_actions(count):
+        actions.append(action)
+    return actions
+
+
+def build_columnar(count: int):
+    """Store actions in a KeySequence."""
+    sequence = KeySequence()
+    for action in synthetic_actions(count):
+        sequence.add_action(action)
+    return sequence
+
+
+def measure(build, count: int):
+    """Get (bytes per action, actions per second) for one layout."""
+    tracemalloc.start()
+    result = build(count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    
+    start = time.perf_counter_ns()
+    build(count)
+    elapsed_ns = time.perf_counter_ns() - start
+    return size / count, count / (elapsed_ns / 1_000_000_000)
+
+
+def measure_slice(sequence: KeySequence, make):
+    """Get (bytes, milliseconds) to take the second half of a sequence."""
+    tracemalloc.start()
+    start = time.perf_counter_ns()
+    result = make(sequence, len(sequence) // 2)
+    elapsed_ns = time.perf_counter_ns() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed_ns / 1_000_000
+
+
+def copy_half(sequence: KeySequence, start: int) -> KeySequence:
+    """Copy actions into a new sequence, as sub-sequences were built before views."""
+    half = KeySequence()
+    for action in sequence.actions[start:]:
+        half.add_action(action)
+    return half
+
+
+def run(count: int):
+    """Run the benchmark and print a summary."""
+    print(f"actions:         {count}")
+    for label, build in (("list", build_list), ("columnar", build_columnar)):
+        bytes_per_action, rate = measure(build, count)
+        print(f"{label + ':':<17}{bytes_per_action:.1f} bytes/action, {rate / 1000:.0f}k appends/s")
+    
+    sequence = build_columnar(count)
+    for label, make in (("half copy", copy_half), ("half view", SequenceView)):
+        size, elapsed_ms = measure_slice(sequence, make)
+        print(f"{label + ':':<17}{size / 1024:.1f} KiB, {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -29,6 +29,7 @@ from core.key_recorder import KeyRecorder
 from core.key_player import KeyPlayer
 from core.hotkey_manager import HotkeyManager
 from data.settings import Settings
+from data.recording_journal import RecordingJournal
 from version import get_version_string
 
 
@@ -56,6 +57,7 @@ class AutoKeyboardApp:
         # Load saved settings
         self.settings.load()
         self.main_window.apply_settings(self.settings)
+        self._offer_journal_recovery()
         
     def run(self):
         """Start the application main loop."""
@@ -75,6 +77,24 @@ class AutoKeyboardApp:
         except Exception as e:
             messagebox.showerror("Error", f"Application error: {str(e)}")
             
+    def _offer_journal_recovery(self):
+        """Offer to restore a recording left in the journal by the last session."""
+        journal = self.key_recorder.journal
+        if not journal or not RecordingJournal.exists(journal.path):
+            return
+        
+        sequence = RecordingJournal.recover(journal.path)
+        if sequence and sequence.actions:
+            keep = messagebox.askyesno(
+                "Recover Recording",
+                f"An unsaved recording with {sequence.get_key_count()} keys was found. Restore it?"
+            )
+            if keep:
+                self.main_window._on_script_loaded(sequence)
+                return
+        
+        journal.discard()
+    
     def on_closing(self):
         """Handle application shutdown."""
         try:
@@ -83,7 +103,8 @@ class AutoKeyboardApp:
             
             # Stop any running operations
             self.key_recorder.stop_recording()
-            self.key_player.stop_playback()
+            self.key_recorder.stop_preroll()
+            self.key_player.shutdown()
             self.hotkey_manager.cleanup()
             
             # Close application
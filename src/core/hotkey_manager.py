@@ -20,10 +20,12 @@ class HotkeyManager:
         # Current hotkey assignments
         self.start_stop_hotkey = ""
         self.play_hotkey = ""
+        self.preroll_hotkey = ""
         
         # Callbacks
         self.on_start_stop_pressed: Optional[Callable] = None
         self.on_play_pressed: Optional[Callable] = None
+        self.on_preroll_pressed: Optional[Callable] = None
     
     def set_start_stop_hotkey(self, hotkey_str: str) -> bool:
         """Set the start/stop recording hotkey."""
@@ -47,6 +49,17 @@ class HotkeyManager:
         self._update_hotkeys()
         return True
     
+    def set_preroll_hotkey(self, hotkey_str: str) -> bool:
+        """Set the hotkey that captures the pre-roll buffer ("None" disables)."""
+        normalized = normalize_hotkey_string(hotkey_str)
+        
+        if normalized and not validate_hotkey_string(normalized):
+            return False
+        
+        self.preroll_hotkey = normalized
+        self._update_hotkeys()
+        return True
+    
     def _update_hotkeys(self):
         """Update the global hotkey listener with current assignments."""
         # Stop existing listener
@@ -72,6 +85,12 @@ class HotkeyManager:
                 hotkey_mapping[formatted_key] = self._on_play_activated
                 print(f"Registered play hotkey: {formatted_key}")
         
+        if self.preroll_hotkey and self.on_preroll_pressed:
+            formatted_key = self._format_hotkey(self.preroll_hotkey)
+            if formatted_key:
+                hotkey_mapping[formatted_key] = self._on_preroll_activated
+                print(f"Registered pre-roll hotkey: {formatted_key}")
+        
         # Start new listener if we have hotkeys
         if hotkey_mapping:
             try:
@@ -154,6 +173,15 @@ class HotkeyManager:
                 daemon=True
             ).start()
     
+    def _on_preroll_activated(self):
+        """Handle pre-roll capture hotkey activation."""
+        if self.on_preroll_pressed:
+            # Run callback in separate thread to avoid blocking
+            threading.Thread(
+                target=self.on_preroll_pressed,
+                daemon=True
+            ).start()
+    
     def start(self) -> bool:
         """Start the hotkey manager."""
         return self._update_hotkeys()
@@ -173,11 +201,13 @@ class HotkeyManager:
         """Get currently active hotkeys."""
         return {
             'start_stop': self.start_stop_hotkey,
-            'play': self.play_hotkey
+            'play': self.play_hotkey,
+            'preroll': self.preroll_hotkey
         }
     
     def is_hotkey_available(self, hotkey_str: str) -> bool:
         """Check if a hotkey string is available (not in use)."""
         normalized = normalize_hotkey_string(hotkey_str)
         return (normalized != self.start_stop_hotkey and 
-                normalized != self.play_hotkey)
+                normalized != self.play_hotkey and
+                normalized != self.preroll_hotkey)
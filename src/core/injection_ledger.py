@@ -0,0 +1,62 @@
+"""
+Ledger of key events injected by playback, so recording can ignore them.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+class InjectionLedger:
+    """Remembers injected events until the recorder's listener sees them.
+    
+    The playback backend records each event just before injecting it; the
+    recorder claims a matching event (same kind and key id, seen within
+    match_window_ms of the injection) and drops it. Unclaimed entries
+    expire, so a hook that never reports an injection cannot swallow a
+    later real key press.
+    """
+    
+    def __init__(self, match_window_ms: float = 250.0):
+        self.match_window_ns = int(match_window_ms * 1_000_000)
+        self._pending: Dict[Tuple[int, int], Deque[int]] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.claimed = 0
+    
+    def record(self, kind: int, key_id: int, injected_ns: int):
+        """Note an event about to be injected."""
+        with self._lock:
+            pending = self._pending.get((kind, key_id))
+            if pending is None:
+                pending = self._pending[(kind, key_id)] = deque()
+            pending.append(injected_ns)
+            self.recorded += 1
+    
+    def claim(self, kind: int, key_id: int, seen_ns: int) -> bool:
+        """Check whether an observed event was injected, consuming its entry."""
+        with self._lock:
+            pending = self._pending.get((kind, key_id))
+            if not pending:
+                return False
+            
+            # Forget injections the hook never reported
+            while pending and seen_ns - pending[0] > self.match_window_ns:
+                pending.popleft()
+            if pending and pending[0] <= seen_ns:
+                pending.popleft()
+                self.claimed += 1
+                return True
+            return False
+    
+    def clear(self):
+        """Forget all pending injections."""
+        with self._lock:
+            self._pending.clear()
+            self.recorded = 0
+            self.claimed = 0
+    
+    def __len__(self) -> int:
+        """Return number of injections not yet claimed."""
+        with self._lock:
+            return sum(len(pending) for pending in self._pending.values())
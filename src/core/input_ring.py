@@ -0,0 +1,71 @@
+"""
+Bounded single-producer ring buffer for raw input events.
+"""
+
+from array import array
+from typing import Callable
+
+
+class InputRingBuffer:
+    """Fixed-size ring of (kind, key, timestamp_ns) slots.
+    
+    Meant for one producer (the OS hook callback) and one consumer thread.
+    push() only writes preallocated slots and then advances the write
+    counter, so it takes no locks; the consumer only advances the read
+    counter. A full buffer drops the new event and counts it.
+    """
+    
+    def __init__(self, capacity: int = 4096):
+        self.capacity = max(2, capacity)
+        self.kinds = array('B', bytes(self.capacity))
+        self.times_ns = array('q', bytes(8 * self.capacity))
+        self.keys = [None] * self.capacity
+        self.reset()
+    
+    def reset(self):
+        """Empty the buffer and reset its counters."""
+        self.write_count = 0
+        self.read_count = 0
+        self.high_water = 0
+        self.dropped = 0
+    
+    def push(self, kind: int, key, timestamp_ns: int) -> bool:
+        """Append an event; returns False if the buffer was full."""
+        write_count = self.write_count
+        depth = write_count - self.read_count
+        if depth >= self.capacity:
+            self.dropped += 1
+            return False
+        
+        index = write_count % self.capacity
+        self.kinds[index] = kind
+        self.keys[index] = key
+        self.times_ns[index] = timestamp_ns
+        
+        # Publish the slot only after it is fully written
+        self.write_count = write_count + 1
+        if depth + 1 > self.high_water:
+            self.high_water = depth + 1
+        return True
+    
+    def drain(self, handler: Callable[[int, object, int], None]) -> int:
+        """Pass every pending event to handler(kind, key, timestamp_ns).
+        
+        Returns the number of events consumed.
+        """
+        start = read_count = self.read_count
+        write_count = self.write_count
+        while read_count < write_count:
+            index = read_count % self.capacity
+            kind = self.kinds[index]
+            key = self.keys[index]
+            timestamp_ns = self.times_ns[index]
+            self.keys[index] = None
+            read_count += 1
+            self.read_count = read_count
+            handler(kind, key, timestamp_ns)
+        return read_count - start
+    
+    def __len__(self) -> int:
+        """Return number of pending events."""
+        return self.write_count - self.read_count
@@ -3,244 +3,619 @@ Key playback functionality.
 """
 
 import time
+import queue
+import itertools
 import threading
-from typing import Callable, Optional, List
-from pynput import keyboard
-from pynput.keyboard import Controller
+from array import array
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
-from data.key_sequence import KeySequence, KeyAction, ActionType
-from utils.key_utils import parse_key_code
+from core.output_backend import OutputBackend, PynputBackend
+from core.playback_plan import (
+    PlaybackPlan, compile_sequence, compile_faithful,
+    MODE_FIXED, MODE_FAITHFUL, PLAYBACK_MODES
+)
+from core.playback_queue import PlaybackJob, PlaybackQueue
+from core.playback_scheduler import DeadlineScheduler
+from core.playback_telemetry import PlaybackTelemetry
+from core.precision_timer import PrecisionTimer
+from data.key_sequence import KeySequence
+
+
+# Playback worker commands
+CMD_PLAY = "play"
+CMD_SETTINGS = "settings"
+CMD_SHUTDOWN = "shutdown"
 
 
 class KeyPlayer:
     """Handles playback of recorded key sequences."""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[OutputBackend] = None):
         self.is_playing = False
-        self.controller = Controller()
+        self.is_paused = False
+        self.backend = backend if backend is not None else PynputBackend()
+        
+        # One long-lived worker takes commands from a queue, so starting
+        # playback never pays for thread creation
         self.playback_thread: Optional[threading.Thread] = None
+        self._commands: "queue.Queue" = queue.Queue()
+        self._stop_requested = False
+        self._idle_event = threading.Event()
+        self._idle_event.set()
+        self._resume_event = threading.Event()
+        # Guards is_playing against the queue, so a job pushed as a
+        # session ends either joins it or starts a new one
+        self._session_lock = threading.Lock()
+        
+        # Jobs waiting to play, highest priority first
+        self.job_queue = PlaybackQueue()
+        self.current_job: Optional[PlaybackJob] = None
+        self._job_ids = itertools.count(1)
+        self._preempt_requested = False
+        
+        # Wakes any scheduled wait for stop or pause
         self.stop_event = threading.Event()
+        self.timer = PrecisionTimer(self.stop_event)
+        self.scheduler = DeadlineScheduler(self.stop_event, self.timer)
+        
+        # Scheduled vs. actual time of every injected event in the last run
+        self.telemetry = PlaybackTelemetry()
+        self.last_run_stats: dict = {}
+        self.telemetry_dump_path = ""  # JSON summary, or per-event rows for .csv
+        self._batch_times = array('q')
         
         # Playback settings
         self.time_between_presses = 500  # milliseconds
         self.repeat_count = 1
         self.repeat_continuously = False
+        self.spin_margin_ms = 2.0
+        self.min_event_gap_ms = 10.0  # spacing between events in a batch
+        self.playback_mode = MODE_FIXED
+        self.playback_speed = 1.0
+        self.time_warp_enabled = False
+        self.idle_gap_threshold_ms = 2000  # gaps longer than this are clamped
+        self.idle_gap_max_ms = 500  # ...down to this
         
         # Callbacks
         self.on_playback_started: Optional[Callable] = None
         self.on_playback_stopped: Optional[Callable] = None
         self.on_playback_progress: Optional[Callable[[int, int], None]] = None
+        
+        # Start the worker up front so the first hotkey doesn't pay for it
+        self._ensure_worker()
     
     def start_playback(self, sequence: KeySequence) -> bool:
         """Start playing back a key sequence."""
         if self.is_playing or not sequence:
             return False
+        return self.enqueue_playback(sequence) is not None
+    
+    def enqueue_playback(self, sequence: KeySequence,
+                         priority: int = 0) -> Optional[int]:
+        """Queue a sequence for playback and return its job id.
+        
+        Jobs run in priority order, then in arrival order, back-to-back. A job
+        with a higher priority than the one playing preempts it after its held
+        keys are released; the preempted job resumes where it left off.
+        """
+        if not sequence:
+            return None
             
         try:
-            # Reset stop event
-            self.stop_event.clear()
-            
-            # Start playback in separate thread
-            self.playback_thread = threading.Thread(
-                target=self._playback_worker,
-                args=(sequence,),
-                daemon=True
+            self._ensure_worker()
+            job = PlaybackJob(
+                job_id=next(self._job_ids),
+                sequence=sequence,
+                priority=priority,
+                enqueued_ns=time.perf_counter_ns()
             )
+            return self._submit(job)
             
-            self.is_playing = True
-            self.playback_thread.start()
+        except Exception as e:
+            print(f"Error starting playback: {e}")
+            return None
+    
+    def start_layer(self, sequence: KeySequence, origin_ns: int) -> bool:
+        """Play a sequence once at its recorded timing, starting at origin_ns.
+        
+        The first action is injected at origin_ns (a perf_counter_ns time)
+        and every other one at its offset from it, regardless of the
+        playback mode, speed and repeat settings, so a recording made on the
+        same origin lines up with it.
+        """
+        if self.is_playing or not sequence:
+            return False
             
-            # Notify callback
-            if self.on_playback_started:
-                self.on_playback_started()
-                
+        try:
+            self._ensure_worker()
+            job = PlaybackJob(
+                job_id=next(self._job_ids),
+                sequence=sequence,
+                enqueued_ns=time.perf_counter_ns(),
+                start_at_ns=origin_ns,
+                repetitions=1,
+                plan=compile_faithful(sequence, self.time_between_presses)
+            )
+            self._submit(job)
             return True
             
         except Exception as e:
             print(f"Error starting playback: {e}")
-            self.is_playing = False
             return False
     
+    def play_range(self, sequence: KeySequence, start_ns: int,
+                   end_ns: Optional[int] = None,
+                   priority: int = 0) -> Optional[int]:
+        """Play the part of a sequence from start_ns up to end_ns once.
+        
+        Times are nanoseconds since the sequence's first action, on its
+        recorded timeline whatever the playback mode and speed. They are
+        looked up in the sequence's time index, so playback starts at the
+        first action at or after start_ns with no scan, with any key held
+        across it pressed. Keys still held at end_ns are released there.
+        Returns the job id, or None if the range is empty.
+        """
+        return self._enqueue_seek(sequence, start_ns, end_ns, 1, priority)
+    
+    def resume_from(self, sequence: KeySequence, offset_ns: int,
+                    priority: int = 0) -> Optional[int]:
+        """Play a sequence from offset_ns after its first action.
+        
+        Later repetitions, if any, start from the beginning as usual.
+        """
+        return self._enqueue_seek(sequence, offset_ns, None, 0, priority)
+    
+    def _enqueue_seek(self, sequence: KeySequence, start_ns: int, end_ns: Optional[int],
+                      repetitions: int, priority: int) -> Optional[int]:
+        """Queue a job that starts (and optionally ends) mid-plan."""
+        if not sequence:
+            return None
+        
+        try:
+            self._ensure_worker()
+            first_ns = sequence.time_at_index(0)
+            start_action = sequence.index_at_time(first_ns + max(0, start_ns))
+            end_action = len(sequence)
+            if end_ns is not None:
+                end_action = sequence.index_at_time(first_ns + end_ns)
+            if start_action >= end_action:
+                return None
+            
+            # The worker compiles the plan and finds the batches, with
+            # any settings queued before this job applied
+            job = PlaybackJob(
+                job_id=next(self._job_ids),
+                sequence=sequence,
+                priority=priority,
+                enqueued_ns=time.perf_counter_ns(),
+                repetitions=repetitions,
+                start_action=start_action,
+                end_action=end_action if end_ns is not None else -1
+            )
+            return self._submit(job)
+        
+        except Exception as e:
+            print(f"Error starting playback: {e}")
+            return None
+    
+    def _submit(self, job: PlaybackJob) -> int:
+        """Queue a job, starting a playback session or preempting as needed."""
+        with self._session_lock:
+            self.job_queue.push(job)
+            starting = not self.is_playing
+            if starting:
+                # Reset stop state
+                self.stop_event.clear()
+                self._stop_requested = False
+                self._idle_event.clear()
+                
+                self.is_playing = True
+                self._commands.put((CMD_PLAY, None))
+        
+        if starting:
+            # Notify callback
+            if self.on_playback_started:
+                self.on_playback_started()
+        else:
+            current = self.current_job
+            if current is not None and job.priority > current.priority:
+                self._preempt_requested = True
+                self.stop_event.set()
+        
+        return job.job_id
+    
     def stop_playback(self):
-        """Stop current playback."""
+        """Stop current playback and discard queued sequences."""
         if not self.is_playing:
             return
             
-        # Signal stop
+        # Signal stop; also wakes a paused worker
+        self._stop_requested = True
+        self.job_queue.clear()
         self.stop_event.set()
+        self._resume_event.set()
         
-        # Wait for thread to finish
-        if self.playback_thread and self.playback_thread.is_alive():
-            self.playback_thread.join(timeout=1.0)
-            
-        self.is_playing = False
+        # Wait for the worker to go idle
+        self._idle_event.wait(timeout=1.0)
+        
+        with self._session_lock:
+            self.is_playing = False
+        self.is_paused = False
         
         # Notify callback
         if self.on_playback_stopped:
             self.on_playback_stopped()
     
-    def _playback_worker(self, sequence: KeySequence):
-        """Worker thread for key playback."""
-        try:
-            repetitions = self.repeat_count if not self.repeat_continuously else -1
-            current_rep = 0
+    def pause_playback(self) -> bool:
+        """Pause playback at the next scheduled action."""
+        if not self.is_playing or self.is_paused:
+            return False
             
-            while (repetitions == -1 or current_rep < repetitions) and not self.stop_event.is_set():
-                # Play sequence once
-                self._play_sequence_once(sequence)
-                
-                current_rep += 1
-                
-                # Update progress
-                if self.on_playback_progress and repetitions > 0:
-                    self.on_playback_progress(current_rep, repetitions)
-                
-                # Wait between repetitions (except for last one)
-                if (repetitions == -1 or current_rep < repetitions) and not self.stop_event.is_set():
-                    self._wait_interruptible(self.time_between_presses / 1000.0)
-                    
-        except Exception as e:
-            print(f"Error in playback worker: {e}")
+        self.is_paused = True
+        self._resume_event.clear()
+        self.stop_event.set()
+        return True
+    
+    def resume_playback(self) -> bool:
+        """Resume paused playback where it left off."""
+        if not self.is_paused:
+            return False
             
-        finally:
-            self.is_playing = False
-            if self.on_playback_stopped:
-                self.on_playback_stopped()
+        self.is_paused = False
+        self._resume_event.set()
+        return True
+    
+    def update_settings(self, settings: dict):
+        """Apply playback settings on the worker before the next sequence starts."""
+        self._ensure_worker()
+        self._commands.put((CMD_SETTINGS, dict(settings)))
+    
+    def shutdown(self):
+        """Stop playback and terminate the worker thread."""
+        self.stop_playback()
+        if self.playback_thread and self.playback_thread.is_alive():
+            self._commands.put((CMD_SHUTDOWN, None))
+            self.playback_thread.join(timeout=1.0)
+        self.playback_thread = None
     
-    def _play_sequence_once(self, sequence: KeySequence):
-        """Play a sequence once."""
-        if not sequence.actions:
+    def _ensure_worker(self):
+        """Start the long-lived worker thread if it is not running."""
+        if self.playback_thread and self.playback_thread.is_alive():
             return
         
-        for i, action in enumerate(sequence.actions):
-            if self.stop_event.is_set():
+        self.playback_thread = threading.Thread(
+            target=self._worker_loop,
+            name="KeyPlayerWorker",
+            daemon=True
+        )
+        self.playback_thread.start()
+    
+    def _worker_loop(self):
+        """Worker thread: execute commands until shut down."""
+        while True:
+            command, payload = self._commands.get()
+            if command == CMD_SHUTDOWN:
                 break
-                
+            if command == CMD_SETTINGS:
+                self._apply_settings(payload)
+            if not len(self.job_queue):
+                if command == CMD_PLAY:
+                    # Stopped before the worker picked the job up
+                    self._idle_event.set()
+                continue
+            
+            # Playback session: run queued jobs back-to-back
+            self._idle_event.clear()
+            if not self.is_playing:
+                self.is_playing = True
+                if self.on_playback_started:
+                    self.on_playback_started()
+            origin_ns = None
+            drained = False
             try:
-                if action.action_type == ActionType.KEY_PRESS:
-                    # Handle key press
-                    self._play_key_action(action)
-                    
-                elif action.action_type == ActionType.DELAY:
-                    # Handle delay
-                    delay_seconds = action.duration
-                    if delay_seconds > 0:
-                        self._wait_interruptible(delay_seconds)
-                
-                # Small delay between actions if no explicit delay
-                if (i < len(sequence.actions) - 1 and 
-                    action.action_type == ActionType.KEY_PRESS and
-                    (i + 1 >= len(sequence.actions) or 
-                     sequence.actions[i + 1].action_type != ActionType.DELAY)):
-                    self._wait_interruptible(self.time_between_presses / 1000.0)
+                while not self._stop_requested:
+                    self._drain_commands()
+                    with self._session_lock:
+                        job = self.job_queue.pop()
+                        if job is None:
+                            # Ends the session atomically with the empty check;
+                            # a later submit starts a new one
+                            self.is_playing = False
+                            drained = True
+                            break
                     
+                    self.current_job = job
+                    origin_ns, finished = self._playback_worker(job, origin_ns)
+                    if not finished and not self._stop_requested:
+                        # Preempted: resume later, after the higher priority job
+                        self.job_queue.requeue(job)
+            
             except Exception as e:
-                print(f"Error playing action {i}: {e}")
-                continue
+                print(f"Error in playback worker: {e}")
+                
+            finally:
+                self.current_job = None
+                stopped_by_request = self._stop_requested
+                with self._session_lock:
+                    if not drained:
+                        # Stopped or failed: queued jobs are discarded
+                        self.job_queue.clear()
+                        self.is_playing = False
+                    self.is_paused = False
+                    ended = not self.is_playing
+                    if ended:
+                        self._idle_event.set()
+                
+                # stop_playback() notifies for itself
+                if ended and not stopped_by_request and self.on_playback_stopped:
+                    self.on_playback_stopped()
     
-    def _play_key_action(self, action: KeyAction):
-        """Play a single key action."""
-        try:
-            # Handle different key formats
-            key_code = action.key
-            
-            if key_code.startswith("combo:"):
-                # Handle key combinations like ctrl+c
-                self._play_key_combination(key_code[6:])
-            elif key_code.startswith("char:"):
-                # Single character
-                char = key_code[5:]
-                key = parse_key_code(key_code)
-                if key:
-                    self.controller.press(key)
-                    time.sleep(0.01)
-                    self.controller.release(key)
-            elif key_code.startswith("key:"):
-                # Special key
-                key = parse_key_code(key_code)
-                if key:
-                    self.controller.press(key)
-                    time.sleep(0.01)
-                    self.controller.release(key)
-            else:
-                # Fallback - try to parse normally
-                key = parse_key_code(key_code)
-                if key:
-                    self.controller.press(key)
-                    time.sleep(0.01)
-                    self.controller.release(key)
-                    
-        except Exception as e:
-            print(f"Error playing key {action.key}: {e}")
+    def _drain_commands(self):
+        """Apply commands that arrived while a job was playing."""
+        while True:
+            try:
+                command, payload = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if command == CMD_SHUTDOWN:
+                # Leave it for the main loop once the session ends
+                self._commands.put((command, payload))
+                return
+            if command == CMD_SETTINGS:
+                self._apply_settings(payload)
     
-    def _play_key_combination(self, combo_string: str):
-        """Play a key combination like ctrl+c."""
-        try:
-            parts = [part.strip().lower() for part in combo_string.split('+')]
-            
-            # Map modifier names to keys
-            modifier_map = {
-                'ctrl': keyboard.Key.ctrl,
-                'alt': keyboard.Key.alt,
-                'shift': keyboard.Key.shift,
-                'cmd': keyboard.Key.cmd,
-                'win': keyboard.Key.cmd
-            }
-            
-            # Separate modifiers and main key
-            modifiers = []
-            main_key = None
+    def _apply_settings(self, settings: dict):
+        """Apply a dictionary of playback settings through the setters."""
+        setters: Dict[str, Callable[[Any], Any]] = {
+            'time_between_presses': self.set_timing,
+            'repeat_count': self.set_repeat_count,
+            'repeat_continuously': self.set_repeat_continuously,
+            'spin_margin_ms': self.set_spin_margin,
+            'min_event_gap_ms': self.set_event_gap,
+            'playback_mode': self.set_playback_mode,
+            'playback_speed': self.set_playback_speed,
+            'telemetry_dump_path': self.set_telemetry_dump,
+        }
+        for key, value in settings.items():
+            if key in setters:
+                setters[key](value)
+        
+        # The time warp keys share one setter
+        warp_keys = ('time_warp_enabled', 'idle_gap_threshold_ms', 'idle_gap_max_ms')
+        if any(key in settings for key in warp_keys):
+            self.set_time_warp(
+                settings.get('time_warp_enabled', self.time_warp_enabled),
+                settings.get('idle_gap_threshold_ms'),
+                settings.get('idle_gap_max_ms')
+            )
+    
+    def _playback_worker(self, job: PlaybackJob,
+                         origin_ns: Optional[int] = None) -> Tuple[int, bool]:
+        """Play a job from its resume point with the current settings.
+        
+        The job's next action is scheduled at origin_ns, or now if None.
+        Returns the deadline at which the next job may start and whether the
+        job finished (False if it was stopped or preempted).
+        """
+        now_ns = time.perf_counter_ns()
+        if origin_ns is None:
+            origin_ns = now_ns
+            if job.start_at_ns and not job.started_ns:
+                origin_ns = job.start_at_ns
+        if not job.started_ns:
+            self.job_queue.record_start(job, now_ns)
+        self.telemetry.reset()
+        
+        # A preemption that raced with the end of the previous job
+        # must not interrupt this one
+        if not self._stop_requested and not self.is_paused:
+            self._preempt_requested = False
+            self.stop_event.clear()
+        next_priority = self.job_queue.peek_priority()
+        if next_priority is not None and next_priority > job.priority:
+            self._preempt_requested = True
+            self.stop_event.set()
+        
+        # Resolve the sequence once; every repetition walks the same plan
+        # shifted by one period so scheduling error never accumulates
+        if job.plan is None:
+            job.plan = self.compile_plan(job.sequence)
+            if job.start_action:
+                job.batch_index = job.plan.batch_for_action(job.start_action)
+            if job.end_action >= 0:
+                job.end_batch = job.plan.batch_for_action(job.end_action)
+        plan = job.plan
+        repetitions = job.repetitions
+        if not repetitions:
+            repetitions = -1 if self.repeat_continuously else self.repeat_count
+        end_batch = job.end_batch if job.end_batch >= 0 else len(plan.batch_offsets_ns)
+        
+        if job.batch_index >= end_batch:
+            self._finish_run()
+            return origin_ns, True
+        
+        # Anchor the timeline so the resume point falls on origin_ns
+        rep_offset_ns = job.repetition * plan.period_ns
+        self.scheduler.start(
+            origin_ns - rep_offset_ns - plan.batch_offsets_ns[job.batch_index])
+        if job.batch_index:
+            self._press_keys(plan.held_keys_after(job.batch_index))
+        
+        while ((repetitions == -1 or job.repetition < repetitions)
+               and not self._stop_requested):
+            # Play sequence once
+            job.batch_index = self._play_sequence_once(plan, rep_offset_ns,
+                                                       job.batch_index, end_batch)
+            if job.batch_index < end_batch:
+                self._finish_run()
+                return time.perf_counter_ns(), False
+            if end_batch < len(plan.batch_offsets_ns):
+                # Keys held across the end of a range are released there
+                self._release_keys(plan.held_keys_after(end_batch))
             
-            for part in parts:
-                if part in modifier_map:
-                    modifiers.append(modifier_map[part])
-                else:
-                    # This is the main key
-                    if part.startswith('f') and part[1:].isdigit():
-                        # Function key
-                        main_key = getattr(keyboard.Key, part)
-                    elif len(part) == 1:
-                        # Single character
-                        main_key = keyboard.KeyCode.from_char(part)
-                    else:
-                        # Special key
-                        special_keys = {
-                            'space': keyboard.Key.space,
-                            'enter': keyboard.Key.enter,
-                            'tab': keyboard.Key.tab,
-                            'escape': keyboard.Key.esc,
-                            'backspace': keyboard.Key.backspace,
-                            'delete': keyboard.Key.delete,
-                        }
-                        main_key = special_keys.get(part, keyboard.KeyCode.from_char(part))
+            job.repetition += 1
+            job.batch_index = 0
+            rep_offset_ns += plan.period_ns
             
-            if main_key:
-                # Press modifiers
-                for modifier in modifiers:
-                    self.controller.press(modifier)
-                    time.sleep(0.01)
-                
-                # Press main key
-                self.controller.press(main_key)
-                time.sleep(0.01)
-                self.controller.release(main_key)
+            # Update progress
+            if self.on_playback_progress and repetitions > 0:
+                self.on_playback_progress(job.repetition, repetitions)
+        
+        self._finish_run()
+        return self.scheduler.deadline(rep_offset_ns), not self._stop_requested
+    
+    def _finish_run(self):
+        """Summarize the telemetry of a run and dump it if configured."""
+        self.last_run_stats = self.telemetry.summary()
+        if self.telemetry_dump_path:
+            self.telemetry.export(self.telemetry_dump_path)
+    
+    def compile_plan(self, sequence: KeySequence) -> PlaybackPlan:
+        """Compile a sequence into a playback plan with the current settings."""
+        compile_function = compile_sequence
+        if self.playback_mode == MODE_FAITHFUL:
+            compile_function = compile_faithful
+        
+        idle_threshold_ns = idle_max_ns = 0
+        if self.time_warp_enabled:
+            idle_threshold_ns = self.idle_gap_threshold_ms * 1_000_000
+            idle_max_ns = self.idle_gap_max_ms * 1_000_000
+        
+        return compile_function(sequence, self.time_between_presses,
+                                self.playback_speed, idle_threshold_ns, idle_max_ns)
+    
+    def _play_sequence_once(self, plan: PlaybackPlan, rep_offset_ns: int,
+                            start_index: int = 0,
+                            end_index: Optional[int] = None) -> int:
+        """Play a compiled plan once, starting rep_offset_ns into the timeline.
+        
+        Plays batches start_index up to end_index (the whole plan if None).
+        Returns the index of the first batch not played, which is end_index
+        unless playback was stopped or preempted.
+        """
+        backend = self.backend
+        gap_ns = int(self.min_event_gap_ms * 1_000_000)
+        batch_offsets_ns = plan.batch_offsets_ns
+        batch_events = plan.batch_events
+        telemetry = self.telemetry
+        times = self._batch_times
+        i = start_index
+        if end_index is None:
+            end_index = len(batch_offsets_ns)
+        
+        while i < end_index:
+            if not self.scheduler.wait_until(rep_offset_ns + batch_offsets_ns[i]):
+                # Safe point: don't leave keys from faithful holds stuck down
+                held = plan.held_keys_after(i)
+                self._release_keys(held)
+                # Sit out a pause first, so a job preempting during it
+                # doesn't start until playback resumes
+                if self.is_paused:
+                    if not self._wait_while_paused():
+                        return i
+                elif not (self._stop_requested or self._preempt_requested):
+                    # Woken by a pause that ended before we saw it
+                    self.stop_event.clear()
+                    if (self.is_paused or self._stop_requested
+                            or self._preempt_requested):
+                        self.stop_event.set()
+                if self._stop_requested or self._preempt_requested:
+                    return i
+                self._press_keys(held)
+                continue
                 
-                # Release modifiers in reverse order
-                for modifier in reversed(modifiers):
-                    self.controller.release(modifier)
-                    time.sleep(0.01)
-                    
-        except Exception as e:
-            print(f"Error playing combination {combo_string}: {e}")
+            try:
+                # Everything due at this deadline goes out in one submission
+                del times[:]
+                backend.send_batch(batch_events[i], gap_ns, times)
+            except Exception as e:
+                print(f"Error playing batch {i}: {e}")
+            
+            scheduled_ns = self.scheduler.deadline(rep_offset_ns + batch_offsets_ns[i])
+            for actual_ns in times:
+                telemetry.record(scheduled_ns, actual_ns)
+                scheduled_ns += gap_ns
+            i += 1
+        
+        return i
     
-    def _wait_interruptible(self, seconds: float):
-        """Wait for specified seconds, but can be interrupted."""
-        self.stop_event.wait(timeout=seconds)
+    def _wait_while_paused(self) -> bool:
+        """Block while paused and shift the timeline by the paused time.
+        
+        Returns False if playback was stopped rather than resumed.
+        """
+        if self._stop_requested or not self.is_paused:
+            return False
+        
+        paused_at = time.perf_counter_ns()
+        self._resume_event.wait()
+        if self._stop_requested:
+            return False
+        
+        self.stop_event.clear()
+        self.scheduler.origin_ns += time.perf_counter_ns() - paused_at
+        return True
+    
+    def _press_keys(self, keys: List):
+        """Re-press keys that were released when playback paused."""
+        for key in keys:
+            try:
+                self.backend.press(key)
+            except Exception as e:
+                print(f"Error pressing key {key}: {e}")
+    
+    def _release_keys(self, keys: List):
+        """Release keys left held by an interrupted plan."""
+        for key in keys:
+            try:
+                self.backend.release(key)
+            except Exception as e:
+                print(f"Error releasing key {key}: {e}")
+    
+    def set_backend(self, backend: OutputBackend) -> bool:
+        """Set the backend used to inject key events."""
+        if self.is_playing:
+            return False
+        self.backend = backend
+        return True
     
     def set_timing(self, time_between_presses: int):
         """Set time between key presses in milliseconds."""
         self.time_between_presses = max(1, time_between_presses)
     
+    def set_spin_margin(self, margin_ms: float):
+        """Set how long before a deadline waits switch from sleeping to spinning."""
+        self.spin_margin_ms = max(0.0, float(margin_ms))
+        self.timer.spin_margin_ns = int(self.spin_margin_ms * 1_000_000)
+    
+    def set_event_gap(self, gap_ms: float):
+        """Set the minimum spacing in milliseconds between injected events."""
+        self.min_event_gap_ms = max(0.0, float(gap_ms))
+    
+    def set_playback_mode(self, mode: str) -> bool:
+        """Set the playback mode ("fixed" or "faithful")."""
+        if mode not in PLAYBACK_MODES:
+            return False
+        self.playback_mode = mode
+        return True
+    
+    def set_playback_speed(self, speed: float):
+        """Set the playback speed multiplier (0.1x to 100x)."""
+        self.playback_speed = min(100.0, max(0.1, float(speed)))
+    
+    def set_time_warp(self, enabled: bool, threshold_ms: Optional[int] = None,
+                      max_gap_ms: Optional[int] = None):
+        """Enable clamping of idle gaps longer than threshold_ms to max_gap_ms."""
+        self.time_warp_enabled = enabled
+        if threshold_ms is not None:
+            self.idle_gap_threshold_ms = max(1, int(threshold_ms))
+        if max_gap_ms is not None:
+            self.idle_gap_max_ms = max(0, int(max_gap_ms))
+    
+    def set_telemetry_dump(self, path: str):
+        """Set a file to dump playback telemetry to after each run ("" disables)."""
+        self.telemetry_dump_path = path or ""
+    
     def set_repeat_count(self, count: int):
         """Set number of repetitions."""
         self.repeat_count = max(1, count)
@@ -250,10 +625,34 @@ class KeyPlayer:
         """Set continuous repeat mode."""
         self.repeat_continuously = continuous
     
+    def get_action_lateness(self) -> List[int]:
+        """Get the lateness in ns of every event injected in the current or last run."""
+        return self.telemetry.get_lateness()
+    
+    def get_playback_stats(self) -> dict:
+        """Get lateness percentiles, max drift and events/sec of the last run."""
+        return dict(self.last_run_stats)
+    
+    def get_queue_stats(self) -> dict:
+        """Get job queue depth and wait time statistics."""
+        return self.job_queue.get_stats()
+    
+    def get_timer_accuracy(self) -> dict:
+        """Get achieved wait accuracy and spin cost for the current or last run."""
+        return self.timer.get_stats()
+    
     def get_playback_settings(self) -> dict:
         """Get current playback settings."""
         return {
             'time_between_presses': self.time_between_presses,
             'repeat_count': self.repeat_count,
-            'repeat_continuously': self.repeat_continuously
+            'repeat_continuously': self.repeat_continuously,
+            'spin_margin_ms': self.spin_margin_ms,
+            'min_event_gap_ms': self.min_event_gap_ms,
+            'playback_mode': self.playback_mode,
+            'playback_speed': self.playback_speed,
+            'time_warp_enabled': self.time_warp_enabled,
+            'idle_gap_threshold_ms': self.idle_gap_threshold_ms,
+            'idle_gap_max_ms': self.idle_gap_max_ms,
+            'telemetry_dump_path': self.telemetry_dump_path
         }
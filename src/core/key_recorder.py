@@ -4,30 +4,95 @@ Key recording functionality.
 
 import time
 import threading
-from typing import Callable, Optional, Set
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from pynput import keyboard
 
+from core.input_ring import InputRingBuffer
+from core.preroll_buffer import PrerollBuffer
+from core.recording_stats import RecordingStats
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
 from data.key_sequence import KeySequence, KeyAction, ActionType
-from utils.key_utils import get_key_code, get_key_display_name
+from core.recording_filters import (
+    RecordingFilterChain, HotkeyFilter, InjectionFilter, KeyListFilter,
+    DebounceFilter, ModifierNoiseFilter
+)
+from core.injection_ledger import InjectionLedger
+from data.key_track import KeyTrack, merge_tracks
+from data.recording_journal import RecordingJournal, DEFAULT_JOURNAL_PATH
+from utils.key_registry import key_registry, NO_KEY
 
 
 class KeyRecorder:
-    """Handles recording of key presses and releases."""
+    """Handles recording of key presses and releases.
     
-    def __init__(self):
+    The listener callback only stamps each raw key and pushes it into a
+    ring buffer; a consumer thread builds the actions, pairs releases with
+    presses and notifies callbacks, so the OS hook returns immediately.
+    """
+    
+    def __init__(self, buffer_capacity: int = 4096, poll_interval: float = 0.005):
         self.is_recording = False
         self.current_sequence = KeySequence()
         self.listener: Optional[keyboard.Listener] = None
-        self.start_time = 0.0
-        self.pressed_keys: Set[str] = set()
+        self.start_ns = 0  # perf_counter_ns origin of the recording
+        # Open presses by key id, so each release pairs in O(1)
+        self.pressed_keys: Dict[int, KeyAction] = {}
+        # Where each open press is stored, to fill in its duration
+        self._open_slots: Dict[int, Tuple[KeySequence, int]] = {}
+        self.unmatched_releases = 0
+        
+        # Ingest pipeline
+        self.input_buffer = InputRingBuffer(buffer_capacity)
+        self.poll_interval = poll_interval
+        self.consumer_thread: Optional[threading.Thread] = None
+        self._consumer_stop = threading.Event()
+        self.live_stats = RecordingStats()
+        
+        # Optional crash-safe journal; while it is on, only the most recent
+        # journal_window actions (per track, when recording tracks) are kept
+        # in memory during recording
+        self.journal: Optional[RecordingJournal] = None
+        self.journal_window = 10000
+        self._window_trimmed = False
+        
+        # Record-time compaction: collapse auto-repeat, make idle gaps
+        # explicit delays and merge very short holds into taps
+        self.compaction_enabled = False
+        self.min_hold_duration = 100  # milliseconds
+        self.idle_gap_delay_ms = 1000
+        self._reset_compaction_stats()
+        
+        # Filters applied by the consumer before events become actions
+        self.excluded_hotkeys: List[str] = []
+        self.allowed_keys: List[str] = []
+        self.denied_keys: List[str] = []
+        self.debounce_ms = 0.0
+        self.filter_modifier_noise = False
+        self.injection_ledger: Optional[InjectionLedger] = None
+        self.filters = RecordingFilterChain()
+        self._build_filters()
+        
+        # Optional multi-track recording: actions are routed by key code to
+        # named tracks on the shared clock and merged when recording stops
+        self.tracks: Dict[str, KeyTrack] = {}
+        self.default_track = "other"
+        self._track_routes: Dict[int, KeyTrack] = {}
+        
+        # Optional always-on pre-roll of recent keys, captured on demand
+        self.preroll: Optional[PrerollBuffer] = None
+        self.preroll_listener: Optional[keyboard.Listener] = None
         
         # Callbacks
         self.on_recording_started: Optional[Callable] = None
         self.on_recording_stopped: Optional[Callable] = None
         self.on_key_recorded: Optional[Callable[[KeyAction], None]] = None
     
-    def start_recording(self) -> bool:
-        """Start recording key presses."""
+    def start_recording(self, origin_ns: Optional[int] = None) -> bool:
+        """Start recording key presses.
+        
+        Timestamps are offsets from origin_ns (a perf_counter_ns time),
+        or from now if None.
+        """
         if self.is_recording:
             return False
             
@@ -35,6 +100,20 @@ class KeyRecorder:
             # Clear previous sequence
             self.current_sequence.clear()
             self.pressed_keys.clear()
+            self._open_slots.clear()
+            self.unmatched_releases = 0
+            self._reset_compaction_stats()
+            self.filters.reset()
+            self._clear_tracks()
+            self.input_buffer.reset()
+            self._window_trimmed = False
+            if self.journal:
+                self.journal.open(self.current_sequence.name)
+            if origin_ns is None:
+                origin_ns = time.perf_counter_ns()
+            self.start_ns = origin_ns
+            self.live_stats.reset(time.perf_counter_ns())
+            self._start_consumer()
             
             # Start listener
             self.listener = keyboard.Listener(
@@ -45,7 +124,6 @@ class KeyRecorder:
             
             # Mark recording state
             self.is_recording = True
-            self.start_time = time.time()
             
             # Notify callback
             if self.on_recording_started:
@@ -71,6 +149,16 @@ class KeyRecorder:
             # Mark recording state
             self.is_recording = False
             
+            # Process everything the listener captured before it stopped
+            self._stop_consumer()
+            recovered = self._close_journal()
+            if self.tracks:
+                # A trimmed recording was reloaded whole from the journal
+                if not recovered:
+                    self.current_sequence = merge_tracks(self.tracks.values(),
+                                                         self.current_sequence.name)
+                self._clear_tracks()
+            
             # Notify callback
             if self.on_recording_stopped:
                 self.on_recording_stopped()
@@ -81,31 +169,150 @@ class KeyRecorder:
             print(f"Error stopping recording: {e}")
             return self.current_sequence
     
+    def set_journal(self, enabled: bool, path: Optional[str] = None,
+                    window: Optional[int] = None):
+        """Enable or disable journaling recordings to disk."""
+        if window is not None:
+            self.journal_window = max(1, int(window))
+        if self.is_recording:
+            return
+        if enabled:
+            self.journal = RecordingJournal(path or DEFAULT_JOURNAL_PATH)
+        else:
+            self.journal = None
+    
+    def discard_journal(self):
+        """Delete the journal once its recording is saved or no longer wanted."""
+        if self.journal and not self.is_recording:
+            self.journal.discard()
+    
+    def _close_journal(self) -> bool:
+        """Finish the journal and reload a recording trimmed to the window.
+        
+        Returns True if the whole recording was reloaded into the current
+        sequence.
+        """
+        if not self.journal:
+            return False
+        
+        self.journal.close()
+        if not self._window_trimmed:
+            return False
+        
+        self._window_trimmed = False
+        recovered = RecordingJournal.recover(self.journal.path)
+        if recovered is None:
+            return False
+        self.current_sequence.actions = recovered.actions
+        return True
+    
+    def _journal_action(self, journal: RecordingJournal, action: KeyAction,
+                        sequence: KeySequence):
+        """Journal an action and keep the sequence it went to bounded by the window."""
+        journal.append(action)
+        if len(sequence) >= 2 * self.journal_window:
+            # Drop in bulk so trimming stays O(1) per action; open presses
+            # are still paired through pressed_keys
+            trimmed = len(sequence) - self.journal_window
+            sequence.delete_actions(slice(0, trimmed))
+            for key_id, (stored_in, index) in list(self._open_slots.items()):
+                if stored_in is sequence:
+                    if index >= trimmed:
+                        self._open_slots[key_id] = (stored_in, index - trimmed)
+                    else:
+                        del self._open_slots[key_id]
+            self._window_trimmed = True
+    
     def _on_key_press(self, key):
-        """Handle key press events."""
-        if not self.is_recording:
+        """Listener callback: queue a key press for the consumer."""
+        if self.is_recording:
+            self.input_buffer.push(EVENT_PRESS, key, time.perf_counter_ns())
+    
+    def _on_key_release(self, key):
+        """Listener callback: queue a key release for the consumer."""
+        if self.is_recording:
+            self.input_buffer.push(EVENT_RELEASE, key, time.perf_counter_ns())
+    
+    def _start_consumer(self):
+        """Start the thread that turns buffered events into actions."""
+        self._stop_consumer()
+        self._consumer_stop.clear()
+        self.consumer_thread = threading.Thread(
+            target=self._consume_loop,
+            name="KeyRecorderConsumer",
+            daemon=True
+        )
+        self.consumer_thread.start()
+    
+    def _stop_consumer(self):
+        """Stop the consumer thread once the buffer is drained."""
+        if self.consumer_thread and self.consumer_thread.is_alive():
+            self._consumer_stop.set()
+            self.consumer_thread.join(timeout=1.0)
+        self.consumer_thread = None
+    
+    def _consume_loop(self):
+        """Consumer thread: process buffered events until stopped."""
+        buffer = self.input_buffer
+        while not self._consumer_stop.is_set():
+            if not buffer.drain(self._process_event):
+                self._consumer_stop.wait(self.poll_interval)
+        buffer.drain(self._process_event)
+    
+    def _process_event(self, kind: int, key, timestamp_ns: int):
+        """Turn one buffered event into a recorded action."""
+        self.live_stats.record(timestamp_ns, time.perf_counter_ns(),
+                               kind == EVENT_PRESS)
+        self._record_event(kind, key, timestamp_ns)
+    
+    def _record_event(self, kind: int, key, timestamp_ns: int):
+        """Filter one event and record the actions it produces."""
+        self.raw_events += 1
+        try:
+            key_id = key_registry.id_for_key(key)
+        except Exception as e:
+            print(f"Error reading key: {e}")
             return
-            
+        
+        events = self.filters.process(kind, key_id, timestamp_ns)
+        for kind, key_id, timestamp_ns in events:
+            if kind == EVENT_PRESS:
+                self._handle_key_press(key_id, timestamp_ns)
+            else:
+                self._handle_key_release(key_id, timestamp_ns)
+    
+    def _handle_key_press(self, key_id: int, timestamp_ns: int):
+        """Handle key press events."""
         try:
-            key_code = get_key_code(key)
-            current_time = time.time()
-            relative_time = current_time - self.start_time
+            offset_ns = timestamp_ns - self.start_ns
             
             # Check if key is already pressed (avoid key repeat)
-            if key_code in self.pressed_keys:
+            if key_id in self.pressed_keys:
+                self.repeats_collapsed += 1
                 return
-                
-            self.pressed_keys.add(key_code)
             
+            # A long pause before this press becomes an explicit delay
+            idle_ns = offset_ns - self._last_action_ns
+            if (self.compaction_enabled and self.actions_recorded and
+                    idle_ns > self.idle_gap_delay_ms * 1_000_000):
+                self._add_action(KeyAction(
+                    action_type=ActionType.DELAY,
+                    key_id=NO_KEY,
+                    timestamp_ns=self._last_action_ns,
+                    duration_ns=idle_ns
+                ))
+                self.delays_inserted += 1
+                
             # Create key action
             action = KeyAction(
                 action_type=ActionType.KEY_PRESS,
-                key=key_code,
-                timestamp=relative_time
+                key_id=key_id,
+                timestamp_ns=offset_ns
             )
+            self.pressed_keys[key_id] = action
             
             # Add to sequence
-            self.current_sequence.add_action(action)
+            self._add_action(action)
             
             # Notify callback
             if self.on_key_recorded:
@@ -114,44 +321,179 @@ class KeyRecorder:
         except Exception as e:
             print(f"Error handling key press: {e}")
     
-    def _on_key_release(self, key):
+    def _handle_key_release(self, key_id: int, timestamp_ns: int):
         """Handle key release events."""
-        if not self.is_recording:
-            return
-            
         try:
-            key_code = get_key_code(key)
-            current_time = time.time()
-            relative_time = current_time - self.start_time
+            offset_ns = timestamp_ns - self.start_ns
             
-            # Remove from pressed keys
-            self.pressed_keys.discard(key_code)
-            
-            # Find corresponding press action to calculate duration
-            press_action = None
-            for action in reversed(self.current_sequence.actions):
-                if (action.action_type == ActionType.KEY_PRESS and 
-                    action.key == key_code and action.duration == 0.0):
-                    press_action = action
-                    break
+            # Pair with the open press; a release without one (e.g. the
+            # hotkey that started recording) is not recorded
+            press_action = self.pressed_keys.pop(key_id, None)
+            if press_action is None:
+                self.unmatched_releases += 1
+                return
             
             # Update press action with duration
-            if press_action:
-                press_action.duration = relative_time - press_action.timestamp
+            press_action.duration_ns = offset_ns - press_action.timestamp_ns
+            
+            # A hold shorter than min_hold_duration is recorded as a tap
+            tap = (self.compaction_enabled and
+                   press_action.duration_ns < self.min_hold_duration * 1_000_000)
+            if tap:
+                press_action.duration_ns = 0
+                self.taps_merged += 1
+            
+            slot = self._open_slots.pop(key_id, None)
+            if slot:
+                slot[0].set_duration_ns(slot[1], press_action.duration_ns)
+            if tap:
+                return
             
             # Create release action
             action = KeyAction(
                 action_type=ActionType.KEY_RELEASE,
-                key=key_code,
-                timestamp=relative_time
+                key_id=key_id,
+                timestamp_ns=offset_ns
             )
             
             # Add to sequence
-            self.current_sequence.add_action(action)
+            self._add_action(action)
             
         except Exception as e:
             print(f"Error handling key release: {e}")
     
+    def _add_action(self, action: KeyAction):
+        """Append an action to the sequence (or its track) and the journal."""
+        sequence = self.current_sequence
+        if self.tracks:
+            sequence = self._track_routes.get(action.key_id,
+                                              self.tracks[self.default_track])
+        index = sequence.add_action(action)
+        if action.action_type == ActionType.KEY_PRESS:
+            self._open_slots[action.key_id] = (sequence, index)
+        self.actions_recorded += 1
+        self._last_action_ns = action.timestamp_ns
+        journal = self.journal
+        if journal and journal.is_open:
+            self._journal_action(journal, action, sequence)
+    
+    def set_tracks(self, track_keys: Dict[str, Iterable[str]]) -> bool:
+        """Record into named tracks, each taking the given key codes.
+        
+        Keys not listed go to the default track. An empty mapping records a
+        single sequence as usual.
+        """
+        if self.is_recording:
+            return False
+        
+        self.tracks = {}
+        self._track_routes = {}
+        for name, keys in track_keys.items():
+            track = self.tracks[name] = KeyTrack(name)
+            for key_code in keys:
+                self._track_routes[key_registry.intern(key_code)] = track
+        if self.tracks and self.default_track not in self.tracks:
+            self.tracks[self.default_track] = KeyTrack(self.default_track)
+        return True
+    
+    def get_tracks(self) -> List[KeyTrack]:
+        """Get the tracks of the current or last multi-track recording.
+        
+        While recording these are the live tracks. They are emptied once
+        merged, so for a finished recording they are rebuilt on demand by
+        splitting the merged sequence along the same routes.
+        """
+        if self.is_recording or not self.tracks:
+            return list(self.tracks.values())
+        
+        tracks = {name: KeyTrack(name) for name in self.tracks}
+        routes = {key_id: tracks[track.name]
+                  for key_id, track in self._track_routes.items()}
+        default = tracks[self.default_track]
+        for action in self.current_sequence:
+            routes.get(action.key_id, default).append(action)
+        return list(tracks.values())
+    
+    def _clear_tracks(self):
+        """Empty every track, before a new recording or once merged."""
+        for track in self.tracks.values():
+            track.clear()
+    
+    def start_preroll(self, window_seconds: float = 30.0,
+                      max_events: int = 10000) -> bool:
+        """Start keeping the last window_seconds (up to max_events) of keys."""
+        self.stop_preroll()
+        try:
+            self.preroll = PrerollBuffer(max_events, window_seconds)
+            self.preroll_listener = keyboard.Listener(
+                on_press=self._on_preroll_press,
+                on_release=self._on_preroll_release
+            )
+            self.preroll_listener.start()
+            return True
+        
+        except Exception as e:
+            print(f"Error starting pre-roll: {e}")
+            self.preroll = None
+            self.preroll_listener = None
+            return False
+    
+    def stop_preroll(self):
+        """Stop the pre-roll listener and free its buffer."""
+        if self.preroll_listener:
+            try:
+                self.preroll_listener.stop()
+            except Exception as e:
+                print(f"Error stopping pre-roll: {e}")
+        self.preroll_listener = None
+        self.preroll = None
+    
+    def _on_preroll_press(self, key):
+        """Pre-roll listener callback: keep a key press."""
+        preroll = self.preroll  # stop_preroll may clear it meanwhile
+        if preroll is not None:
+            preroll.push(EVENT_PRESS, key, time.perf_counter_ns())
+    
+    def _on_preroll_release(self, key):
+        """Pre-roll listener callback: keep a key release."""
+        preroll = self.preroll
+        if preroll is not None:
+            preroll.push(EVENT_RELEASE, key, time.perf_counter_ns())
+    
+    def capture_preroll(self, name: str = "Pre-roll capture") -> Optional[KeySequence]:
+        """Freeze the pre-roll buffer into the current sequence.
+        
+        The events go through the same filters and compaction as a live
+        recording. Returns None if pre-roll is off or a recording is running.
+        """
+        if self.is_recording or self.preroll is None:
+            return None
+        
+        events = self.preroll.snapshot(time.perf_counter_ns())
+        self.current_sequence = KeySequence(name)
+        self.pressed_keys.clear()
+        self._open_slots.clear()
+        self.unmatched_releases = 0
+        self._reset_compaction_stats()
+        self.filters.reset()
+        self._clear_tracks()
+        self.start_ns = events[0][2] if events else time.perf_counter_ns()
+        
+        # Callers refresh their view from the returned sequence. The
+        # events are old, so they stay out of the live lag stats.
+        on_key_recorded = self.on_key_recorded
+        self.on_key_recorded = None
+        try:
+            for kind, key, timestamp_ns in events:
+                self._record_event(kind, key, timestamp_ns)
+        finally:
+            self.on_key_recorded = on_key_recorded
+        
+        if self.tracks:
+            self.current_sequence = merge_tracks(self.tracks.values(), name)
+            self._clear_tracks()
+        return self.current_sequence
+    
     def get_recorded_sequence(self) -> KeySequence:
         """Get the currently recorded sequence."""
         return self.current_sequence
@@ -159,9 +501,112 @@ class KeyRecorder:
     def clear_sequence(self):
         """Clear the recorded sequence."""
         self.current_sequence.clear()
+        self.discard_journal()
     
     def get_recording_duration(self) -> float:
         """Get the current recording duration in seconds."""
         if not self.is_recording:
             return 0.0
-        return time.time() - self.start_time
+        return (time.perf_counter_ns() - self.start_ns) / 1_000_000_000
+    
+    def set_filters(self, excluded_hotkeys: Optional[Iterable[str]] = None,
+                    allowed_keys: Optional[Iterable[str]] = None,
+                    denied_keys: Optional[Iterable[str]] = None,
+                    debounce_ms: Optional[float] = None,
+                    filter_modifier_noise: Optional[bool] = None):
+        """Configure the recording filters; None leaves a setting unchanged.
+        
+        Keys are given as key codes (e.g. "char:a", "key:f5") and hotkeys as
+        hotkey strings (e.g. "Ctrl+F1").
+        """
+        if excluded_hotkeys is not None:
+            self.excluded_hotkeys = [h for h in excluded_hotkeys if h]
+        if allowed_keys is not None:
+            self.allowed_keys = list(allowed_keys)
+        if denied_keys is not None:
+            self.denied_keys = list(denied_keys)
+        if debounce_ms is not None:
+            self.debounce_ms = max(0.0, float(debounce_ms))
+        if filter_modifier_noise is not None:
+            self.filter_modifier_noise = filter_modifier_noise
+        self._build_filters()
+    
+    def set_injection_ledger(self, ledger: Optional[InjectionLedger]):
+        """Ignore events injected through a TaggingBackend writing to ledger."""
+        self.injection_ledger = ledger
+        self._build_filters()
+    
+    def _build_filters(self):
+        """Compile the configured filters into a chain."""
+        stages = []
+        if self.injection_ledger is not None:
+            stages.append(InjectionFilter(self.injection_ledger))
+        stages.append(HotkeyFilter(self.excluded_hotkeys))
+        if self.allowed_keys or self.denied_keys:
+            stages.append(KeyListFilter(self.allowed_keys, self.denied_keys))
+        if self.debounce_ms > 0:
+            stages.append(DebounceFilter(self.debounce_ms))
+        if self.filter_modifier_noise:
+            stages.append(ModifierNoiseFilter())
+        self.filters = RecordingFilterChain(stages)
+    
+    def get_filter_stats(self) -> dict:
+        """Get the number of events each filter dropped this session."""
+        return self.filters.get_stats()
+    
+    def set_compaction(self, enabled: bool, min_hold_ms: Optional[int] = None,
+                       idle_gap_ms: Optional[int] = None):
+        """Configure record-time compaction."""
+        self.compaction_enabled = enabled
+        if min_hold_ms is not None:
+            self.min_hold_duration = max(0, int(min_hold_ms))
+        if idle_gap_ms is not None:
+            self.idle_gap_delay_ms = max(1, int(idle_gap_ms))
+    
+    def _reset_compaction_stats(self):
+        """Reset the per-session compaction counters."""
+        self.raw_events = 0
+        self.repeats_collapsed = 0
+        self.delays_inserted = 0
+        self.taps_merged = 0
+        self.actions_recorded = 0
+        self._last_action_ns = 0
+    
+    def get_compaction_stats(self) -> dict:
+        """Get how much the current or last session was compacted."""
+        return {
+            'raw_events': self.raw_events,
+            'actions': self.actions_recorded,
+            'repeats_collapsed': self.repeats_collapsed,
+            'delays_inserted': self.delays_inserted,
+            'taps_merged': self.taps_merged,
+            'compression_ratio': (self.raw_events / self.actions_recorded
+                                  if self.actions_recorded else 1.0)
+        }
+    
+    def get_live_stats(self) -> dict:
+        """Get rolling keys/s, hook-to-consumer lag, queue depth and memory use.
+        
+        Cheap enough to poll several times a second while recording.
+        """
+        stats = self.live_stats.snapshot(time.perf_counter_ns())
+        stats['queue_depth'] = len(self.input_buffer)
+        stats['dropped'] = self.input_buffer.dropped
+        stats['sequence_bytes'] = self._sequence_memory_bytes()
+        return stats
+    
+    def _sequence_memory_bytes(self) -> int:
+        """Estimate the memory held by the current sequence's actions."""
+        return (self.current_sequence.get_memory_bytes() +
+                sum(track.get_memory_bytes() for track in self.tracks.values()))
+    
+    def get_ingest_stats(self) -> dict:
+        """Get ring buffer depth, high-water mark and dropped event count."""
+        buffer = self.input_buffer
+        return {
+            'pending': len(buffer),
+            'high_water': buffer.high_water,
+            'dropped': buffer.dropped,
+            'unmatched_releases': self.unmatched_releases,
+            'capacity': buffer.capacity
+        }
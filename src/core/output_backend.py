@@ -0,0 +1,143 @@
+"""
+Output backends that inject key events for playback.
+"""
+
+import time
+from array import array
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from pynput.keyboard import Controller
+
+from core.injection_ledger import InjectionLedger
+from utils.key_registry import key_registry
+
+
+# Event kinds used in batches
+EVENT_PRESS = 0
+EVENT_RELEASE = 1
+
+
+class InjectedEvent(NamedTuple):
+    """A key event captured by RecordingBackend."""
+    kind: int
+    key: object
+    timestamp_ns: int
+
+
+class OutputBackend:
+    """Interface for injecting key events.
+    
+    Subclasses implement press() and release(). tap() and send_batch() are
+    built on top of them but may be overridden by backends that can inject
+    several events natively.
+    """
+    
+    def press(self, key):
+        """Press a key."""
+        raise NotImplementedError
+    
+    def release(self, key):
+        """Release a key."""
+        raise NotImplementedError
+    
+    def tap(self, key, hold_ns: int = 0):
+        """Press and release a key, holding it for hold_ns."""
+        self.press(key)
+        self._pause(hold_ns)
+        self.release(key)
+    
+    def send_batch(self, events: Iterable[Tuple[int, object]], spacing_ns: int = 0,
+                   timestamps: Optional[array] = None):
+        """Inject (kind, key) events in order, spacing_ns apart.
+        
+        If timestamps is given, the perf_counter_ns time at which each event
+        was injected is appended to it.
+        """
+        first = True
+        for kind, key in events:
+            if not first:
+                self._pause(spacing_ns)
+            first = False
+            
+            if kind == EVENT_PRESS:
+                self.press(key)
+            else:
+                self.release(key)
+            if timestamps is not None:
+                timestamps.append(time.perf_counter_ns())
+    
+    def _pause(self, duration_ns: int):
+        """Pause between events within a tap or batch."""
+        if duration_ns > 0:
+            time.sleep(duration_ns / 1_000_000_000)
+
+
+class PynputBackend(OutputBackend):
+    """Injects events into the OS through pynput."""
+    
+    def __init__(self):
+        self.controller = Controller()
+    
+    def press(self, key):
+        """Press a key."""
+        self.controller.press(key)
+    
+    def release(self, key):
+        """Release a key."""
+        self.controller.release(key)
+
+
+class NullBackend(OutputBackend):
+    """Discards all events; useful for measuring scheduler overhead."""
+    
+    def press(self, key):
+        """Discard a key press."""
+    
+    def release(self, key):
+        """Discard a key release."""
+
+
+class TaggingBackend(OutputBackend):
+    """Wraps another backend and notes every injected event in a ledger.
+    
+    Lets a recorder running at the same time tell our own playback apart
+    from real input.
+    """
+    
+    def __init__(self, backend: OutputBackend, ledger: InjectionLedger):
+        self.backend = backend
+        self.ledger = ledger
+    
+    def press(self, key):
+        """Tag and press a key."""
+        self.ledger.record(EVENT_PRESS, key_registry.id_for_key(key),
+                           time.perf_counter_ns())
+        self.backend.press(key)
+    
+    def release(self, key):
+        """Tag and release a key."""
+        self.ledger.record(EVENT_RELEASE, key_registry.id_for_key(key),
+                           time.perf_counter_ns())
+        self.backend.release(key)
+
+
+class RecordingBackend(OutputBackend):
+    """Records every event with its perf_counter_ns injection time."""
+    
+    def __init__(self):
+        self.events: List[InjectedEvent] = []
+    
+    def press(self, key):
+        """Record a key press."""
+        self.events.append(InjectedEvent(EVENT_PRESS, key, time.perf_counter_ns()))
+    
+    def release(self, key):
+        """Record a key release."""
+        self.events.append(InjectedEvent(EVENT_RELEASE, key, time.perf_counter_ns()))
+    
+    def get_press_times(self) -> List[int]:
+        """Get the injection times of all key presses."""
+        return [e.timestamp_ns for e in self.events if e.kind == EVENT_PRESS]
+    
+    def clear(self):
+        """Forget all recorded events."""
+        self.events.clear()
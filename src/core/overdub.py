@@ -0,0 +1,109 @@
+"""
+Overdub: record new input while a base sequence plays.
+"""
+
+import time
+from typing import List, Optional
+
+from core.injection_ledger import InjectionLedger
+from core.key_player import KeyPlayer
+from core.key_recorder import KeyRecorder
+from core.output_backend import OutputBackend, TaggingBackend
+from data.key_sequence import KeySequence
+from data.key_track import KeyTrack, merge_tracks
+
+
+class OverdubSession:
+    """Plays a base sequence and records over it on the same clock.
+    
+    Playback is started at a fixed origin and the recorder timestamps
+    relative to the same origin, shifted so recorded offsets land on the
+    base sequence's own timeline. The player's backend is wrapped to tag
+    every injected event, and the recorder drops the tagged events, so only
+    real input is captured. Neither layer is re-timed when they are merged.
+    """
+    
+    def __init__(self, recorder: KeyRecorder, player: KeyPlayer,
+                 lead_in_ms: float = 50.0):
+        self.recorder = recorder
+        self.player = player
+        self.lead_in_ns = int(lead_in_ms * 1_000_000)
+        self.ledger = InjectionLedger()
+        self.name = ""
+        self.layers: List[KeyTrack] = []
+        self.is_active = False
+        self._backend: Optional[OutputBackend] = None
+    
+    def start(self, base: KeySequence) -> bool:
+        """Start playing base and recording over it."""
+        if (self.is_active or not base or self.recorder.is_recording
+                or self.player.is_playing):
+            return False
+        
+        try:
+            # Copy the base first: it is usually the recorder's own
+            # sequence, which recording clears
+            self.name = base.name
+            self.layers = [self._to_track("base", base)]
+            self.ledger.clear()
+            self._backend = self.player.backend
+            self.player.set_backend(TaggingBackend(self._backend, self.ledger))
+            self.recorder.set_injection_ledger(self.ledger)
+            
+            # The base's first action plays at origin_ns; recording against
+            # the base's own zero keeps both layers on one timeline
+            origin_ns = time.perf_counter_ns() + self.lead_in_ns
+            first_ns = base.actions[0].timestamp_ns
+            if not self.recorder.start_recording(origin_ns - first_ns):
+                self._restore()
+                return False
+            if not self.player.start_layer(self.layers[0].to_sequence(), origin_ns):
+                self.recorder.stop_recording()
+                self._restore()
+                return False
+            
+            self.is_active = True
+            return True
+        
+        except Exception as e:
+            print(f"Error starting overdub: {e}")
+            self._restore()
+            return False
+    
+    def stop(self) -> Optional[KeySequence]:
+        """Stop both sides and return the base and new layers merged."""
+        if not self.is_active:
+            return None
+        
+        try:
+            self.player.stop_playback()
+            overdub = self.recorder.stop_recording()
+            self.layers.append(self._to_track("overdub", overdub))
+            return merge_tracks(self.layers, self.name)
+        
+        except Exception as e:
+            print(f"Error stopping overdub: {e}")
+            return None
+        
+        finally:
+            self._restore()
+            self.is_active = False
+    
+    def get_layers(self) -> List[KeyTrack]:
+        """Get the base and overdub layers of the last session."""
+        return list(self.layers)
+    
+    def _restore(self):
+        """Put back the player's backend and stop filtering injections."""
+        if self._backend is not None:
+            self.player.set_backend(self._backend)
+            self._backend = None
+        self.recorder.set_injection_ledger(None)
+    
+    @staticmethod
+    def _to_track(name: str, sequence: KeySequence) -> KeyTrack:
+        """Copy a sequence into a layer track."""
+        track = KeyTrack(name)
+        for action in sequence.actions:
+            track.append(action)
+        return track
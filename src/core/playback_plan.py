@@ -0,0 +1,290 @@
+"""
+Compilation of key sequences into flat playback plans.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from data.key_sequence import KeySequence, CODE_PRESS, CODE_RELEASE, CODE_DELAY
+from utils.key_registry import key_registry
+
+
+# Plan opcodes
+OP_TAP = 0      # press and release a single key
+OP_CHORD = 1    # hold modifiers, tap the last key, release modifiers
+OP_PRESS = 2    # press and hold a key
+OP_RELEASE = 3  # release a held key
+
+# Batches between snapshots of the held keys, used to start mid-plan
+CHECKPOINT_INTERVAL = 256
+
+# Playback modes
+MODE_FIXED = "fixed"        # presses spaced by time_between_presses
+MODE_FAITHFUL = "faithful"  # presses and releases at their recorded offsets
+PLAYBACK_MODES = (MODE_FIXED, MODE_FAITHFUL)
+
+
+class PlaybackPlan:
+    """A key sequence resolved once into parallel arrays for playback.
+    
+    Entry i is played at offsets_ns[i] into a repetition using opcodes[i]
+    and the pynput key objects in keys[i]. period_ns is the length of one
+    repetition including the pause before the next one.
+    
+    Entries due at the same offset are grouped into batches: batch j is
+    submitted to the backend in one call at batch_offsets_ns[j] with the
+    pre-expanded (kind, key) events in batch_events[j].
+    
+    held_checkpoints[k] lists the keys held down before batch
+    k * CHECKPOINT_INTERVAL, so playback can start anywhere in the plan
+    after replaying at most CHECKPOINT_INTERVAL batches. batch_last_action[j]
+    is the highest action index played by batches 0 to j, which maps a
+    sequence position to the batch to start from.
+    """
+    
+    def __init__(self):
+        self.opcodes = array('B')
+        self.offsets_ns = array('q')
+        self.keys: List[Tuple] = []
+        self.action_indices = array('l')
+        self.period_ns = 0
+        self.batch_offsets_ns = array('q')
+        self.batch_events: List[Tuple] = []
+        self.batch_last_action = array('l')
+        self.held_checkpoints: List[Tuple] = []
+    
+    def append(self, opcode: int, keys: Tuple, offset_ns: int, action_index: int):
+        """Append an entry to the plan."""
+        self.opcodes.append(opcode)
+        self.keys.append(keys)
+        self.offsets_ns.append(offset_ns)
+        self.action_indices.append(action_index)
+    
+    def build_batches(self):
+        """Group entries sharing an offset into pre-expanded event batches."""
+        self.batch_offsets_ns = array('q')
+        self.batch_events = []
+        self.batch_last_action = array('l')
+        events: List[Tuple[int, object]] = []
+        last_action = -1
+        
+        for i, offset_ns in enumerate(self.offsets_ns):
+            if events and offset_ns != self.batch_offsets_ns[-1]:
+                self.batch_events.append(tuple(events))
+                self.batch_last_action.append(last_action)
+                events = []
+            if not events:
+                self.batch_offsets_ns.append(offset_ns)
+            events.extend(expand_entry(self.opcodes[i], self.keys[i]))
+            last_action = max(last_action, self.action_indices[i])
+        
+        if events:
+            self.batch_events.append(tuple(events))
+            self.batch_last_action.append(last_action)
+        self._build_checkpoints()
+    
+    def _build_checkpoints(self):
+        """Snapshot the held keys every CHECKPOINT_INTERVAL batches."""
+        self.held_checkpoints = []
+        held: Dict[object, None] = {}
+        for index, events in enumerate(self.batch_events):
+            if index % CHECKPOINT_INTERVAL == 0:
+                self.held_checkpoints.append(tuple(held))
+            _apply_events(held, events)
+    
+    def held_keys_after(self, batch_count: int) -> List:
+        """Get the keys still held after the first batch_count batches.
+        
+        Starts from the nearest checkpoint, so at most CHECKPOINT_INTERVAL
+        batches are replayed.
+        """
+        if not self.held_checkpoints:
+            return []
+        
+        checkpoint = min(batch_count // CHECKPOINT_INTERVAL,
+                         len(self.held_checkpoints) - 1)
+        held: Dict[object, None] = dict.fromkeys(self.held_checkpoints[checkpoint])
+        for events in self.batch_events[checkpoint * CHECKPOINT_INTERVAL:batch_count]:
+            _apply_events(held, events)
+        return list(held)
+    
+    def batch_for_action(self, action_index: int) -> int:
+        """Get the first batch that plays the action at action_index or a later one.
+        
+        Returns the number of batches if no later action is played.
+        """
+        return bisect_left(self.batch_last_action, action_index)
+    
+    def __len__(self) -> int:
+        """Return number of plan entries."""
+        return len(self.opcodes)
+
+
+def _apply_events(held: Dict[object, None], events: Tuple):
+    """Update a set of held keys (an ordered dict) with a batch of events."""
+    for kind, key in events:
+        if kind == EVENT_PRESS:
+            held[key] = None
+        else:
+            held.pop(key, None)
+
+
+def expand_entry(opcode: int, keys: Tuple) -> List[Tuple[int, object]]:
+    """Expand a plan entry into the (kind, key) events to inject."""
+    if opcode == OP_TAP:
+        return [(EVENT_PRESS, keys[0]), (EVENT_RELEASE, keys[0])]
+    if opcode == OP_PRESS:
+        return [(EVENT_PRESS, keys[0])]
+    if opcode == OP_RELEASE:
+        return [(EVENT_RELEASE, keys[0])]
+    
+    modifiers = keys[:-1]
+    main_key = keys[-1]
+    events = [(EVENT_PRESS, modifier) for modifier in modifiers]
+    events.append((EVENT_PRESS, main_key))
+    events.append((EVENT_RELEASE, main_key))
+    events.extend((EVENT_RELEASE, modifier) for modifier in reversed(modifiers))
+    return events
+
+
+def apply_time_warp(plan: PlaybackPlan, end_ns: int, speed: float = 1.0,
+                    idle_threshold_ns: int = 0, idle_max_ns: int = 0,
+                    pause_ns: int = 0) -> int:
+    """Rescale the gaps between plan entries in place.
+    
+    Every gap is divided by speed; if idle_threshold_ns is set, any gap still
+    longer than it is clamped to idle_max_ns. Entries sharing an offset stay
+    together. Returns the warped end of the content that started at end_ns,
+    followed by pause_ns (the pause before the next repetition) warped as
+    one more gap, i.e. the plan's period.
+    """
+    if speed == 1.0 and idle_threshold_ns <= 0:
+        return end_ns + pause_ns
+    
+    offsets = plan.offsets_ns
+    previous_ns = 0
+    warped_ns = 0
+    
+    for i in range(len(offsets) + 1):
+        original_ns = offsets[i] if i < len(offsets) else end_ns
+        gap_ns = int((original_ns - previous_ns) / speed)
+        if idle_threshold_ns > 0 and gap_ns > idle_threshold_ns:
+            gap_ns = idle_max_ns
+        previous_ns = original_ns
+        warped_ns += gap_ns
+        if i < len(offsets):
+            offsets[i] = warped_ns
+    
+    pause_ns = int(pause_ns / speed)
+    if idle_threshold_ns > 0 and pause_ns > idle_threshold_ns:
+        pause_ns = idle_max_ns
+    return warped_ns + pause_ns
+
+
+def compile_sequence(sequence: KeySequence, time_between_presses: int,
+                     speed: float = 1.0, idle_threshold_ns: int = 0,
+                     idle_max_ns: int = 0) -> PlaybackPlan:
+    """Compile a sequence into a playback plan.
+    
+    Key presses are spaced time_between_presses milliseconds apart unless an
+    explicit delay follows, in which case the delay is used instead. Keys that
+    cannot be resolved keep their time slot but produce no entry. The speed
+    and idle gap arguments are applied once here (see apply_time_warp).
+    """
+    plan = PlaybackPlan()
+    gap_ns = time_between_presses * 1_000_000
+    codes = sequence.action_codes
+    key_ids = sequence.key_ids
+    durations_ns = sequence.durations_ns
+    resolve = key_registry.resolve
+    offset_ns = 0
+    
+    for i, code in enumerate(codes):
+        if code == CODE_PRESS:
+            keys = resolve(key_ids[i])
+            if keys:
+                opcode = OP_TAP if len(keys) == 1 else OP_CHORD
+                plan.append(opcode, keys, offset_ns, i)
+            
+            # Default spacing unless an explicit delay follows
+            if i < len(codes) - 1 and codes[i + 1] != CODE_DELAY:
+                offset_ns += gap_ns
+        
+        elif code == CODE_DELAY:
+            if durations_ns[i] > 0:
+                offset_ns += durations_ns[i]
+    
+    plan.period_ns = apply_time_warp(plan, offset_ns, speed, idle_threshold_ns,
+                                     idle_max_ns, pause_ns=gap_ns)
+    plan.build_batches()
+    return plan
+
+
+def compile_faithful(sequence: KeySequence, time_between_presses: int,
+                     speed: float = 1.0, idle_threshold_ns: int = 0,
+                     idle_max_ns: int = 0) -> PlaybackPlan:
+    """Compile a sequence that replays presses and releases at their recorded times.
+    
+    Offsets are taken from action timestamps relative to the first action, so
+    overlapping holds are reproduced exactly. A press without a recorded
+    release is released after its duration, or tapped if it has none. Stray
+    releases and repeated presses of a key that is already down are dropped.
+    time_between_presses only sets the pause before the next repetition.
+    The speed and idle gap arguments are applied once here.
+    """
+    plan = PlaybackPlan()
+    if not sequence:
+        return plan
+    
+    codes = sequence.action_codes
+    key_ids = sequence.key_ids
+    timestamps_ns = sequence.timestamps_ns
+    resolve = key_registry.resolve
+    origin_ns = timestamps_ns[0]
+    entries = []
+    open_presses: Dict[int, int] = {}
+    
+    for i, code in enumerate(codes):
+        if code == CODE_DELAY:
+            continue
+        
+        key_id = key_ids[i]
+        keys = resolve(key_id)
+        if not keys:
+            continue
+        
+        offset_ns = timestamps_ns[i] - origin_ns
+        
+        if code == CODE_PRESS:
+            if len(keys) > 1:
+                entries.append([offset_ns, i, OP_CHORD, keys])
+            elif key_id not in open_presses:
+                open_presses[key_id] = len(entries)
+                entries.append([offset_ns, i, OP_PRESS, keys])
+        
+        elif code == CODE_RELEASE:
+            if open_presses.pop(key_id, None) is not None:
+                entries.append([offset_ns, i, OP_RELEASE, keys])
+    
+    # Presses never released in the recording
+    for entry_index in open_presses.values():
+        press = entries[entry_index]
+        duration_ns = sequence.durations_ns[press[1]]
+        if duration_ns > 0:
+            entries.append([press[0] + duration_ns, press[1], OP_RELEASE, press[3]])
+        else:
+            press[2] = OP_TAP
+    
+    # Synthesised releases can land after later actions; sort is stable
+    entries.sort(key=lambda entry: entry[0])
+    for offset_ns, action_index, opcode, keys in entries:
+        plan.append(opcode, keys, offset_ns, action_index)
+    
+    end_ns = entries[-1][0] if entries else 0
+    plan.period_ns = apply_time_warp(plan, end_ns, speed, idle_threshold_ns,
+                                     idle_max_ns,
+                                     pause_ns=time_between_presses * 1_000_000)
+    plan.build_batches()
+    return plan
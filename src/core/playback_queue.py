@@ -0,0 +1,115 @@
+"""
+Priority queue of playback jobs.
+"""
+
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from core.playback_plan import PlaybackPlan
+from data.key_sequence import KeySequence
+
+
+@dataclass
+class PlaybackJob:
+    """A sequence waiting for, or partway through, playback."""
+    job_id: int
+    sequence: KeySequence
+    priority: int = 0
+    enqueued_ns: int = 0
+    started_ns: int = 0  # 0 until the job first starts playing
+    start_at_ns: int = 0  # fixed start time, or 0 to start when dequeued
+    repetitions: int = 0  # 0 uses the player's repeat settings
+    start_action: int = 0  # first action to play, for seeks
+    end_action: int = -1  # stop before this action, -1 to play to the end
+    
+    # Resume point for preempted jobs
+    plan: Optional[PlaybackPlan] = None
+    repetition: int = 0
+    batch_index: int = 0
+    end_batch: int = -1  # stop before this batch, -1 to play the whole plan
+    order: int = field(default=0, repr=False)
+
+
+class PlaybackQueue:
+    """Thread-safe playback job queue ordered by priority, then arrival.
+    
+    Also keeps wait time statistics so workloads that fire many short
+    macros can be sized.
+    """
+    
+    def __init__(self):
+        self._heap: List[Tuple[int, int, PlaybackJob]] = []
+        self._lock = threading.Lock()
+        self._order = itertools.count()
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Reset the wait time statistics."""
+        self.jobs_started = 0
+        self.preemptions = 0
+        self.total_wait_ns = 0
+        self.max_wait_ns = 0
+        self.last_wait_ns = 0
+        self.max_depth = 0
+    
+    def push(self, job: PlaybackJob):
+        """Add a new job to the queue."""
+        with self._lock:
+            job.order = next(self._order)
+            heapq.heappush(self._heap, (-job.priority, job.order, job))
+            self.max_depth = max(self.max_depth, len(self._heap))
+    
+    def requeue(self, job: PlaybackJob):
+        """Put a preempted job back ahead of later jobs of its priority."""
+        with self._lock:
+            heapq.heappush(self._heap, (-job.priority, job.order, job))
+            self.preemptions += 1
+    
+    def pop(self) -> Optional[PlaybackJob]:
+        """Remove and return the highest priority job, if any."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[2]
+    
+    def peek_priority(self) -> Optional[int]:
+        """Get the priority of the next job without removing it."""
+        with self._lock:
+            return -self._heap[0][0] if self._heap else None
+    
+    def clear(self):
+        """Discard all queued jobs."""
+        with self._lock:
+            self._heap.clear()
+    
+    def record_start(self, job: PlaybackJob, now_ns: int):
+        """Record the queue wait of a job that is starting for the first time."""
+        job.started_ns = now_ns
+        wait_ns = now_ns - job.enqueued_ns
+        self.jobs_started += 1
+        self.total_wait_ns += wait_ns
+        self.last_wait_ns = wait_ns
+        self.max_wait_ns = max(self.max_wait_ns, wait_ns)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get queue depth and wait time statistics."""
+        mean_wait_ns = 0.0
+        if self.jobs_started:
+            mean_wait_ns = self.total_wait_ns / self.jobs_started
+        return {
+            'depth': len(self),
+            'max_depth': self.max_depth,
+            'jobs_started': self.jobs_started,
+            'preemptions': self.preemptions,
+            'last_wait_ms': self.last_wait_ns / 1_000_000.0,
+            'mean_wait_ms': mean_wait_ns / 1_000_000.0,
+            'max_wait_ms': self.max_wait_ns / 1_000_000.0
+        }
+    
+    def __len__(self) -> int:
+        """Return number of queued jobs."""
+        with self._lock:
+            return len(self._heap)
@@ -0,0 +1,43 @@
+"""
+Absolute-deadline scheduling for key playback.
+"""
+
+import time
+import threading
+from typing import Optional
+
+from core.precision_timer import PrecisionTimer
+
+
+class DeadlineScheduler:
+    """Schedules playback actions on a fixed monotonic timeline.
+    
+    Every action's target time is an offset from the origin captured when
+    playback starts. Time lost to a late wake-up or to the key injection
+    itself is absorbed by the next deadline instead of accumulating.
+    """
+    
+    def __init__(self, stop_event: threading.Event,
+                 timer: Optional[PrecisionTimer] = None):
+        self.stop_event = stop_event
+        self.timer = timer if timer is not None else PrecisionTimer(stop_event)
+        self.origin_ns = 0
+    
+    def start(self, origin_ns: Optional[int] = None):
+        """Anchor the timeline at origin_ns (defaults to now)."""
+        if origin_ns is None:
+            origin_ns = time.perf_counter_ns()
+        self.origin_ns = origin_ns
+        self.timer.reset_stats()
+    
+    def deadline(self, offset_ns: int) -> int:
+        """Get the absolute perf_counter_ns deadline for an offset."""
+        return self.origin_ns + offset_ns
+    
+    def wait_until(self, offset_ns: int) -> bool:
+        """Wait until the given timeline offset is reached.
+        
+        Returns False if playback was stopped while waiting. Lateness is
+        measured per injected event by PlaybackTelemetry, not here.
+        """
+        return self.timer.wait_until(self.origin_ns + offset_ns)
@@ -0,0 +1,95 @@
+"""
+Per-event playback latency telemetry.
+"""
+
+import csv
+import json
+import os
+from array import array
+from typing import Any, Dict, List
+
+
+class PlaybackTelemetry:
+    """Ring buffer of scheduled vs. actual injection times.
+    
+    Both timelines are preallocated so recording an event never allocates.
+    Once the buffer wraps, summaries cover the most recent capacity events
+    while the event count and rate still cover the whole run.
+    """
+    
+    def __init__(self, capacity: int = 65536):
+        self.capacity = max(1, capacity)
+        self.scheduled_ns = array('q', bytes(8 * self.capacity))
+        self.actual_ns = array('q', bytes(8 * self.capacity))
+        self.reset()
+    
+    def reset(self):
+        """Start a new run."""
+        self.count = 0
+        self.first_actual_ns = 0
+        self.last_actual_ns = 0
+    
+    def record(self, scheduled_ns: int, actual_ns: int):
+        """Record one injected event."""
+        if not self.count:
+            self.first_actual_ns = actual_ns
+        index = self.count % self.capacity
+        self.scheduled_ns[index] = scheduled_ns
+        self.actual_ns[index] = actual_ns
+        self.last_actual_ns = actual_ns
+        self.count += 1
+    
+    def get_lateness(self) -> List[int]:
+        """Get lateness in ns of the buffered events, oldest first."""
+        size = min(self.count, self.capacity)
+        start = self.count - size
+        return [self.actual_ns[i % self.capacity] - self.scheduled_ns[i % self.capacity]
+                for i in range(start, self.count)]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get lateness percentiles, max drift and throughput for the run."""
+        lateness = self.get_lateness()
+        ordered = sorted(lateness)
+        elapsed_ns = self.last_actual_ns - self.first_actual_ns
+        
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] / 1000.0
+        
+        return {
+            'events': self.count,
+            'window': len(ordered),
+            'p50_lateness_us': percentile(0.50),
+            'p95_lateness_us': percentile(0.95),
+            'p99_lateness_us': percentile(0.99),
+            'max_drift_us': max((abs(ns) for ns in ordered), default=0) / 1000.0,
+            'events_per_sec': ((self.count - 1) * 1_000_000_000 / elapsed_ns
+                               if elapsed_ns > 0 else 0.0)
+        }
+    
+    def export(self, path: str) -> bool:
+        """Dump the run to path: per-event rows for .csv, summary otherwise."""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            if path.lower().endswith('.csv'):
+                size = min(self.count, self.capacity)
+                with open(path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['scheduled_ns', 'actual_ns', 'lateness_ns'])
+                    for i in range(self.count - size, self.count):
+                        scheduled = self.scheduled_ns[i % self.capacity]
+                        actual = self.actual_ns[i % self.capacity]
+                        writer.writerow([scheduled, actual, actual - scheduled])
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(self.summary(), f, indent=2)
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error exporting playback telemetry: {e}")
+            return False
@@ -0,0 +1,78 @@
+"""
+Hybrid sleep-then-spin timer for precise, interruptible waits.
+"""
+
+import time
+import threading
+from typing import Dict
+
+
+class PrecisionTimer:
+    """Waits for a perf_counter_ns deadline with sub-millisecond accuracy.
+
+    The wait coarse-sleeps on the stop event until spin_margin_ns before
+    the deadline, then spins (yielding the GIL) for the remainder. A larger
+    margin buys accuracy with CPU time; a margin of 0 disables spinning.
+    The stop event is honoured in both phases.
+    """
+
+    def __init__(self, stop_event: threading.Event, spin_margin_ns: int = 2_000_000):
+        self.stop_event = stop_event
+        self.spin_margin_ns = spin_margin_ns
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the accuracy statistics."""
+        self.wait_count = 0
+        self.total_error_ns = 0
+        self.max_error_ns = 0
+        self.spin_ns = 0
+
+    def wait_until(self, deadline_ns: int) -> bool:
+        """Wait until perf_counter_ns() reaches deadline_ns.
+
+        Returns False if the stop event was set before the deadline.
+        """
+        stop_event = self.stop_event
+        now = time.perf_counter_ns()
+
+        # Coarse phase: block on the stop event, waking up early enough
+        # that the OS timer granularity cannot overshoot the deadline
+        coarse_until = deadline_ns - self.spin_margin_ns
+        while now < coarse_until:
+            if stop_event.wait((coarse_until - now) / 1_000_000_000):
+                return False
+            now = time.perf_counter_ns()
+
+        # Fine phase: spin, yielding to other threads between checks
+        spin_start = now
+        while now < deadline_ns:
+            if stop_event.is_set():
+                return False
+            time.sleep(0)
+            now = time.perf_counter_ns()
+
+        error_ns = now - deadline_ns
+        self.wait_count += 1
+        self.total_error_ns += error_ns
+        if error_ns > self.max_error_ns:
+            self.max_error_ns = error_ns
+        self.spin_ns += now - spin_start
+        return not stop_event.is_set()
+
+    def wait(self, seconds: float) -> bool:
+        """Wait for a relative number of seconds."""
+        return self.wait_until(time.perf_counter_ns() + int(seconds * 1_000_000_000))
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get achieved accuracy and CPU cost of the waits so far."""
+        mean_error_ns = 0.0
+        if self.wait_count:
+            mean_error_ns = self.total_error_ns / self.wait_count
+        return {
+            'waits': self.wait_count,
+            'mean_error_us': mean_error_ns / 1000.0,
+            'max_error_us': self.max_error_ns / 1000.0,
+            'spin_time_ms': self.spin_ns / 1_000_000.0,
+            'spin_margin_ms': self.spin_margin_ns / 1_000_000.0
+        }
@@ -0,0 +1,60 @@
+"""
+Always-on circular buffer of recent raw key events.
+"""
+
+from array import array
+from typing import List, Tuple
+
+
+class PrerollBuffer:
+    """Keeps the most recent key events in a fixed, preallocated layout.
+    
+    push() overwrites the oldest slot in place, so memory never grows and
+    no per-event containers are created. One producer (the listener) pushes
+    while snapshot() may be called from any thread; slots overwritten while
+    a snapshot is being copied are left out of it.
+    """
+    
+    def __init__(self, capacity: int = 10000, window_seconds: float = 30.0):
+        self.capacity = max(1, capacity)
+        self.window_ns = int(window_seconds * 1_000_000_000)
+        self.kinds = array('B', bytes(self.capacity))
+        self.times_ns = array('q', bytes(8 * self.capacity))
+        self.keys = [None] * self.capacity
+        self.write_count = 0
+    
+    def push(self, kind: int, key, timestamp_ns: int):
+        """Record an event, overwriting the oldest if full."""
+        write_count = self.write_count
+        index = write_count % self.capacity
+        self.kinds[index] = kind
+        self.keys[index] = key
+        self.times_ns[index] = timestamp_ns
+        self.write_count = write_count + 1
+    
+    def snapshot(self, now_ns: int) -> List[Tuple[int, object, int]]:
+        """Get the (kind, key, timestamp_ns) events in the window, oldest first."""
+        end = self.write_count
+        start = max(0, end - self.capacity)
+        events = []
+        for i in range(start, end):
+            index = i % self.capacity
+            events.append((self.kinds[index], self.keys[index], self.times_ns[index]))
+        
+        # Drop slots the producer may have overwritten while we copied
+        overwritten = max(0, self.write_count - self.capacity) - start
+        if overwritten > 0:
+            events = events[overwritten:]
+        
+        since_ns = now_ns - self.window_ns
+        return [event for event in events if event[2] >= since_ns]
+    
+    def clear(self):
+        """Forget all buffered events."""
+        self.write_count = 0
+        for i in range(self.capacity):
+            self.keys[i] = None
+    
+    def __len__(self) -> int:
+        """Return number of buffered events."""
+        return min(self.write_count, self.capacity)
@@ -0,0 +1,273 @@
+"""
+Composable filters applied to recorded key events.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.injection_ledger import InjectionLedger
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from utils.key_registry import key_registry
+from utils.key_utils import get_key_code_from_name
+
+
+# (kind, key id, timestamp_ns) as seen by the recorder's consumer
+RecordedEvent = Tuple[int, int, int]
+
+# Modifier key codes by the modifier name used in hotkey strings
+MODIFIER_FAMILIES = {
+    'key:ctrl': 'ctrl', 'key:ctrl_l': 'ctrl', 'key:ctrl_r': 'ctrl',
+    'key:alt': 'alt', 'key:alt_l': 'alt', 'key:alt_r': 'alt', 'key:alt_gr': 'alt',
+    'key:shift': 'shift', 'key:shift_l': 'shift', 'key:shift_r': 'shift',
+    'key:cmd': 'cmd', 'key:cmd_l': 'cmd', 'key:cmd_r': 'cmd',
+}
+MODIFIER_FAMILY_IDS = {key_registry.intern(code): family
+                       for code, family in MODIFIER_FAMILIES.items()}
+
+HOTKEY_MODIFIER_NAMES = {
+    'ctrl': 'ctrl', 'control': 'ctrl',
+    'alt': 'alt', 'menu': 'alt',
+    'shift': 'shift',
+    'cmd': 'cmd', 'win': 'cmd', 'windows': 'cmd',
+}
+
+
+def parse_hotkey(hotkey_str: str) -> Optional[Tuple[str, frozenset]]:
+    """Parse a hotkey like "Ctrl+F1" into (main key code, modifier names)."""
+    modifiers = set()
+    main_key = None
+    for part in hotkey_str.split('+'):
+        name = part.strip().lower()
+        if not name:
+            continue
+        if name in HOTKEY_MODIFIER_NAMES:
+            modifiers.add(HOTKEY_MODIFIER_NAMES[name])
+        elif name.startswith('f') and name[1:].isdigit():
+            main_key = f"key:{name}"
+        else:
+            main_key = get_key_code_from_name(name)
+    
+    if not main_key:
+        return None
+    return main_key, frozenset(modifiers)
+
+
+class RecordingFilter:
+    """Base class for a recording filter stage.
+    
+    process() takes one event and returns the events to pass on, which lets
+    a stage drop, pass or hold back events. hits counts dropped events.
+    """
+    
+    name = "filter"
+    
+    def __init__(self):
+        self.hits = 0
+    
+    def process(self, event: RecordedEvent) -> List[RecordedEvent]:
+        """Filter one event."""
+        return [event]
+    
+    def reset(self):
+        """Forget per-session state before a new recording."""
+        self.hits = 0
+
+
+class HotkeyFilter(RecordingFilter):
+    """Drops the application's own hotkeys.
+    
+    A hotkey's main key is dropped, press and release, when all of its
+    modifiers are held. The modifiers themselves pass through; the
+    modifier noise filter removes them if nothing else was typed.
+    """
+    
+    name = "hotkeys"
+    
+    def __init__(self, hotkeys: Iterable[str] = ()):
+        super().__init__()
+        self.required_modifiers: Dict[int, List[frozenset]] = {}
+        for hotkey in hotkeys:
+            parsed = parse_hotkey(hotkey) if hotkey else None
+            if parsed:
+                key_id = key_registry.intern(parsed[0])
+                self.required_modifiers.setdefault(key_id, []).append(parsed[1])
+        self.held_modifiers: Dict[str, int] = {}
+        self.suppressed: Set[int] = set()
+    
+    def process(self, event: RecordedEvent) -> List[RecordedEvent]:
+        """Drop hotkey presses and their releases."""
+        kind, key_id, _ = event
+        family = MODIFIER_FAMILY_IDS.get(key_id)
+        if family:
+            count = self.held_modifiers.get(family, 0)
+            if kind == EVENT_PRESS:
+                self.held_modifiers[family] = count + 1
+            else:
+                self.held_modifiers[family] = max(0, count - 1)
+        
+        if kind == EVENT_RELEASE:
+            if key_id in self.suppressed:
+                self.suppressed.discard(key_id)
+                self.hits += 1
+                return []
+            return [event]
+        
+        for modifiers in self.required_modifiers.get(key_id, ()):
+            if all(self.held_modifiers.get(name) for name in modifiers):
+                self.suppressed.add(key_id)
+                self.hits += 1
+                return []
+        return [event]
+    
+    def reset(self):
+        """Forget held modifiers and suppressed keys."""
+        super().reset()
+        self.held_modifiers.clear()
+        self.suppressed.clear()
+
+
+class InjectionFilter(RecordingFilter):
+    """Drops events our own playback injected, as tagged in the ledger."""
+    
+    name = "injected"
+    
+    def __init__(self, ledger: InjectionLedger):
+        super().__init__()
+        self.ledger = ledger
+    
+    def process(self, event: RecordedEvent) -> List[RecordedEvent]:
+        """Drop events claimed by the ledger."""
+        if self.ledger.claim(*event):
+            self.hits += 1
+            return []
+        return [event]
+
+
+class KeyListFilter(RecordingFilter):
+    """Keeps only allowed keys and drops denied ones, given as key codes."""
+    
+    name = "key_list"
+    
+    def __init__(self, allow: Iterable[str] = (), deny: Iterable[str] = ()):
+        super().__init__()
+        self.allow = frozenset(key_registry.intern(code) for code in allow)
+        self.deny = frozenset(key_registry.intern(code) for code in deny)
+    
+    def process(self, event: RecordedEvent) -> List[RecordedEvent]:
+        """Drop events for keys outside the allow list or on the deny list."""
+        key_id = event[1]
+        if key_id in self.deny or (self.allow and key_id not in self.allow):
+            self.hits += 1
+            return []
+        return [event]
+
+
+class DebounceFilter(RecordingFilter):
+    """Drops key chatter: a press within window_ms of the key's last release."""
+    
+    name = "debounce"
+    
+    def __init__(self, window_ms: float):
+        super().__init__()
+        self.window_ns = int(window_ms * 1_000_000)
+        self.last_release_ns: Dict[int, int] = {}
+        self.suppressed: Set[int] = set()
+    
+    def process(self, event: RecordedEvent) -> List[RecordedEvent]:
+        """Drop bounced presses and their releases."""
+        kind, key_id, timestamp_ns = event
+        if kind == EVENT_RELEASE:
+            if key_id in self.suppressed:
+                self.suppressed.discard(key_id)
+                self.hits += 1
+                return []
+            self.last_release_ns[key_id] = timestamp_ns
+            return [event]
+        
+        released_ns = self.last_release_ns.get(key_id)
+        if released_ns is not None and timestamp_ns - released_ns < self.window_ns:
+            self.suppressed.add(key_id)
+            self.hits += 1
+            return []
+        return [event]
+    
+    def reset(self):
+        """Forget release times."""
+        super().reset()
+        self.last_release_ns.clear()
+        self.suppressed.clear()
+
+
+class ModifierNoiseFilter(RecordingFilter):
+    """Drops modifiers pressed and released without any other key.
+    
+    Modifier presses are held back until another key shows they were part
+    of a combination; timestamps are kept so timing is unaffected.
+    """
+    
+    name = "modifier_noise"
+    
+    def __init__(self):
+        super().__init__()
+        self.pending: List[RecordedEvent] = []
+    
+    def process(self, event: RecordedEvent) -> List[RecordedEvent]:
+        """Hold back lone modifier presses; drop them if released alone."""
+        kind, key_id, _ = event
+        if key_id not in MODIFIER_FAMILY_IDS:
+            if not self.pending:
+                return [event]
+            events = self.pending + [event]
+            self.pending = []
+            return events
+        
+        if kind == EVENT_PRESS:
+            if any(pending[1] == key_id for pending in self.pending):
+                # Auto-repeat of a modifier that is still held back
+                self.hits += 1
+                return []
+            self.pending.append(event)
+            return []
+        
+        for index, pending in enumerate(self.pending):
+            if pending[1] == key_id:
+                del self.pending[index]
+                self.hits += 2
+                return []
+        return [event]
+    
+    def reset(self):
+        """Discard held-back presses."""
+        super().reset()
+        self.pending = []
+
+
+class RecordingFilterChain:
+    """Runs events through filter stages in order."""
+    
+    def __init__(self, filters: Iterable[RecordingFilter] = ()):
+        self.filters: List[RecordingFilter] = list(filters)
+    
+    def process(self, kind: int, key_id: int, timestamp_ns: int) -> List[RecordedEvent]:
+        """Get the events that survive every stage."""
+        events = [(kind, key_id, timestamp_ns)]
+        for stage in self.filters:
+            if not events:
+                break
+            passed = []
+            for event in events:
+                passed.extend(stage.process(event))
+            events = passed
+        return events
+    
+    def reset(self):
+        """Reset every stage before a new recording."""
+        for stage in self.filters:
+            stage.reset()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of events each stage dropped."""
+        return {stage.name: stage.hits for stage in self.filters}
+    
+    def __len__(self) -> int:
+        """Return number of stages."""
+        return len(self.filters)
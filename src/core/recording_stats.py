@@ -0,0 +1,74 @@
+"""
+Live statistics for a recording in progress.
+"""
+
+from array import array
+from typing import Dict
+
+
+class RecordingStats:
+    """Rolling key rate and hook-to-consumer lag.
+    
+    Key presses are counted in one-second buckets over a short window, and
+    lag is tracked as a moving average plus the worst value since the last
+    snapshot. Recording an event is a handful of integer operations.
+    """
+    
+    def __init__(self, window_seconds: int = 5, lag_smoothing: float = 0.1):
+        self.window_seconds = max(1, window_seconds)
+        self.lag_smoothing = lag_smoothing
+        self.buckets = array('l', bytes(array('l').itemsize * self.window_seconds))
+        self.reset(0)
+    
+    def reset(self, now_ns: int):
+        """Start counting from now_ns."""
+        for i in range(self.window_seconds):
+            self.buckets[i] = 0
+        self.start_ns = now_ns
+        self.current_second = 0
+        self.events = 0
+        self.lag_avg_ns = 0.0
+        self.lag_max_ns = 0
+    
+    def record(self, event_ns: int, processed_ns: int, is_press: bool):
+        """Record an event stamped at event_ns and processed at processed_ns."""
+        self.events += 1
+        lag_ns = processed_ns - event_ns
+        self.lag_avg_ns += (lag_ns - self.lag_avg_ns) * self.lag_smoothing
+        if lag_ns > self.lag_max_ns:
+            self.lag_max_ns = lag_ns
+        
+        if is_press:
+            self._advance(event_ns)
+            self.buckets[self.current_second % self.window_seconds] += 1
+    
+    def _advance(self, now_ns: int):
+        """Zero the buckets for seconds that have passed without events."""
+        second = (now_ns - self.start_ns) // 1_000_000_000
+        if second <= self.current_second:
+            return
+        last = min(second, self.current_second + self.window_seconds)
+        for s in range(self.current_second + 1, last + 1):
+            self.buckets[s % self.window_seconds] = 0
+        self.current_second = second
+    
+    def snapshot(self, now_ns: int) -> Dict[str, float]:
+        """Get the rolling rate and lag, and start a new worst-lag interval.
+        
+        Only reads the buckets, so it is safe to call from another thread.
+        """
+        second = (now_ns - self.start_ns) // 1_000_000_000
+        first = max(second, self.current_second) - self.window_seconds + 1
+        presses = sum(self.buckets[s % self.window_seconds]
+                      for s in range(max(0, first), self.current_second + 1))
+        elapsed = min(self.window_seconds, (now_ns - self.start_ns) / 1_000_000_000)
+        keys_per_sec = presses / elapsed if elapsed > 0 else 0.0
+        
+        stats = {
+            'keys_per_sec': keys_per_sec,
+            'lag_avg_ms': self.lag_avg_ns / 1_000_000.0,
+            'lag_max_ms': self.lag_max_ns / 1_000_000.0,
+            'events': self.events
+        }
+        self.lag_max_ns = 0
+        return stats
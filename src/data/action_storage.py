@@ -4,10 +4,11 @@ Action storage and script file management.
 
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 
 from data.key_sequence import KeySequence, KeyAction, ActionType
+from data.key_track import KeyTrack
 
 
 class ActionStorage:
@@ -39,6 +40,7 @@ class ActionStorage:
             data = {
                 'version': '1.0',
                 'created': datetime.now().isoformat(),
+                'summary': sequence.get_summary(),
                 'sequence': sequence.to_dict()
             }
             
@@ -52,6 +54,18 @@ class ActionStorage:
             print(f"Error saving sequence: {e}")
             return False
     
+    def save_tracks(self, tracks: Iterable[KeyTrack], base_filename: str) -> bool:
+        """Save each recording track to its own file, named base_filename_track."""
+        if base_filename.endswith('.json'):
+            base_filename = base_filename[:-5]
+        
+        success = True
+        for track in tracks:
+            if len(track):
+                filename = f"{base_filename}_{track.name}"
+                success = self.save_sequence(track.to_sequence(), filename) and success
+        return success
+    
     def load_sequence(self, filename: str) -> Optional[KeySequence]:
         """Load a key sequence from file."""
         try:
@@ -97,12 +111,16 @@ class ActionStorage:
                         
                         sequence_data = data.get('sequence', {})
                         name = sequence_data.get('name', filename[:-5])  # Remove .json
-                        action_count = len(sequence_data.get('actions', []))
+                        
+                        # Files saved before summaries only know their length
+                        summary = data.get('summary') or {
+                            'action_count': len(sequence_data.get('actions', []))
+                        }
                         
                         sequences.append({
                             'filename': filename,
                             'name': name,
-                            'action_count': action_count,
+                            **summary,
                             'modified': modified.strftime("%Y-%m-%d %H:%M"),
                             'created': data.get('created', 'Unknown')
                         })
@@ -160,7 +178,7 @@ class ActionStorage:
                     key_name = self._get_readable_key_name(action.key)
                     script_lines.append(f"KEY: {key_name}")
                 elif action.action_type == ActionType.DELAY:
-                    delay_ms = int(action.duration * 1000)
+                    delay_ms = action.duration_ns // 1_000_000
                     script_lines.append(f"DELAY: {delay_ms}")
                 elif action.action_type == ActionType.KEY_RELEASE:
                     # Skip key releases in script format
@@ -185,7 +203,7 @@ class ActionStorage:
             # Parse script content
             lines = content.split('\n')
             sequence = KeySequence(os.path.basename(filepath))
-            timestamp = 0.0
+            timestamp_ns = 0
             
             for line in lines:
                 line = line.strip()
@@ -199,22 +217,22 @@ class ActionStorage:
                     action = KeyAction(
                         action_type=ActionType.KEY_PRESS,
                         key=self._parse_script_key(key_part),
-                        timestamp=timestamp
+                        timestamp_ns=timestamp_ns
                     )
                     sequence.add_action(action)
-                    timestamp += 0.1
+                    timestamp_ns += 100_000_000
                     
                 elif line.upper().startswith('DELAY:'):
                     delay_part = line[6:].strip()
                     delay_ms = int(delay_part)
                     
-                    timestamp += delay_ms / 1000.0
+                    timestamp_ns += delay_ms * 1_000_000
                     
                     action = KeyAction(
                         action_type=ActionType.DELAY,
                         key="",
-                        timestamp=timestamp,
-                        duration=delay_ms / 1000.0
+                        timestamp_ns=timestamp_ns,
+                        duration_ns=delay_ms * 1_000_000
                     )
                     sequence.add_action(action)
             
@@ -3,10 +3,23 @@ Data models for key sequences and actions.
 """
 
 import time
-from typing import List, Dict, Any
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableSequence
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from utils.key_registry import key_registry
+
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def seconds_to_ns(seconds: float) -> int:
+    """Convert float seconds to integer nanoseconds."""
+    return int(round(seconds * NS_PER_SECOND))
+
 
 class ActionType(Enum):
     """Types of recorded actions."""
@@ -15,26 +28,78 @@ class ActionType(Enum):
     DELAY = "delay"
 
 
-@dataclass
+@dataclass(init=False)
 class KeyAction:
-    """Represents a single key action (press/release) with timing."""
+    """Represents a single key action (press/release) with timing.
+    
+    Times are integer nanoseconds from the recording's perf_counter_ns
+    origin. timestamp and duration expose them as float seconds, and the
+    constructor still accepts seconds for existing callers. The key is held
+    as an id from the key registry; key gives its key code string.
+    """
     action_type: ActionType
-    key: str
-    timestamp: float
-    duration: float = 0.0  # For key hold duration
+    key_id: int
+    timestamp_ns: int = 0
+    duration_ns: int = 0  # For key hold duration
+    
+    def __init__(self, action_type: ActionType, key: str = "", timestamp: float = 0.0,
+                 duration: float = 0.0, timestamp_ns: Optional[int] = None,
+                 duration_ns: Optional[int] = None, key_id: Optional[int] = None):
+        self.action_type = action_type
+        self.key_id = key_id if key_id is not None else key_registry.intern(key)
+        if timestamp_ns is None:
+            timestamp_ns = seconds_to_ns(timestamp)
+        if duration_ns is None:
+            duration_ns = seconds_to_ns(duration)
+        self.timestamp_ns = timestamp_ns
+        self.duration_ns = duration_ns
+    
+    @property
+    def key(self) -> str:
+        """Get the key code string."""
+        return key_registry.code(self.key_id)
+    
+    @key.setter
+    def key(self, key_code: str):
+        self.key_id = key_registry.intern(key_code)
+    
+    @property
+    def timestamp(self) -> float:
+        """Get the timestamp in seconds."""
+        return self.timestamp_ns / NS_PER_SECOND
+    
+    @timestamp.setter
+    def timestamp(self, seconds: float):
+        self.timestamp_ns = seconds_to_ns(seconds)
+    
+    @property
+    def duration(self) -> float:
+        """Get the duration in seconds."""
+        return self.duration_ns / NS_PER_SECOND
+    
+    @duration.setter
+    def duration(self, seconds: float):
+        self.duration_ns = seconds_to_ns(seconds)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
             'action_type': self.action_type.value,
             'key': self.key,
-            'timestamp': self.timestamp,
-            'duration': self.duration
+            'timestamp_ns': self.timestamp_ns,
+            'duration_ns': self.duration_ns
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'KeyAction':
-        """Create from dictionary."""
+        """Create from dictionary, accepting older float-second data."""
+        if 'timestamp_ns' in data:
+            return cls(
+                action_type=ActionType(data['action_type']),
+                key=data['key'],
+                timestamp_ns=int(data['timestamp_ns']),
+                duration_ns=int(data.get('duration_ns', 0))
+            )
         return cls(
             action_type=ActionType(data['action_type']),
             key=data['key'],
@@ -43,40 +108,311 @@ class KeyAction:
         )
 
 
+# ActionType <-> compact code used by the columnar storage
+ACTION_TYPES: List[ActionType] = list(ActionType)
+ACTION_CODES = {action_type: code for code, action_type in enumerate(ACTION_TYPES)}
+CODE_PRESS = ACTION_CODES[ActionType.KEY_PRESS]
+CODE_RELEASE = ACTION_CODES[ActionType.KEY_RELEASE]
+CODE_DELAY = ACTION_CODES[ActionType.DELAY]
+
+
+class ActionList(MutableSequence):
+    """List-like view of a KeySequence's actions.
+    
+    Items are built as KeyAction objects on access; they are copies, so
+    changing one does not change the sequence. Assign the item back, or
+    use KeySequence.set_duration_ns(), to update a stored action.
+    """
+    
+    def __init__(self, sequence: 'KeySequence'):
+        self._sequence = sequence
+    
+    def __len__(self) -> int:
+        """Return number of actions."""
+        return len(self._sequence.timestamps_ns)
+    
+    def __getitem__(self, index):
+        """Get the action at index, or a list of actions for a slice."""
+        if isinstance(index, slice):
+            return [self._sequence.get_action(i)
+                    for i in range(*index.indices(len(self)))]
+        return self._sequence.get_action(index)
+    
+    def __setitem__(self, index, action):
+        """Store an action (or actions for a slice) back in the sequence."""
+        if isinstance(index, slice):
+            actions = self[:]
+            actions[index] = action
+            self._sequence.actions = actions
+            return
+        self._sequence.set_action(index, action)
+    
+    def __delitem__(self, index):
+        """Delete the action at index, or a slice of actions."""
+        self._sequence.delete_actions(index)
+    
+    def __iter__(self) -> Iterator[KeyAction]:
+        """Iterate over the actions."""
+        return self._sequence.iter_actions()
+    
+    def insert(self, index: int, action: KeyAction):
+        """Insert an action before index."""
+        self._sequence.insert_action(index, action)
+    
+    def append(self, action: KeyAction):
+        """Append an action."""
+        self._sequence.add_action(action)
+    
+    def clear(self):
+        """Remove all actions."""
+        self._sequence.clear()
+    
+    def __eq__(self, other) -> bool:
+        """Compare element-wise with another action list."""
+        if isinstance(other, (ActionList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        """Show the actions as a list."""
+        return f"ActionList({list(self)!r})"
+
+
 class KeySequence:
-    """Manages a sequence of key actions."""
+    """Manages a sequence of key actions.
+    
+    Actions are stored column-wise in typed arrays: a byte per action type,
+    a uint32 key registry id, and int64 timestamps and durations, 21 bytes
+    per action. The actions attribute gives the familiar list-of-KeyAction
+    view on top.
+    
+    Counts per action type, presses per key and total delay time are kept
+    up to date by every mutation, so summaries never rescan the actions.
+    
+    Timestamps double as a time index: while they are in order (the usual
+    case for recordings) lookups bisect the column directly, otherwise a
+    sorted permutation is built once and reused until the next edit.
+    """
     
     def __init__(self, name: str = ""):
         self.name = name
-        self.actions: List[KeyAction] = []
+        self._reset_columns()
         self.created_at = time.time()
         self.modified_at = time.time()
     
-    def add_action(self, action: KeyAction):
-        """Add a key action to the sequence."""
-        self.actions.append(action)
+    def _reset_columns(self):
+        """Allocate empty columns and zero the running aggregates."""
+        self.action_codes = array('B')
+        self.key_ids = array('I')
+        self.timestamps_ns = array('q')
+        self.durations_ns = array('q')
+        self.type_counts = [0] * len(ACTION_TYPES)
+        self.key_press_counts: Dict[int, int] = {}
+        self.total_delay_ns = 0
+        self._time_sorted: Optional[bool] = True
+        self._time_order: Optional[array] = None
+        self._time_order_ns: Optional[array] = None
+    
+    def _invalidate_time_index(self):
+        """Forget the time index after an edit that may reorder timestamps."""
+        self._time_sorted = None
+        self._time_order = None
+    
+    def _count(self, code: int, key_id: int, duration_ns: int, delta: int):
+        """Update the aggregates for one action added (delta 1) or removed (-1)."""
+        self.type_counts[code] += delta
+        if code == CODE_PRESS:
+            count = self.key_press_counts.get(key_id, 0) + delta
+            if count > 0:
+                self.key_press_counts[key_id] = count
+            else:
+                self.key_press_counts.pop(key_id, None)
+        elif code == CODE_DELAY:
+            self.total_delay_ns += delta * duration_ns
+    
+    @property
+    def actions(self) -> ActionList:
+        """Get a list-like view of the actions."""
+        return ActionList(self)
+    
+    @actions.setter
+    def actions(self, actions: Iterable[KeyAction]):
+        """Replace all actions."""
+        actions = list(actions)
+        self._reset_columns()
+        for action in actions:
+            self._append(action.action_type, action.key_id,
+                         action.timestamp_ns, action.duration_ns)
+        self.modified_at = time.time()
+    
+    def _append(self, action_type: ActionType, key_id: int, timestamp_ns: int,
+                duration_ns: int):
+        """Append one action's fields to the columns."""
+        code = ACTION_CODES[action_type]
+        if self.timestamps_ns and timestamp_ns < self.timestamps_ns[-1]:
+            self._time_sorted = False
+        self._time_order = None
+        self.action_codes.append(code)
+        self.key_ids.append(key_id)
+        self.timestamps_ns.append(timestamp_ns)
+        self.durations_ns.append(duration_ns)
+        self._count(code, key_id, duration_ns, 1)
+    
+    def add_action(self, action: KeyAction) -> int:
+        """Add a key action to the sequence and return its index."""
+        self._append(action.action_type, action.key_id,
+                     action.timestamp_ns, action.duration_ns)
+        self.modified_at = time.time()
+        return len(self.timestamps_ns) - 1
+    
+    def get_action(self, index: int) -> KeyAction:
+        """Build the action at index."""
+        return KeyAction(
+            ACTION_TYPES[self.action_codes[index]],
+            key_id=self.key_ids[index],
+            timestamp_ns=self.timestamps_ns[index],
+            duration_ns=self.durations_ns[index]
+        )
+    
+    def set_action(self, index: int, action: KeyAction):
+        """Replace the action at index."""
+        self._count(self.action_codes[index], self.key_ids[index],
+                    self.durations_ns[index], -1)
+        code = ACTION_CODES[action.action_type]
+        self.action_codes[index] = code
+        self.key_ids[index] = action.key_id
+        self.timestamps_ns[index] = action.timestamp_ns
+        self.durations_ns[index] = action.duration_ns
+        self._count(code, action.key_id, action.duration_ns, 1)
+        self._invalidate_time_index()
+        self.modified_at = time.time()
+    
+    def set_duration_ns(self, index: int, duration_ns: int):
+        """Update the hold (or delay) duration of the action at index."""
+        if self.action_codes[index] == CODE_DELAY:
+            self.total_delay_ns += duration_ns - self.durations_ns[index]
+        self.durations_ns[index] = duration_ns
+    
+    def insert_action(self, index: int, action: KeyAction):
+        """Insert an action before index."""
+        code = ACTION_CODES[action.action_type]
+        self.action_codes.insert(index, code)
+        self.key_ids.insert(index, action.key_id)
+        self.timestamps_ns.insert(index, action.timestamp_ns)
+        self.durations_ns.insert(index, action.duration_ns)
+        self._count(code, action.key_id, action.duration_ns, 1)
+        self._invalidate_time_index()
+        self.modified_at = time.time()
+    
+    def delete_actions(self, index):
+        """Delete the action at index, or a slice of actions."""
+        if isinstance(index, slice):
+            removed = range(*index.indices(len(self.timestamps_ns)))
+        else:
+            removed = (index,)
+        for i in removed:
+            self._count(self.action_codes[i], self.key_ids[i], self.durations_ns[i], -1)
+        for column in (self.action_codes, self.key_ids,
+                       self.timestamps_ns, self.durations_ns):
+            del column[index]
+        self._invalidate_time_index()
         self.modified_at = time.time()
     
+    def iter_actions(self) -> Iterator[KeyAction]:
+        """Yield the actions in order."""
+        types = ACTION_TYPES
+        for code, key_id, timestamp_ns, duration_ns in zip(
+                self.action_codes, self.key_ids, self.timestamps_ns, self.durations_ns):
+            yield KeyAction(types[code], key_id=key_id,
+                            timestamp_ns=timestamp_ns, duration_ns=duration_ns)
+    
     def clear(self):
         """Clear all actions."""
-        self.actions.clear()
+        self._reset_columns()
         self.modified_at = time.time()
     
+    def get_memory_bytes(self) -> int:
+        """Estimate the memory held by the columns."""
+        columns = (self.action_codes, self.key_ids, self.timestamps_ns,
+                   self.durations_ns)
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns)
+    
+    def is_time_sorted(self) -> bool:
+        """Check whether timestamps never decrease (cached until the next edit)."""
+        if self._time_sorted is None:
+            timestamps = self.timestamps_ns
+            self._time_sorted = all(timestamps[i - 1] <= timestamps[i]
+                                    for i in range(1, len(timestamps)))
+        return self._time_sorted
+    
+    def index_at_time(self, timestamp_ns: int) -> int:
+        """Get the index of the earliest action at or after timestamp_ns.
+        
+        Returns len(self) if every action is earlier. O(log n) once the
+        time index is built.
+        """
+        timestamps = self.timestamps_ns
+        if self.is_time_sorted():
+            return bisect_left(timestamps, timestamp_ns)
+        
+        # Rebuilt together; edits only need to drop _time_order
+        if self._time_order is None or self._time_order_ns is None:
+            order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+            self._time_order = array('I', order)
+            self._time_order_ns = array('q', map(timestamps.__getitem__, order))
+        rank = bisect_left(self._time_order_ns, timestamp_ns)
+        if rank == len(self._time_order):
+            return len(timestamps)
+        return self._time_order[rank]
+    
+    def time_at_index(self, index: int) -> int:
+        """Get the timestamp of the action at index in nanoseconds."""
+        return self.timestamps_ns[index]
+    
     def get_duration(self) -> float:
         """Get total duration of the sequence."""
-        if not self.actions:
-            return 0.0
-        return self.actions[-1].timestamp - self.actions[0].timestamp
+        return self.get_duration_ns() / NS_PER_SECOND
+    
+    def get_duration_ns(self) -> int:
+        """Get total duration of the sequence in nanoseconds."""
+        if not self.timestamps_ns:
+            return 0
+        return self.timestamps_ns[-1] - self.timestamps_ns[0]
     
     def get_key_count(self) -> int:
         """Get number of key press actions."""
-        return len([a for a in self.actions if a.action_type == ActionType.KEY_PRESS])
+        return self.type_counts[CODE_PRESS]
+    
+    def get_type_count(self, action_type: ActionType) -> int:
+        """Get number of actions of one type."""
+        return self.type_counts[ACTION_CODES[action_type]]
+    
+    def get_delay_ns(self) -> int:
+        """Get the total time spent in explicit delays, in nanoseconds."""
+        return self.total_delay_ns
+    
+    def get_key_histogram(self) -> Dict[str, int]:
+        """Get the number of presses of each key, by key code."""
+        return {key_registry.code(key_id): count
+                for key_id, count in self.key_press_counts.items()}
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get the running aggregates as a dictionary."""
+        return {
+            'action_count': len(self.timestamps_ns),
+            'key_count': self.type_counts[CODE_PRESS],
+            'release_count': self.type_counts[CODE_RELEASE],
+            'delay_count': self.type_counts[CODE_DELAY],
+            'distinct_keys': len(self.key_press_counts),
+            'duration_ms': self.get_duration_ns() // 1_000_000,
+            'delay_ms': self.total_delay_ns // 1_000_000
+        }
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
             'name': self.name,
-            'actions': [action.to_dict() for action in self.actions],
+            'actions': [action.to_dict() for action in self.iter_actions()],
             'created_at': self.created_at,
             'modified_at': self.modified_at
         }
@@ -85,16 +421,20 @@ class KeySequence:
     def from_dict(cls, data: Dict[str, Any]) -> 'KeySequence':
         """Create from dictionary."""
         sequence = cls(data.get('name', ''))
-        sequence.actions = [KeyAction.from_dict(action_data) 
-                          for action_data in data.get('actions', [])]
+        for action_data in data.get('actions', []):
+            sequence.add_action(KeyAction.from_dict(action_data))
         sequence.created_at = data.get('created_at', time.time())
         sequence.modified_at = data.get('modified_at', time.time())
         return sequence
     
+    def __iter__(self) -> Iterator[KeyAction]:
+        """Iterate over the actions."""
+        return self.iter_actions()
+    
     def __len__(self) -> int:
         """Return number of actions."""
-        return len(self.actions)
+        return len(self.timestamps_ns)
     
     def __bool__(self) -> bool:
         """Return True if sequence has actions."""
-        return len(self.actions) > 0
+        return len(self.timestamps_ns) > 0
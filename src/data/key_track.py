@@ -0,0 +1,48 @@
+"""
+Recording tracks and streaming track merges.
+"""
+
+import heapq
+from typing import Iterable, Iterator
+
+from data.key_sequence import KeySequence, KeyAction
+
+
+class KeyTrack(KeySequence):
+    """A named recording track.
+    
+    Uses the same columnar storage as KeySequence; actions are only built
+    as KeyAction objects when the track is iterated.
+    """
+    
+    def append(self, action: KeyAction) -> int:
+        """Append an action and return its index."""
+        return self.add_action(action)
+    
+    def set_duration(self, index: int, duration_ns: int):
+        """Update the hold duration of a press once its release is seen."""
+        self.set_duration_ns(index, duration_ns)
+    
+    def to_sequence(self) -> KeySequence:
+        """Get the track as a standalone sequence."""
+        sequence = KeySequence(self.name)
+        for action in self:
+            sequence.add_action(action)
+        return sequence
+
+
+def iter_merged(tracks: Iterable[KeySequence]) -> Iterator[KeyAction]:
+    """Yield the actions of several tracks in timestamp order.
+    
+    A k-way heap merge over the tracks' lazy iterators, so only one pending
+    action per track is held at a time. Ties keep track order.
+    """
+    return heapq.merge(*tracks, key=lambda action: action.timestamp_ns)
+
+
+def merge_tracks(tracks: Iterable[KeySequence], name: str = "") -> KeySequence:
+    """Merge tracks into one sequence on their shared clock."""
+    sequence = KeySequence(name)
+    for action in iter_merged(tracks):
+        sequence.add_action(action)
+    return sequence
@@ -0,0 +1,202 @@
+"""
+Append-only on-disk journal of a recording in progress.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional, TextIO
+
+from data.key_sequence import KeySequence, KeyAction, ActionType
+
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".autokeyboard",
+                                    "journal", "recording.jsonl")
+
+
+class RecordingJournal:
+    """Streams recorded actions to a JSON-lines file.
+    
+    Actions are queued by the recorder and written by a background thread
+    in chunks, each flushed and synced to disk, so at most one chunk is lost
+    on a crash. The file starts with a header line and ends with an end
+    marker once the recording stops cleanly.
+    """
+    
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH, flush_interval: float = 0.5,
+                 chunk_size: int = 256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.chunk_size = max(1, chunk_size)
+        self.actions_written = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._file: Optional[TextIO] = None
+    
+    def open(self, name: str = "") -> bool:
+        """Start a new journal, replacing any previous one."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write_line({'type': 'header', 'name': name,
+                              'started_at': time.time()})
+            self._sync()
+            self.actions_written = 0
+            
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name="RecordingJournalWriter",
+                daemon=True
+            )
+            self._writer.start()
+            return True
+        
+        except Exception as e:
+            print(f"Error opening recording journal: {e}")
+            self._file = None
+            return False
+    
+    @property
+    def is_open(self) -> bool:
+        """Check whether a recording is being journaled."""
+        return self._file is not None
+    
+    def append(self, action: KeyAction):
+        """Queue an action to be written, as it is now.
+        
+        The recorder fills in a press's duration later, on release, so the
+        fields are copied here rather than read by the writer thread.
+        """
+        if self._file is not None:
+            self._queue.put(action.to_dict())
+    
+    def close(self):
+        """Write everything queued, mark the journal finished and close it."""
+        if self._file is None:
+            return
+        
+        try:
+            if self._writer and self._writer.is_alive():
+                self._queue.put(None)
+                self._writer.join(timeout=5.0)
+            self._write_line({'type': 'end', 'actions': self.actions_written})
+            self._sync()
+            self._file.close()
+        
+        except Exception as e:
+            print(f"Error closing recording journal: {e}")
+        
+        finally:
+            self._file = None
+            self._writer = None
+    
+    def discard(self):
+        """Close and delete the journal file."""
+        self.close()
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            print(f"Error deleting recording journal: {e}")
+    
+    def _writer_loop(self):
+        """Writer thread: write queued action records in synced chunks."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            
+            chunk = []
+            stop = item is None
+            if not stop:
+                chunk.append(item)
+            while not stop and len(chunk) < self.chunk_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    chunk.append(item)
+            
+            try:
+                if chunk:
+                    self._file.write(''.join(json.dumps(record) + '\n'
+                                             for record in chunk))
+                    self._sync()
+                    self.actions_written += len(chunk)
+            except Exception as e:
+                print(f"Error writing recording journal: {e}")
+            
+            if stop:
+                return
+    
+    def _write_line(self, record: Dict):
+        """Write one JSON record, if the journal is open."""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record) + '\n')
+    
+    def _sync(self):
+        """Flush buffered lines through to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    @staticmethod
+    def exists(path: str = DEFAULT_JOURNAL_PATH) -> bool:
+        """Check whether a journal is waiting to be recovered."""
+        return os.path.exists(path)
+    
+    @staticmethod
+    def recover(path: str = DEFAULT_JOURNAL_PATH) -> Optional[KeySequence]:
+        """Rebuild a sequence from a finished or interrupted journal.
+        
+        Presses are journaled before their release is seen, so hold
+        durations are recomputed from the releases. A truncated last line
+        from a crash is ignored.
+        """
+        try:
+            if not os.path.exists(path):
+                return None
+            
+            sequence = KeySequence()
+            open_presses: Dict[int, KeyAction] = {}
+            press_indexes: Dict[int, int] = {}
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    
+                    record_type = record.get('type')
+                    if record_type == 'header':
+                        sequence.name = record.get('name', '')
+                        continue
+                    if record_type == 'end':
+                        continue
+                    
+                    action = KeyAction.from_dict(record)
+                    index = sequence.add_action(action)
+                    if action.action_type == ActionType.KEY_PRESS:
+                        open_presses[action.key_id] = action
+                        press_indexes[action.key_id] = index
+                    elif action.action_type == ActionType.KEY_RELEASE:
+                        press = open_presses.pop(action.key_id, None)
+                        if press is not None:
+                            index = press_indexes.pop(action.key_id)
+                            sequence.set_duration_ns(
+                                index, action.timestamp_ns - press.timestamp_ns)
+            
+            return sequence
+        
+        except Exception as e:
+            print(f"Error recovering recording journal: {e}")
+            return None
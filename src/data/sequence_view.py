@@ -0,0 +1,261 @@
+"""
+Zero-copy views onto part of a key sequence.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data.key_sequence import KeySequence, KeyAction, ActionType, ACTION_TYPES
+
+# Column attribute and array typecode of the columnar storage
+_COLUMNS = (('action_codes', 'B'), ('key_ids', 'I'), ('timestamps_ns', 'q'),
+            ('durations_ns', 'q'))
+
+
+class ColumnView:
+    """Read-only index mapping onto one column of a view's parent.
+    
+    Looks the column up on the parent on every access, so a parent whose
+    columns are reallocated (cleared or replaced) is still followed.
+    """
+    
+    __slots__ = ('_view', '_name')
+    
+    def __init__(self, view: 'SequenceView', name: str):
+        self._view = view
+        self._name = name
+    
+    def __len__(self) -> int:
+        """Return number of values in the view."""
+        return self._view._length
+    
+    def __getitem__(self, index: int):
+        """Get the value at index in the view."""
+        return getattr(self._view.parent, self._name)[self._view._parent_index(index)]
+    
+    def __iter__(self) -> Iterator:
+        """Iterate over the values in the view."""
+        column = getattr(self._view.parent, self._name)
+        for start, stop in zip(self._view._starts, self._view._stops):
+            yield from map(column.__getitem__, range(start, stop))
+
+
+class SequenceView(KeySequence):
+    """A KeySequence that references a range, or several ranges, of another's storage.
+    
+    Nothing is copied when a view is made: its columns map view indices
+    onto the parent's arrays, so the player, the plan compilers and
+    ActionStorage read it like any other sequence. A view sees later
+    changes to the parent's actions in its range, except that its time
+    index is built once and kept until the view itself is changed;
+    shortening the parent under a view is not supported. The first
+    change made through the view copies its actions into storage of its
+    own (copy on write), after which it is an ordinary, detached sequence.
+    """
+    
+    # The sequence viewed, or None once the view has copied its actions
+    parent: Optional[KeySequence]
+    
+    def __init__(self, parent: KeySequence, start: int = 0, stop: Optional[int] = None,
+                 name: Optional[str] = None):
+        """Make a view of parent's actions from start up to stop."""
+        start, stop, _ = slice(start, stop).indices(len(parent))
+        self._bind(parent, [(start, stop)], name)
+    
+    @classmethod
+    def from_ranges(cls, parent: KeySequence, ranges: Iterable[Tuple[int, int]],
+                    name: Optional[str] = None) -> 'SequenceView':
+        """Make a view of several (start, stop) ranges of parent, in the order given."""
+        view = cls.__new__(cls)
+        view._bind(parent, list(ranges), name)
+        return view
+    
+    @classmethod
+    def strided(cls, parent: KeySequence, start: int, length: int, stride: int,
+                count: Optional[int] = None,
+                name: Optional[str] = None) -> 'SequenceView':
+        """Make a view of length actions per stride, count times (or to the end)."""
+        if stride <= 0:
+            raise ValueError("stride must be positive")
+        if count is None:
+            count = max(0, -(-(len(parent) - start) // stride))
+        ranges = [(start + k * stride, start + k * stride + length)
+                  for k in range(count)]
+        return cls.from_ranges(parent, ranges, name)
+    
+    def _bind(self, parent: KeySequence, ranges: List[Tuple[int, int]],
+              name: Optional[str]):
+        """Point the view at ranges of parent, flattening views of views."""
+        if isinstance(parent, SequenceView) and parent.parent is not None:
+            ranges = parent._parent_ranges(ranges)
+            parent = parent.parent
+        
+        self.parent = parent
+        self.name = parent.name if name is None else name
+        self.created_at = parent.created_at
+        self.modified_at = parent.modified_at
+        self._time_sorted = None
+        self._time_order = None
+        self._time_order_ns = None
+        
+        # Clamp to the parent and merge touching ranges
+        size = len(parent)
+        self._starts = array('q')
+        self._stops = array('q')
+        self._offsets = array('q')
+        self._length = 0
+        for start, stop in ranges:
+            start = max(0, min(start, size))
+            stop = max(start, min(stop, size))
+            if start == stop:
+                continue
+            if self._stops and self._stops[-1] == start:
+                self._stops[-1] = stop
+            else:
+                self._starts.append(start)
+                self._stops.append(stop)
+                self._offsets.append(self._length)
+            self._length += stop - start
+        self._ascending = all(self._stops[k - 1] <= self._starts[k]
+                              for k in range(1, len(self._starts)))
+        
+        for column, _ in _COLUMNS:
+            setattr(self, column, ColumnView(self, column))
+    
+    def _parent_index(self, index: int) -> int:
+        """Map a view index to the parent's index."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("sequence view index out of range")
+        if len(self._starts) == 1:
+            return self._starts[0] + index
+        k = bisect_right(self._offsets, index) - 1
+        return self._starts[k] + index - self._offsets[k]
+    
+    def _parent_ranges(self,
+                       ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Map ranges of view indices to ranges of the parent's indices."""
+        mapped = []
+        for start, stop in ranges:
+            start, stop = max(0, start), min(stop, self._length)
+            k = max(0, bisect_right(self._offsets, start) - 1)
+            while start < stop and k < len(self._starts):
+                first = self._starts[k] + start - self._offsets[k]
+                last = min(self._stops[k], self._starts[k] + stop - self._offsets[k])
+                mapped.append((first, last))
+                start += last - first
+                k += 1
+        return mapped
+    
+    @property
+    def is_materialized(self) -> bool:
+        """Check whether the view has copied its actions into its own storage."""
+        return self.parent is None
+    
+    def _materialize(self):
+        """Copy the viewed actions into storage of our own."""
+        if self.parent is None:
+            return
+        columns = [array(typecode, getattr(self, column))
+                   for column, typecode in _COLUMNS]
+        self._reset_columns()
+        for (column, _), values in zip(_COLUMNS, columns):
+            setattr(self, column, values)
+        for code, key_id, duration_ns in zip(self.action_codes, self.key_ids,
+                                             self.durations_ns):
+            self._count(code, key_id, duration_ns, 1)
+        self._invalidate_time_index()
+    
+    def _scan_aggregates(self):
+        """Recount the aggregates, which a view only keeps once materialized."""
+        if self.parent is None:
+            return
+        self.type_counts = [0] * len(ACTION_TYPES)
+        self.key_press_counts = {}
+        self.total_delay_ns = 0
+        for code, key_id, duration_ns in zip(self.action_codes, self.key_ids,
+                                             self.durations_ns):
+            self._count(code, key_id, duration_ns, 1)
+    
+    def to_sequence(self) -> KeySequence:
+        """Get the viewed actions as a standalone sequence."""
+        sequence = KeySequence(self.name)
+        sequence.actions = self.iter_actions()
+        return sequence
+    
+    # Copy on write: every mutation materializes first
+    
+    def _reset_columns(self):
+        """Detach from the parent and allocate empty columns."""
+        self.parent = None
+        super()._reset_columns()
+    
+    def _append(self, action_type: ActionType, key_id: int, timestamp_ns: int,
+                duration_ns: int):
+        """Append one action's fields to the columns."""
+        self._materialize()
+        super()._append(action_type, key_id, timestamp_ns, duration_ns)
+    
+    def set_action(self, index: int, action: KeyAction):
+        """Replace the action at index."""
+        self._materialize()
+        super().set_action(index, action)
+    
+    def set_duration_ns(self, index: int, duration_ns: int):
+        """Update the hold (or delay) duration of the action at index."""
+        self._materialize()
+        super().set_duration_ns(index, duration_ns)
+    
+    def insert_action(self, index: int, action: KeyAction):
+        """Insert an action before index."""
+        self._materialize()
+        super().insert_action(index, action)
+    
+    def delete_actions(self, index):
+        """Delete the action at index, or a slice of actions."""
+        self._materialize()
+        super().delete_actions(index)
+    
+    # Reads that need more than the columns
+    
+    def get_memory_bytes(self) -> int:
+        """Estimate the memory held by the columns, or by the range table of a view."""
+        if self.parent is None:
+            return super().get_memory_bytes()
+        return sum(column.buffer_info()[1] * column.itemsize
+                   for column in (self._starts, self._stops, self._offsets))
+    
+    def get_key_count(self) -> int:
+        """Get number of key press actions."""
+        self._scan_aggregates()
+        return super().get_key_count()
+    
+    def get_type_count(self, action_type: ActionType) -> int:
+        """Get number of actions of one type."""
+        self._scan_aggregates()
+        return super().get_type_count(action_type)
+    
+    def get_delay_ns(self) -> int:
+        """Get the total time spent in explicit delays, in nanoseconds."""
+        self._scan_aggregates()
+        return super().get_delay_ns()
+    
+    def get_key_histogram(self) -> Dict[str, int]:
+        """Get the number of presses of each key, by key code."""
+        self._scan_aggregates()
+        return super().get_key_histogram()
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get the aggregates as a dictionary."""
+        self._scan_aggregates()
+        return super().get_summary()
+    
+    def is_time_sorted(self) -> bool:
+        """Check whether timestamps never decrease across the view."""
+        # Ascending ranges of an ordered parent need no scan
+        if (self.parent is not None and self._time_sorted is None
+                and self._ascending and self.parent.is_time_sorted()):
+            self._time_sorted = True
+        return super().is_time_sorted()
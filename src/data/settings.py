@@ -4,8 +4,8 @@ Application settings management.
 
 import json
 import os
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, asdict, field
 
 
 @dataclass
@@ -21,6 +21,14 @@ class AppSettings:
     repeat_count: int = 1
     repeat_continuously: bool = False
     disable_countdown_timer: bool = False
+    spin_margin_ms: float = 2.0  # sleep-then-spin switchover before deadlines
+    min_event_gap_ms: float = 10.0  # spacing between injected key events
+    playback_mode: str = "fixed"  # "fixed" spacing or "faithful" recorded timing
+    playback_speed: float = 1.0  # 0.1x - 100x
+    time_warp_enabled: bool = False
+    idle_gap_threshold_ms: int = 2000  # idle gaps longer than this...
+    idle_gap_max_ms: int = 500  # ...are shortened to this
+    telemetry_dump_path: str = ""  # dump playback timing stats here after each run
     
     # Window settings
     window_x: int = 100
@@ -28,7 +36,22 @@ class AppSettings:
     
     # Recording settings
     record_key_holds: bool = True
-    min_hold_duration: int = 100  # milliseconds
+    min_hold_duration: int = 100  # milliseconds; shorter holds compact to taps
+    compaction_enabled: bool = False
+    idle_gap_delay_ms: int = 1000  # longer pauses compact to DELAY actions
+    # Key codes to record; empty allows all
+    record_allowed_keys: List[str] = field(default_factory=list)
+    record_denied_keys: List[str] = field(default_factory=list)
+    debounce_ms: float = 0.0  # drop presses this soon after the key's release
+    filter_modifier_noise: bool = False  # drop modifiers pressed and released alone
+    preroll_enabled: bool = False  # always keep recent keys for instant replay
+    preroll_seconds: float = 30.0
+    preroll_max_events: int = 10000
+    preroll_hotkey: str = "F3"  # freezes the pre-roll into the current script
+    # Track name -> key codes recorded into that track
+    record_tracks: Dict[str, List[str]] = field(default_factory=dict)
+    journal_enabled: bool = False  # stream recordings to disk for crash recovery
+    journal_window: int = 10000  # actions kept in memory while journaling
 
 
 class Settings:
@@ -9,10 +9,12 @@ from typing import Optional
 from core.key_recorder import KeyRecorder
 from core.key_player import KeyPlayer
 from core.hotkey_manager import HotkeyManager
+from core.overdub import OverdubSession
 from data.settings import Settings
 from data.key_sequence import KeySequence
 from data.action_storage import ActionStorage
-from utils.key_utils import HOTKEY_OPTIONS, get_key_display_name
+from utils.key_registry import key_registry
+from utils.key_utils import HOTKEY_OPTIONS
 from gui.script_editor import ScriptEditorWindow, ScriptSaveDialog, ScriptLoadDialog
 from gui.key_capture_dialog import KeyCaptureDialog, QuickSetupDialog
 
@@ -20,6 +22,8 @@ from gui.key_capture_dialog import KeyCaptureDialog, QuickSetupDialog
 class MainWindow:
     """Main application window."""
     
+    STATS_POLL_MS = 500  # live recording statistics refresh interval
+    
     def __init__(self, root: tk.Tk, recorder: KeyRecorder, player: KeyPlayer, 
                  hotkey_manager: HotkeyManager, settings: Settings):
         self.root = root
@@ -31,6 +35,9 @@ class MainWindow:
         # Initialize action storage
         self.action_storage = ActionStorage()
         
+        # Record-while-playing sessions
+        self.overdub = OverdubSession(recorder, player)
+        
         # State variables
         self.is_recording = False
         self.is_playing = False
@@ -57,6 +64,7 @@ class MainWindow:
         # Hotkey callbacks
         self.hotkey_manager.on_start_stop_pressed = self._on_start_stop_hotkey
         self.hotkey_manager.on_play_pressed = self._on_play_hotkey
+        self.hotkey_manager.on_preroll_pressed = self._on_preroll_hotkey
     
     def _create_widgets(self):
         """Create all GUI widgets."""
@@ -116,6 +124,8 @@ class MainWindow:
         self.edit_button = ttk.Button(self.button_frame, text="Edit Script", command=self._on_edit_script)
         self.save_button = ttk.Button(self.button_frame, text="Save Script", command=self._on_save_script)
         self.load_button = ttk.Button(self.button_frame, text="Load Script", command=self._on_load_script)
+        self.overdub_button = ttk.Button(self.button_frame, text="Overdub",
+                                         command=self._on_overdub)
         
         # Action list
         self.action_frame = ttk.LabelFrame(self.main_frame, text="Recorded Actions", padding="5")
@@ -147,6 +157,15 @@ class MainWindow:
         )
         self.timing_ms_label = ttk.Label(self.timing_frame, text="milliseconds")
         
+        # Replay recorded timing instead of fixed spacing
+        self.faithful_var = tk.BooleanVar(value=False)
+        self.faithful_check = ttk.Checkbutton(
+            self.timing_frame,
+            text="Use recorded timing",
+            variable=self.faithful_var,
+            command=self._on_playback_mode_changed
+        )
+        
         # Repeat controls
         self.repeat_frame = ttk.Frame(self.timing_frame)
         
@@ -235,7 +254,8 @@ class MainWindow:
         # Second row of buttons
         self.edit_button.grid(row=1, column=0, padx=(0, 5), pady=(5, 0), sticky="w")
         self.save_button.grid(row=1, column=1, padx=(0, 5), pady=(5, 0))
-        self.load_button.grid(row=1, column=2, pady=(5, 0))
+        self.load_button.grid(row=1, column=2, padx=(0, 5), pady=(5, 0))
+        self.overdub_button.grid(row=1, column=3, pady=(5, 0))
         
         # Action list
         self.action_frame.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(0, 10))
@@ -256,6 +276,7 @@ class MainWindow:
         self.timing_label.grid(row=0, column=0, sticky="w", padx=(0, 5))
         self.timing_spinbox.grid(row=0, column=1, padx=(0, 5))
         self.timing_ms_label.grid(row=0, column=2, sticky="w")
+        self.faithful_check.grid(row=0, column=3, sticky="w", padx=(20, 0))
         
         self.repeat_frame.grid(row=1, column=0, columnspan=3, sticky="w", pady=(5, 0))
         
@@ -333,7 +354,7 @@ class MainWindow:
                 action = KeyAction(
                     action_type=ActionType.KEY_PRESS,
                     key=key_code,
-                    timestamp=0.0
+                    timestamp_ns=0
                 )
                 sequence.add_action(action)
                 
@@ -345,18 +366,18 @@ class MainWindow:
                 
                 # Update timing settings
                 self.timing_var.set(delay)
-                self.player.set_timing(delay)
+                self.player.update_settings({'time_between_presses': delay})
                 self.settings.set('time_between_presses', delay)
                 
                 # Update repeat settings
                 if continuous:
                     self.repeat_var.set(2)
-                    self.player.set_repeat_continuously(True)
+                    self.player.update_settings({'repeat_continuously': True})
                     self.settings.set('repeat_continuously', True)
                 else:
                     self.repeat_var.set(1)
                     self.repeat_count_var.set(repeat_count)
-                    self.player.set_repeat_count(repeat_count)
+                    self.player.update_settings({'repeat_count': repeat_count})
                     self.settings.set('repeat_continuously', False)
                     self.settings.set('repeat_count', repeat_count)
                 
@@ -383,25 +404,31 @@ class MainWindow:
     def _on_timing_changed(self, event=None):
         """Handle timing value change."""
         timing = self.timing_var.get()
-        self.player.set_timing(timing)
+        self.player.update_settings({'time_between_presses': timing})
         self.settings.set('time_between_presses', timing)
     
+    def _on_playback_mode_changed(self):
+        """Handle switching between fixed spacing and recorded timing."""
+        mode = "faithful" if self.faithful_var.get() else "fixed"
+        self.player.update_settings({'playback_mode': mode})
+        self.settings.set('playback_mode', mode)
+    
     def _on_repeat_mode_changed(self):
         """Handle repeat mode change."""
         mode = self.repeat_var.get()
         if mode == 1:  # Specific count
             count = self.repeat_count_var.get()
-            self.player.set_repeat_count(count)
+            self.player.update_settings({'repeat_count': count})
             self.settings.set('repeat_continuously', False)
         else:  # Continuous
-            self.player.set_repeat_continuously(True)
+            self.player.update_settings({'repeat_continuously': True})
             self.settings.set('repeat_continuously', True)
     
     def _on_repeat_count_changed(self, event=None):
         """Handle repeat count change."""
         if self.repeat_var.get() == 1:
             count = self.repeat_count_var.get()
-            self.player.set_repeat_count(count)
+            self.player.update_settings({'repeat_count': count})
             self.settings.set('repeat_count', count)
     
     def _on_load_script(self):
@@ -428,12 +455,14 @@ class MainWindow:
         self._update_action_list_from_sequence(sequence)
         
         # Update status
-        key_count = len([a for a in sequence.actions if a.action_type.value == "key_press"])
-        self.status_var.set(f"Status: Script loaded - {key_count} keys")
+        self.status_var.set(f"Status: Script loaded - {sequence.get_key_count()} keys, "
+                            f"{sequence.get_duration():.1f}s")
     
     def _on_script_save_completed(self, success: bool, filename: str):
         """Handle script save completion."""
         if success:
+            # The saved script supersedes the crash-recovery journal
+            self.recorder.discard_journal()
             messagebox.showinfo("Script Saved", f"Script saved successfully as '{filename}'")
         else:
             messagebox.showerror("Save Error", f"Failed to save script '{filename}'")
@@ -444,15 +473,10 @@ class MainWindow:
         
         for action in sequence.actions:
             if action.action_type.value == "key_press":
-                try:
-                    from utils.key_utils import parse_key_code
-                    key = parse_key_code(action.key)
-                    key_name = get_key_display_name(key) if key else action.key
-                except:
-                    key_name = str(action.key)
+                key_name = key_registry.display_name(action.key_id)
                 self.action_listbox.insert(tk.END, f"Key: {key_name}")
             elif action.action_type.value == "delay":
-                delay_ms = int(action.duration * 1000) if action.duration else 0
+                delay_ms = action.duration_ns // 1_000_000
                 self.action_listbox.insert(tk.END, f"Delay: {delay_ms}ms")
 
     def _on_clear(self):
@@ -470,22 +494,16 @@ class MainWindow:
         self.action_listbox.delete(0, tk.END)
         
         # Add actions to display
-        key_count = 0
         for action in new_sequence.actions:
             if action.action_type.value == "key_press":
-                try:
-                    from utils.key_utils import parse_key_code
-                    key = parse_key_code(action.key)
-                    key_name = get_key_display_name(key) if key else action.key
-                except:
-                    key_name = str(action.key)
+                key_name = key_registry.display_name(action.key_id)
                 self.action_listbox.insert(tk.END, f"Key: {key_name}")
-                key_count += 1
             elif action.action_type.value == "delay":
-                delay_ms = int(action.duration * 1000) if action.duration else 0
+                delay_ms = action.duration_ns // 1_000_000
                 self.action_listbox.insert(tk.END, f"Delay: {delay_ms}ms")
         
         # Update status
+        key_count = new_sequence.get_key_count()
         if key_count > 0:
             self.status_var.set(f"Status: {key_count} keys loaded from script")
         else:
@@ -517,13 +535,31 @@ class MainWindow:
         self.clear_button.config(state="disabled")
         self.start_script_button.config(state="disabled")
         self.stop_script_button.config(state="disabled")
+        self.root.after(self.STATS_POLL_MS, self._poll_recording_stats)
+    
+    def _poll_recording_stats(self):
+        """Show live recording statistics in the status bar."""
+        if not self.is_recording:
+            return
+        
+        stats = self.recorder.get_live_stats()
+        self.status_var.set(
+            f"Status: Recording... {stats['keys_per_sec']:.1f} keys/s, "
+            f"lag {stats['lag_avg_ms']:.1f}/{stats['lag_max_ms']:.1f} ms, "
+            f"queue {stats['queue_depth']}, {stats['sequence_bytes'] / 1024:.0f} KB"
+        )
+        self.root.after(self.STATS_POLL_MS, self._poll_recording_stats)
     
     def _on_recording_stopped(self):
         """Handle recording stopped."""
         self.is_recording = False
         sequence = self.recorder.get_recorded_sequence()
         count = sequence.get_key_count()
-        self.status_var.set(f"Status: {count} keys recorded")
+        status = f"Status: {count} keys recorded"
+        if self.recorder.compaction_enabled:
+            ratio = self.recorder.get_compaction_stats()['compression_ratio']
+            status += f" (compacted {ratio:.1f}:1)"
+        self.status_var.set(status)
         self.clear_button.config(state="normal")
         self.start_script_button.config(state="normal")
         self.stop_script_button.config(state="disabled")
@@ -531,12 +567,7 @@ class MainWindow:
     def _on_key_recorded(self, action):
         """Handle key recorded."""
         # Add key to listbox
-        try:
-            from utils.key_utils import parse_key_code
-            key = parse_key_code(action.key)
-            key_name = get_key_display_name(key) if key else action.key
-        except:
-            key_name = str(action.key)
+        key_name = key_registry.display_name(action.key_id)
         self.action_listbox.insert(tk.END, f"Key: {key_name}")
         self.action_listbox.see(tk.END)
     
@@ -560,20 +591,73 @@ class MainWindow:
     
     def _on_start_stop_hotkey(self):
         """Handle start/stop hotkey pressed."""
-        if self.is_recording:
+        if self.overdub.is_active:
+            self._stop_overdub()
+        elif self.is_recording:
             self.recorder.stop_recording()
         elif not self.is_playing:
+            # Keep our own hotkeys out of the recording
+            self.recorder.set_filters(
+                excluded_hotkeys=self.hotkey_manager.get_active_hotkeys().values()
+            )
             self.recorder.start_recording()
     
     def _on_play_hotkey(self):
         """Handle play hotkey pressed."""
-        if not self.is_recording and not self.is_playing:
+        if not self.is_recording:
             sequence = self.recorder.get_recorded_sequence()
-            if sequence:
-                self.player.start_playback(sequence)
-            else:
+            if not sequence:
                 # Can't show messagebox from hotkey thread, update status instead
                 self.status_var.set("Status: No keys recorded to play")
+            elif self.is_playing:
+                # Queue another run instead of dropping the trigger
+                self.player.enqueue_playback(sequence)
+                depth = self.player.get_queue_stats()['depth']
+                self.status_var.set(
+                    f"Status: Playing back recorded keys... ({depth} queued)")
+            else:
+                self.player.start_playback(sequence)
+    
+    def _on_preroll_hotkey(self):
+        """Handle pre-roll capture hotkey pressed."""
+        if self.is_recording or self.is_playing:
+            return
+        
+        self.recorder.set_filters(
+            excluded_hotkeys=self.hotkey_manager.get_active_hotkeys().values()
+        )
+        sequence = self.recorder.capture_preroll()
+        if sequence is not None:
+            # Update the display on the Tk thread
+            self.root.after(0, self._on_script_loaded, sequence)
+    
+    def _on_overdub(self):
+        """Handle overdub button: record over the current script while it plays."""
+        if self.overdub.is_active:
+            self._stop_overdub()
+            return
+        if self.is_recording or self.is_playing:
+            return
+        
+        sequence = self.recorder.get_recorded_sequence()
+        if not sequence:
+            messagebox.showwarning(
+                "No Script", "No actions to overdub. Record or load a script first.")
+            return
+        
+        self.recorder.set_filters(
+            excluded_hotkeys=self.hotkey_manager.get_active_hotkeys().values()
+        )
+        if self.overdub.start(sequence):
+            self.status_var.set(
+                "Status: Overdubbing... Press Start/Stop hotkey to stop")
+    
+    def _stop_overdub(self):
+        """Stop overdubbing and show the layered script."""
+        sequence = self.overdub.stop()
+        if sequence is not None:
+            # Update the display on the Tk thread
+            self.root.after(0, self._on_script_loaded, sequence)
     
     def _on_start_script(self):
         """Handle start script button."""
@@ -604,19 +688,55 @@ class MainWindow:
         # Timing
         timing = settings.get('time_between_presses', 500)
         self.timing_var.set(timing)
-        self.player.set_timing(timing)
+        playback_mode = settings.get('playback_mode', 'fixed')
+        self.faithful_var.set(playback_mode == 'faithful')
         
         # Repeat
         repeat_count = settings.get('repeat_count', 1)
         repeat_continuously = settings.get('repeat_continuously', False)
-        
         self.repeat_count_var.set(repeat_count)
-        if repeat_continuously:
-            self.repeat_var.set(2)
-            self.player.set_repeat_continuously(True)
+        self.repeat_var.set(2 if repeat_continuously else 1)
+        
+        # Applied by the playback worker, between sequences
+        self.player.update_settings({
+            'time_between_presses': timing,
+            'spin_margin_ms': settings.get('spin_margin_ms', 2.0),
+            'min_event_gap_ms': settings.get('min_event_gap_ms', 10.0),
+            'playback_mode': playback_mode,
+            'playback_speed': settings.get('playback_speed', 1.0),
+            'time_warp_enabled': settings.get('time_warp_enabled', False),
+            'idle_gap_threshold_ms': settings.get('idle_gap_threshold_ms', 2000),
+            'idle_gap_max_ms': settings.get('idle_gap_max_ms', 500),
+            'telemetry_dump_path': settings.get('telemetry_dump_path', ''),
+            # Count first: setting it turns continuous repeat off
+            'repeat_count': repeat_count,
+            'repeat_continuously': repeat_continuously
+        })
+        
+        # Recording
+        self.recorder.set_journal(
+            settings.get('journal_enabled', False),
+            window=settings.get('journal_window', 10000)
+        )
+        self.recorder.set_compaction(
+            settings.get('compaction_enabled', False),
+            settings.get('min_hold_duration', 100),
+            settings.get('idle_gap_delay_ms', 1000)
+        )
+        self.recorder.set_filters(
+            allowed_keys=settings.get('record_allowed_keys', []),
+            denied_keys=settings.get('record_denied_keys', []),
+            debounce_ms=settings.get('debounce_ms', 0.0),
+            filter_modifier_noise=settings.get('filter_modifier_noise', False)
+        )
+        self.recorder.set_tracks(settings.get('record_tracks', {}))
+        if settings.get('preroll_enabled', False):
+            self.recorder.start_preroll(
+                settings.get('preroll_seconds', 30.0),
+                settings.get('preroll_max_events', 10000)
+            )
         else:
-            self.repeat_var.set(1)
-            self.player.set_repeat_count(repeat_count)
+            self.recorder.stop_preroll()
         
         # Countdown
         self.countdown_var.set(settings.get('disable_countdown_timer', False))
@@ -624,4 +744,8 @@ class MainWindow:
         # Apply hotkeys
         self.hotkey_manager.set_start_stop_hotkey(self.start_stop_var.get())
         self.hotkey_manager.set_play_hotkey(self.play_var.get())
+        if settings.get('preroll_enabled', False):
+            self.hotkey_manager.set_preroll_hotkey(settings.get('preroll_hotkey', 'F3'))
+        else:
+            self.hotkey_manager.set_preroll_hotkey("")
         self.hotkey_manager.start()
@@ -9,7 +9,8 @@ import json
 
 from data.key_sequence import KeySequence, KeyAction, ActionType
 from data.action_storage import ActionStorage
-from utils.key_utils import get_key_display_name, parse_key_code, get_key_code, HOTKEY_OPTIONS
+from utils.key_registry import key_registry
+from utils.key_utils import HOTKEY_OPTIONS
 
 
 class ScriptEditorWindow:
@@ -234,17 +235,9 @@ DELAY: 1000               - Wait 1000 milliseconds (1 second)"""
         
         for action in self.original_sequence.actions:
             if action.action_type == ActionType.KEY_PRESS:
-                try:
-                    key = parse_key_code(action.key)
-                    if key:
-                        key_name = get_key_display_name(key)
-                        script_lines.append(f"KEY: {key_name}")
-                    else:
-                        script_lines.append(f"KEY: {action.key}")
-                except:
-                    script_lines.append(f"KEY: {action.key}")
+                script_lines.append(f"KEY: {key_registry.display_name(action.key_id)}")
             elif action.action_type == ActionType.DELAY:
-                delay_ms = int(action.duration * 1000)
+                delay_ms = action.duration_ns // 1_000_000
                 script_lines.append(f"DELAY: {delay_ms}")
         
         script_content = "\n".join(script_lines)
@@ -340,10 +333,12 @@ KEY: Enter"""
         try:
             sequence = self._parse_script()
             if sequence:
-                count = len([a for a in sequence.actions if a.action_type == ActionType.KEY_PRESS])
+                count = sequence.get_key_count()
+                other = len(sequence) - count
                 messagebox.showinfo(
                     "Validation Successful",
-                    f"Script is valid!\n\nFound {count} key actions and {len(sequence.actions) - count} other actions."
+                    f"Script is valid!\n\nFound {count} key actions and "
+                    f"{other} other actions."
                 )
                 return True
         except Exception as e:
@@ -358,7 +353,7 @@ KEY: Enter"""
         
         lines = content.split('\n')
         sequence = KeySequence("Edited Script")
-        timestamp = 0.0
+        timestamp_ns = 0
         
         for line_num, line in enumerate(lines, 1):
             line = line.strip()
@@ -378,10 +373,10 @@ KEY: Enter"""
                     action = KeyAction(
                         action_type=ActionType.KEY_PRESS,
                         key=self._parse_key_string(key_part),
-                        timestamp=timestamp
+                        timestamp_ns=timestamp_ns
                     )
                     sequence.add_action(action)
-                    timestamp += 0.1  # Small increment between keys
+                    timestamp_ns += 100_000_000  # Small increment between keys
                     
                 elif line.upper().startswith('DELAY:'):
                     # Parse delay action
@@ -394,14 +389,14 @@ KEY: Enter"""
                         raise ValueError(f"Negative delay not allowed on line {line_num}")
                     
                     # Add delay to timestamp for next action
-                    timestamp += delay_ms / 1000.0
+                    timestamp_ns += delay_ms * 1_000_000
                     
                     # Create delay action
                     action = KeyAction(
                         action_type=ActionType.DELAY,
                         key="",
-                        timestamp=timestamp,
-                        duration=delay_ms / 1000.0
+                        timestamp_ns=timestamp_ns,
+                        duration_ns=delay_ms * 1_000_000
                     )
                     sequence.add_action(action)
                     
@@ -746,8 +741,8 @@ class ScriptSaveDialog:
                  font=("Arial", 8)).grid(row=3, column=0, columnspan=2, sticky="w", pady=(0, 15))
         
         # Script info
-        key_count = len([a for a in self.sequence.actions if a.action_type == ActionType.KEY_PRESS])
-        total_count = len(self.sequence.actions)
+        key_count = self.sequence.get_key_count()
+        total_count = len(self.sequence)
         
         info_text = f"Actions to save: {key_count} keys, {total_count} total actions"
         ttk.Label(frame, text=info_text, font=("Arial", 9)).grid(
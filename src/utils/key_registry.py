@@ -0,0 +1,86 @@
+"""
+Process-wide registry of interned integer key ids.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+from utils.key_utils import (
+    get_key_code, get_key_display_name, parse_key_code, resolve_key_code
+)
+
+
+class KeyRegistry:
+    """Maps each distinct key code ("char:a", "key:f1", "combo:ctrl+c") to a small int.
+    
+    Ids are handed out in order of first use and never change for the life
+    of the process, so they can be compared, hashed and stored in integer
+    arrays instead of strings. The resolved pynput keys and display name of
+    each id are computed once and cached. Key code strings are only needed
+    when reading or writing files and when showing keys to the user.
+    """
+    
+    def __init__(self):
+        self._codes: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._resolved: List[Tuple] = []
+        self._display_names: Dict[int, str] = {}
+        self._object_ids: Dict[object, int] = {}
+        self._lock = threading.Lock()
+    
+    def intern(self, key_code: str) -> int:
+        """Get the id of a key code, registering it on first use."""
+        key_id = self._ids.get(key_code)
+        if key_id is not None:
+            return key_id
+        
+        with self._lock:
+            key_id = self._ids.get(key_code)
+            if key_id is None:
+                self._resolved.append(resolve_key_code(key_code) if key_code else ())
+                self._codes.append(key_code)
+                key_id = self._ids[key_code] = len(self._codes) - 1
+            return key_id
+    
+    def id_for_key(self, key) -> int:
+        """Get the id of a pynput key object, as seen by a listener."""
+        try:
+            return self._object_ids[key]
+        except KeyError:
+            key_id = self._object_ids[key] = self.intern(get_key_code(key))
+            return key_id
+        except TypeError:
+            # Unhashable key objects are not cached
+            return self.intern(get_key_code(key))
+    
+    def code(self, key_id: int) -> str:
+        """Get the key code string of an id."""
+        return self._codes[key_id]
+    
+    def resolve(self, key_id: int) -> Tuple:
+        """Get the pynput keys to press for an id, modifiers first."""
+        return self._resolved[key_id]
+    
+    def display_name(self, key_id: int) -> str:
+        """Get the name of a key as shown to the user."""
+        name = self._display_names.get(key_id)
+        if name is None:
+            key_code = self._codes[key_id]
+            try:
+                key = parse_key_code(key_code)
+                name = get_key_display_name(key) if key else key_code
+            except Exception:
+                name = key_code
+            self._display_names[key_id] = name
+        return name
+    
+    def __len__(self) -> int:
+        """Return number of registered key codes."""
+        return len(self._codes)
+
+
+# Shared by every component of the process
+key_registry = KeyRegistry()
+
+# The empty key code (used by delays) is always id 0
+NO_KEY = key_registry.intern("")
@@ -2,7 +2,7 @@
 Utility functions for key handling and mapping.
 """
 
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple
 from pynput import keyboard
 
 
@@ -52,6 +52,25 @@ NUMPAD_KEYS = {
     # Add more numpad mappings as needed
 }
 
+# Modifier names accepted in "combo:" key codes
+COMBO_MODIFIERS = {
+    'ctrl': keyboard.Key.ctrl,
+    'alt': keyboard.Key.alt,
+    'shift': keyboard.Key.shift,
+    'cmd': keyboard.Key.cmd,
+    'win': keyboard.Key.cmd
+}
+
+# Named main keys accepted in "combo:" key codes
+COMBO_SPECIAL_KEYS = {
+    'space': keyboard.Key.space,
+    'enter': keyboard.Key.enter,
+    'tab': keyboard.Key.tab,
+    'escape': keyboard.Key.esc,
+    'backspace': keyboard.Key.backspace,
+    'delete': keyboard.Key.delete,
+}
+
 # Common hotkey options for dropdowns
 HOTKEY_OPTIONS = [
     "None", "F1", "F2", "F3", "F4", "F5", "F6", "F7", "F8", "F9", "F10", "F11", "F12",
@@ -130,6 +149,42 @@ def parse_key_code(key_code: str):
     return None
 
 
+def resolve_key_code(key_code: str) -> Tuple:
+    """Resolve a key code to the pynput keys to press, modifiers first.
+    
+    Returns an empty tuple if the key code cannot be resolved.
+    """
+    if key_code.startswith("combo:"):
+        return _resolve_combo(key_code[6:])
+    
+    key = parse_key_code(key_code)
+    return (key,) if key else ()
+
+
+def _resolve_combo(combo_string: str) -> Tuple:
+    """Resolve a combination like ctrl+c to (modifiers..., main key)."""
+    parts = [part.strip().lower() for part in combo_string.split('+')]
+    modifiers = []
+    main_key = None
+    
+    for part in parts:
+        if part in COMBO_MODIFIERS:
+            modifiers.append(COMBO_MODIFIERS[part])
+        elif part.startswith('f') and part[1:].isdigit():
+            # Function key
+            main_key = getattr(keyboard.Key, part, None)
+        elif len(part) == 1:
+            # Single character
+            main_key = keyboard.KeyCode.from_char(part)
+        else:
+            # Special key
+            main_key = COMBO_SPECIAL_KEYS.get(part, keyboard.KeyCode.from_char(part))
+    
+    if not main_key:
+        return ()
+    return tuple(modifiers) + (main_key,)
+
+
 def is_modifier_key(key) -> bool:
     """Check if a key is a modifier key."""
     modifier_keys = {
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.input_ring import InputRingBuffer
+
+
+class TestInputRingBuffer(unittest.TestCase):
+    """Test cases for InputRingBuffer class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.buffer = InputRingBuffer(capacity=4)
+        self.received = []
+    
+    def _handler(self, kind, key, timestamp_ns):
+        self.received.append((kind, key, timestamp_ns))
+    
+    def test_should_deliver_events_in_order(self):
+        """Test that drained events keep their push order."""
+        self.buffer.push(0, 'a', 10)
+        self.buffer.push(1, 'a', 20)
+        
+        self.assertEqual(self.buffer.drain(self._handler), 2)
+        self.assertEqual(self.received, [(0, 'a', 10), (1, 'a', 20)])
+        self.assertEqual(len(self.buffer), 0)
+    
+    def test_should_drop_and_count_when_full(self):
+        """Test that a full buffer drops new events."""
+        for i in range(6):
+            self.buffer.push(0, i, i)
+        
+        self.assertEqual(self.buffer.dropped, 2)
+        self.assertEqual(self.buffer.high_water, 4)
+        self.buffer.drain(self._handler)
+        self.assertEqual([key for _, key, _ in self.received], [0, 1, 2, 3])
+    
+    def test_should_reuse_slots_after_wrapping(self):
+        """Test that slots are reused once consumed."""
+        for i in range(10):
+            self.assertTrue(self.buffer.push(0, i, i))
+            self.buffer.drain(self._handler)
+        
+        self.assertEqual(len(self.received), 10)
+        self.assertEqual(self.buffer.dropped, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,282 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.key_player import KeyPlayer
+from core.output_backend import RecordingBackend, EVENT_PRESS, EVENT_RELEASE
+from data.key_sequence import KeySequence, KeyAction, ActionType
+
+
+class TestKeyPlayer(unittest.TestCase):
+    """Test cases for KeyPlayer class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.backend = RecordingBackend()
+        self.player = KeyPlayer(backend=self.backend)
+        self.sequence = KeySequence()
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.1))
+    
+    def _wait_for_playback(self, timeout: float = 5.0):
+        """Block until the player goes idle."""
+        deadline = time.time() + timeout
+        while self.player.is_playing and time.time() < deadline:
+            time.sleep(0.005)
+    
+    def test_should_initialize_with_default_state(self):
+        """Test that player initializes with correct default state."""
+        self.assertFalse(self.player.is_playing)
+        self.assertIs(self.player.backend, self.backend)
+    
+    def test_should_not_start_empty_sequence(self):
+        """Test that an empty sequence is refused."""
+        self.assertFalse(self.player.start_playback(KeySequence()))
+    
+    def test_should_inject_press_and_release_for_each_key(self):
+        """Test playback through the recording backend."""
+        self.player.set_timing(5)
+        
+        self.assertTrue(self.player.start_playback(self.sequence))
+        self._wait_for_playback()
+        
+        kinds = [event.kind for event in self.backend.events]
+        self.assertEqual(kinds, [EVENT_PRESS, EVENT_RELEASE] * 2)
+    
+    def test_should_keep_repetitions_on_fixed_timeline(self):
+        """Test that repeated runs start one period apart without drift."""
+        self.player.set_timing(20)
+        self.player.set_repeat_count(5)
+        
+        self.player.start_playback(self.sequence)
+        self._wait_for_playback()
+        
+        presses = self.backend.get_press_times()
+        self.assertEqual(len(presses), 10)
+        
+        # Each repetition starts 40 ms after the previous one
+        elapsed_ms = (presses[-2] - presses[0]) / 1_000_000
+        self.assertAlmostEqual(elapsed_ms, 160, delta=5)
+    
+    def test_should_expose_lateness_per_action(self):
+        """Test that lateness is recorded for every injected event."""
+        self.player.set_timing(5)
+        self.player.start_playback(self.sequence)
+        self._wait_for_playback()
+        
+        lateness = self.player.get_action_lateness()
+        self.assertEqual(len(lateness), 4)
+        self.assertTrue(all(ns >= 0 for ns in lateness))
+    
+    def test_should_summarize_playback_telemetry(self):
+        """Test that each run reports lateness percentiles and throughput."""
+        self.player.set_timing(5)
+        self.player.set_event_gap(1)
+        self.player.start_playback(self.sequence)
+        self._wait_for_playback()
+        
+        stats = self.player.get_playback_stats()
+        self.assertEqual(stats['events'], 4)
+        self.assertLessEqual(stats['p50_lateness_us'], stats['p99_lateness_us'])
+        self.assertGreater(stats['events_per_sec'], 0)
+
+    
+    def test_should_reuse_worker_thread_between_runs(self):
+        """Test that back-to-back runs share one long-lived worker."""
+        self.player.set_timing(1)
+        
+        self.player.start_playback(self.sequence)
+        self._wait_for_playback()
+        first_worker = self.player.playback_thread
+        self.player.start_playback(self.sequence)
+        self._wait_for_playback()
+        
+        self.assertIs(self.player.playback_thread, first_worker)
+        self.assertEqual(len(self.backend.get_press_times()), 4)
+    
+    def test_should_play_enqueued_sequence_after_current(self):
+        """Test that an enqueued sequence starts when the current one ends."""
+        self.player.set_timing(10)
+        
+        self.player.start_playback(self.sequence)
+        self.assertTrue(self.player.enqueue_playback(self.sequence))
+        self._wait_for_playback()
+        
+        presses = self.backend.get_press_times()
+        self.assertEqual(len(presses), 4)
+        
+        # The second run starts one period (20 ms) after the first
+        gap_ms = (presses[2] - presses[0]) / 1_000_000
+        self.assertGreaterEqual(gap_ms, 20)
+        self.assertLess(gap_ms, 30)
+    
+    def test_should_apply_every_setting_through_command(self):
+        """Test that update_settings accepts everything get_playback_settings returns."""
+        expected = {
+            'time_between_presses': 25,
+            'repeat_count': 3,
+            'repeat_continuously': True,
+            'spin_margin_ms': 1.0,
+            'min_event_gap_ms': 4.0,
+            'playback_mode': 'faithful',
+            'playback_speed': 2.0,
+            'time_warp_enabled': True,
+            'idle_gap_threshold_ms': 1500,
+            'idle_gap_max_ms': 100,
+            'telemetry_dump_path': 'telemetry.json'
+        }
+        self.assertEqual(set(expected), set(self.player.get_playback_settings()))
+        
+        self.player.update_settings(expected)
+        deadline = time.time() + 5.0
+        while self.player.get_playback_settings() != expected and time.time() < deadline:
+            time.sleep(0.005)
+        
+        self.assertEqual(self.player.get_playback_settings(), expected)
+    
+    def test_should_not_lose_job_enqueued_as_session_ends(self):
+        """Test that a job pushed while the worker finds the queue empty still plays."""
+        single = KeySequence()
+        single.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.player.set_timing(1)
+        
+        # Hold the worker just after it finds the queue empty
+        emptied = threading.Event()
+        pop = self.player.job_queue.pop
+        def slow_pop():
+            job = pop()
+            if job is None and not emptied.is_set():
+                emptied.set()
+                time.sleep(0.05)
+            return job
+        self.player.job_queue.pop = slow_pop
+        
+        self.player.start_playback(single)
+        self.assertTrue(emptied.wait(timeout=5.0))
+        self.assertIsNotNone(self.player.enqueue_playback(single))
+        self._wait_for_playback()
+        
+        presses = [event for event in self.backend.events if event.kind == EVENT_PRESS]
+        self.assertEqual(len(presses), 2)
+    
+    def test_should_stop_and_discard_queue(self):
+        """Test that stopping also drops queued sequences."""
+        self.player.set_timing(200)
+        stopped = []
+        self.player.on_playback_stopped = lambda: stopped.append(True)
+        
+        self.player.start_playback(self.sequence)
+        self.player.enqueue_playback(self.sequence)
+        self.player.stop_playback()
+        
+        self.assertFalse(self.player.is_playing)
+        self.assertLessEqual(len(self.backend.get_press_times()), 1)
+        self.assertEqual(stopped, [True])
+    
+    def test_should_pause_and_resume_on_shifted_timeline(self):
+        """Test that a pause delays the remaining actions by its length."""
+        self.player.set_timing(50)
+        
+        self.player.start_playback(self.sequence)
+        time.sleep(0.02)
+        self.assertTrue(self.player.pause_playback())
+        time.sleep(0.1)
+        self.assertTrue(self.player.resume_playback())
+        self._wait_for_playback()
+        
+        presses = self.backend.get_press_times()
+        self.assertEqual(len(presses), 2)
+        self.assertGreaterEqual((presses[1] - presses[0]) / 1_000_000, 140)
+    
+    def test_should_play_range_with_keys_held_across_cuts(self):
+        """Test that a range presses keys held at its start and releases them at its end."""
+        held = KeySequence()
+        held.add_action(KeyAction(ActionType.KEY_PRESS, "key:shift", 0.0))
+        for i, key in enumerate("abcd"):
+            held.add_action(KeyAction(ActionType.KEY_PRESS, f"char:{key}", 0.01 * (i + 1)))
+        held.add_action(KeyAction(ActionType.KEY_RELEASE, "key:shift", 0.1))
+        
+        # The mode change is still queued when the range is
+        self.player.update_settings({'playback_mode': 'faithful'})
+        self.assertIsNotNone(self.player.play_range(held, 15_000_000, 35_000_000))
+        self._wait_for_playback()
+        
+        events = [(event.kind, str(event.key)) for event in self.backend.events]
+        shift = str(self.player.compile_plan(held).keys[0][0])
+        self.assertEqual(events[0], (EVENT_PRESS, shift))
+        self.assertEqual(events[-1], (EVENT_RELEASE, shift))
+        pressed = [event.key.char for event in self.backend.events
+                   if event.kind == EVENT_PRESS and hasattr(event.key, 'char')]
+        self.assertEqual(pressed, ["b", "c"])
+        presses = self.backend.get_press_times()
+        self.assertLess((presses[-1] - presses[1]) / 1_000_000, 100)
+        self.assertIsNone(self.player.play_range(held, 50_000_000, 50_000_000))
+    
+    def test_should_preempt_lower_priority_job(self):
+        """Test that a higher priority job runs before the rest of the current one."""
+        slow = KeySequence()
+        for i, key in enumerate("abcd"):
+            slow.add_action(KeyAction(ActionType.KEY_PRESS, f"char:{key}", i * 0.1))
+        urgent = KeySequence()
+        urgent.add_action(KeyAction(ActionType.KEY_PRESS, "char:z", 0.0))
+        self.player.set_timing(30)
+        
+        self.player.start_playback(slow)
+        time.sleep(0.04)
+        self.player.enqueue_playback(urgent, priority=5)
+        self._wait_for_playback()
+        
+        pressed = [event.key.char for event in self.backend.events
+                   if event.kind == EVENT_PRESS]
+        self.assertEqual(pressed, ["a", "b", "z", "c", "d"])
+        self.assertEqual(self.player.get_queue_stats()['preemptions'], 1)
+    
+    def test_should_preempt_with_job_enqueued_while_paused(self):
+        """Test that a higher priority job queued during a pause runs on resume."""
+        slow = KeySequence()
+        for i, key in enumerate("abcd"):
+            slow.add_action(KeyAction(ActionType.KEY_PRESS, f"char:{key}", i * 0.1))
+        urgent = KeySequence()
+        urgent.add_action(KeyAction(ActionType.KEY_PRESS, "char:z", 0.0))
+        self.player.set_timing(30)
+        
+        self.player.start_playback(slow)
+        time.sleep(0.045)
+        self.assertTrue(self.player.pause_playback())
+        self.player.enqueue_playback(urgent, priority=5)
+        time.sleep(0.02)
+        self.assertTrue(self.player.resume_playback())
+        self._wait_for_playback()
+        
+        pressed = [event.key.char for event in self.backend.events
+                   if event.kind == EVENT_PRESS]
+        self.assertEqual(pressed, ["a", "b", "z", "c", "d"])
+        self.assertEqual(self.player.get_queue_stats()['preemptions'], 1)
+    
+    def test_should_report_queue_wait_times(self):
+        """Test queue statistics for back-to-back jobs."""
+        self.player.set_timing(5)
+        
+        for _ in range(3):
+            self.player.enqueue_playback(self.sequence)
+        self._wait_for_playback()
+        
+        stats = self.player.get_queue_stats()
+        self.assertEqual(stats['jobs_started'], 3)
+        self.assertEqual(stats['depth'], 0)
+        self.assertGreater(stats['max_wait_ms'], 0)
+    
+    def tearDown(self):
+        """Tear down the worker thread."""
+        self.player.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
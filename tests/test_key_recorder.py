@@ -8,8 +8,11 @@ src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
+from pynput import keyboard
+
 from core.key_recorder import KeyRecorder
-from data.key_sequence import KeySequence, ActionType
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from data.key_sequence import KeySequence, KeyAction, ActionType
 
 
 class TestKeyRecorder(unittest.TestCase):
@@ -68,9 +71,9 @@ class TestKeyRecorder(unittest.TestCase):
     
     def test_should_clear_sequence(self):
         """Test clearing recorded sequence."""
-        # Add some mock data
+        # Add some data
         self.recorder.current_sequence.add_action(
-            Mock(action_type=ActionType.KEY_PRESS, key="a", timestamp=0.0)
+            KeyAction(action_type=ActionType.KEY_PRESS, key="a", timestamp=0.0)
         )
         
         self.recorder.clear_sequence()
@@ -89,17 +92,116 @@ class TestKeyRecorder(unittest.TestCase):
         
         self.assertEqual(duration, 0.0)
     
-    @patch('core.key_recorder.time.time')
+    @patch('core.key_recorder.time.perf_counter_ns')
     def test_should_get_recording_duration_when_recording(self, mock_time):
         """Test getting duration when recording."""
-        mock_time.side_effect = [100.0, 105.5]  # start_time, current_time
+        mock_time.side_effect = [100_000_000_000, 105_500_000_000]  # start, current
         
         self.recorder.is_recording = True
-        self.recorder.start_time = mock_time()
+        self.recorder.start_ns = mock_time()
         duration = self.recorder.get_recording_duration()
         
         self.assertEqual(duration, 5.5)
     
+    @patch('core.key_recorder.keyboard.Listener')
+    def test_should_process_buffered_events_on_consumer(self, mock_listener_class):
+        """Test that hook callbacks are turned into paired actions."""
+        recorded_callback = Mock()
+        self.recorder.on_key_recorded = recorded_callback
+        self.recorder.start_recording()
+        
+        key = keyboard.KeyCode.from_char('a')
+        self.recorder._on_key_press(key)
+        self.recorder._on_key_press(key)  # auto-repeat
+        self.recorder._on_key_release(key)
+        sequence = self.recorder.stop_recording()
+        
+        actions = sequence.actions
+        self.assertEqual([a.action_type for a in actions],
+                         [ActionType.KEY_PRESS, ActionType.KEY_RELEASE])
+        self.assertEqual(actions[0].duration_ns, actions[1].timestamp_ns - actions[0].timestamp_ns)
+        recorded_callback.assert_called_once_with(actions[0])
+        self.assertGreaterEqual(self.recorder.get_ingest_stats()['high_water'], 1)
+        self.assertEqual(self.recorder.get_ingest_stats()['dropped'], 0)
+    
+    def test_should_pair_releases_with_open_presses(self):
+        """Test pairing, including zero-length holds and orphan releases."""
+        a = keyboard.KeyCode.from_char('a')
+        b = keyboard.KeyCode.from_char('b')
+        self.recorder._process_event(EVENT_RELEASE, b, 0)  # no press
+        self.recorder._process_event(EVENT_PRESS, a, 1_000_000)
+        self.recorder._process_event(EVENT_RELEASE, a, 1_000_000)
+        self.recorder._process_event(EVENT_PRESS, a, 2_000_000)
+        self.recorder._process_event(EVENT_RELEASE, a, 5_000_000)
+        
+        presses = [x for x in self.recorder.current_sequence.actions
+                   if x.action_type == ActionType.KEY_PRESS]
+        self.assertEqual(len(self.recorder.current_sequence.actions), 4)
+        self.assertEqual(presses[0].duration, 0.0)
+        self.assertEqual(presses[1].duration_ns, 3_000_000)
+        self.assertEqual(self.recorder.unmatched_releases, 1)
+        self.assertEqual(len(self.recorder.pressed_keys), 0)
+    
+    def test_should_compact_repeats_idle_gaps_and_short_holds(self):
+        """Test record-time compaction and its compression ratio."""
+        self.recorder.set_compaction(True, min_hold_ms=50, idle_gap_ms=1000)
+        a = keyboard.KeyCode.from_char('a')
+        b = keyboard.KeyCode.from_char('b')
+        
+        # Short tap of a, then a long hold of b with auto-repeat after a pause
+        self.recorder._process_event(EVENT_PRESS, a, 0)
+        self.recorder._process_event(EVENT_RELEASE, a, 10_000_000)
+        self.recorder._process_event(EVENT_PRESS, b, 2_000_000_000)
+        for i in range(5):
+            self.recorder._process_event(EVENT_PRESS, b, 2_100_000_000 + i)
+        self.recorder._process_event(EVENT_RELEASE, b, 2_500_000_000)
+        
+        actions = self.recorder.current_sequence.actions
+        self.assertEqual([x.action_type for x in actions],
+                         [ActionType.KEY_PRESS, ActionType.DELAY,
+                          ActionType.KEY_PRESS, ActionType.KEY_RELEASE])
+        self.assertEqual(actions[0].duration_ns, 0)
+        self.assertEqual(actions[1].duration_ns, 2_000_000_000)
+        self.assertEqual(actions[2].duration_ns, 500_000_000)
+        
+        stats = self.recorder.get_compaction_stats()
+        self.assertEqual(stats['repeats_collapsed'], 5)
+        self.assertEqual(stats['taps_merged'], 1)
+        self.assertEqual(stats['compression_ratio'], 9 / 4)
+    
+    def test_should_not_record_own_hotkeys(self):
+        """Test that excluded hotkeys are filtered out by the consumer."""
+        self.recorder.set_filters(excluded_hotkeys=["F1"])
+        self.recorder._process_event(EVENT_PRESS, keyboard.Key.f1, 0)
+        self.recorder._process_event(EVENT_PRESS, keyboard.KeyCode.from_char('a'), 1)
+        self.recorder._process_event(EVENT_RELEASE, keyboard.Key.f1, 2)
+        
+        self.assertEqual([x.key for x in self.recorder.current_sequence.actions], ["char:a"])
+        self.assertEqual(self.recorder.get_filter_stats(), {'hotkeys': 2})
+    
+    @patch('core.key_recorder.keyboard.Listener')
+    def test_should_capture_preroll_into_sequence(self, mock_listener_class):
+        """Test freezing the pre-roll buffer into a sequence."""
+        self.assertTrue(self.recorder.start_preroll(window_seconds=60))
+        key = keyboard.KeyCode.from_char('a')
+        self.recorder._on_preroll_press(key)
+        self.recorder._on_preroll_release(key)
+        
+        with patch.object(self.recorder.live_stats, 'record') as mock_record:
+            sequence = self.recorder.capture_preroll()
+        
+        self.assertIs(sequence, self.recorder.current_sequence)
+        self.assertEqual([x.action_type for x in sequence.actions],
+                         [ActionType.KEY_PRESS, ActionType.KEY_RELEASE])
+        self.assertEqual(sequence.actions[0].timestamp_ns, 0)
+        mock_record.assert_not_called()
+        self.recorder.stop_preroll()
+        self.assertIsNone(self.recorder.capture_preroll())
+        
+        # A callback still in flight after the stop is dropped
+        self.recorder._on_preroll_press(key)
+        self.recorder._on_preroll_release(key)
+    
     def test_should_set_callbacks(self):
         """Test setting callback functions."""
         started_callback = Mock()
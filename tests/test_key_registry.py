@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from pynput import keyboard
+
+from data.key_sequence import KeySequence, KeyAction, ActionType
+from utils.key_registry import KeyRegistry, key_registry
+
+
+class TestKeyRegistry(unittest.TestCase):
+    """Test cases for KeyRegistry."""
+    
+    def test_should_intern_each_key_code_once(self):
+        """Test that equal key codes share one id."""
+        registry = KeyRegistry()
+        key_id = registry.intern("char:a")
+        
+        self.assertEqual(registry.intern("char:a"), key_id)
+        self.assertNotEqual(registry.intern("char:b"), key_id)
+        self.assertEqual(registry.code(key_id), "char:a")
+    
+    def test_should_map_key_objects_and_resolve_ids(self):
+        """Test that listener keys map to ids with cached pynput keys."""
+        registry = KeyRegistry()
+        key_id = registry.id_for_key(keyboard.KeyCode.from_char('a'))
+        
+        self.assertEqual(key_id, registry.intern("char:a"))
+        self.assertEqual(registry.resolve(key_id), (keyboard.KeyCode.from_char('a'),))
+        self.assertEqual(len(registry.resolve(registry.intern("combo:ctrl+c"))), 2)
+    
+    def test_should_keep_key_codes_only_at_serialization_edge(self):
+        """Test that sequences store ids but still save key code strings."""
+        sequence = KeySequence()
+        sequence.add_action(KeyAction(ActionType.KEY_PRESS, "key:f5", 0.0))
+        
+        self.assertEqual(sequence.key_ids[0], key_registry.intern("key:f5"))
+        self.assertEqual(sequence.to_dict()['actions'][0]['key'], "key:f5")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,6 +48,76 @@ class TestKeySequence(unittest.TestCase):
         
         self.assertEqual(self.sequence.get_duration(), 1.5)
     
+    def test_should_store_actions_column_wise(self):
+        """Test that actions live in typed arrays with interned keys."""
+        for i in range(3):
+            self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "a", timestamp_ns=i))
+        
+        self.assertEqual(list(self.sequence.timestamps_ns), [0, 1, 2])
+        self.assertEqual(len(set(self.sequence.key_ids)), 1)
+        self.assertEqual(self.sequence.get_key_count(), 3)
+    
+    def test_should_return_copies_from_actions_view(self):
+        """Test that the actions view builds copies and writes back explicitly."""
+        index = self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "a", 0.0))
+        
+        self.sequence.actions[index].duration_ns = 5
+        self.assertEqual(self.sequence.actions[index].duration_ns, 0)
+        
+        self.sequence.set_duration_ns(index, 5)
+        self.assertEqual(self.sequence.actions[index].duration_ns, 5)
+    
+    def test_should_support_list_operations_on_actions(self):
+        """Test slicing, deletion, insertion and assignment through the view."""
+        self.sequence.actions = [KeyAction(ActionType.KEY_PRESS, k, timestamp_ns=i)
+                                 for i, k in enumerate("abcd")]
+        
+        del self.sequence.actions[:2]
+        self.sequence.actions.insert(0, KeyAction(ActionType.DELAY, "", 0.0))
+        self.sequence.actions[-1] = KeyAction(ActionType.KEY_RELEASE, "d", timestamp_ns=9)
+        
+        self.assertEqual([a.key for a in self.sequence.actions[1:]], ["c", "d"])
+        self.assertEqual(self.sequence.actions[-1].action_type, ActionType.KEY_RELEASE)
+        self.assertEqual(KeySequence.from_dict(self.sequence.to_dict()).actions,
+                         self.sequence.actions)
+    
+    def test_should_maintain_running_aggregates(self):
+        """Test that counts and totals follow adds, edits and deletes."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.DELAY, "", 0.0, 0.5))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "a", 1.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "b", 1.5))
+        
+        self.assertEqual(self.sequence.get_key_histogram(), {"a": 2, "b": 1})
+        self.assertEqual(self.sequence.get_delay_ns(), 500_000_000)
+        
+        self.sequence.set_duration_ns(1, 200_000_000)
+        self.sequence.actions[3] = KeyAction(ActionType.KEY_RELEASE, "a", 1.5)
+        del self.sequence.actions[:1]
+        
+        summary = self.sequence.get_summary()
+        self.assertEqual(summary['key_count'], 1)
+        self.assertEqual(summary['release_count'], 1)
+        self.assertEqual(summary['delay_ms'], 200)
+        self.assertEqual(self.sequence.get_key_histogram(), {"a": 1})
+        
+        self.sequence.clear()
+        self.assertEqual(self.sequence.get_summary()['action_count'], 0)
+    
+    def test_should_look_up_actions_by_time(self):
+        """Test the time index for ordered and edited sequences."""
+        for t in (0.0, 0.5, 0.5, 1.0):
+            self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "a", t))
+        
+        self.assertEqual(self.sequence.index_at_time(500_000_000), 1)
+        self.assertEqual(self.sequence.index_at_time(600_000_000), 3)
+        self.assertEqual(self.sequence.index_at_time(2_000_000_000), 4)
+        self.assertEqual(self.sequence.time_at_index(3), 1_000_000_000)
+        
+        self.sequence.actions[0] = KeyAction(ActionType.KEY_PRESS, "a", 0.8)
+        self.assertEqual(self.sequence.index_at_time(600_000_000), 0)
+        self.assertEqual(self.sequence.index_at_time(900_000_000), 3)
+    
     def test_should_convert_to_string_representation(self):
         """Test string representation of sequence."""
         self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "a", 0.0))
@@ -70,6 +140,24 @@ class TestKeyAction(unittest.TestCase):
         self.assertEqual(action.timestamp, 1.0)
         self.assertEqual(action.duration, 0.5)
     
+    def test_should_store_integer_nanoseconds(self):
+        """Test that float-second construction is stored as nanoseconds."""
+        action = KeyAction(ActionType.KEY_PRESS, "a", 1.25, 0.1)
+        
+        self.assertEqual(action.timestamp_ns, 1_250_000_000)
+        self.assertEqual(action.duration_ns, 100_000_000)
+        self.assertEqual(action.to_dict()['timestamp_ns'], 1_250_000_000)
+    
+    def test_should_load_float_second_data(self):
+        """Test that older float-second dictionaries still load."""
+        action = KeyAction.from_dict({
+            'action_type': 'key_press', 'key': 'a', 'timestamp': 2.5, 'duration': 0.05
+        })
+        
+        self.assertEqual(action.timestamp_ns, 2_500_000_000)
+        self.assertEqual(action.duration_ns, 50_000_000)
+        self.assertEqual(KeyAction.from_dict(action.to_dict()), action)
+    
     def test_should_have_string_representation(self):
         """Test string representation of action."""
         action = KeyAction(ActionType.KEY_PRESS, "a", 0.0)
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from pynput import keyboard
+
+from core.key_recorder import KeyRecorder
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from data.key_sequence import KeyAction, ActionType
+from data.key_track import KeyTrack, iter_merged, merge_tracks
+
+
+def make_track(name, key, timestamps):
+    """Build a track of presses of one key."""
+    track = KeyTrack(name)
+    for timestamp_ns in timestamps:
+        track.append(KeyAction(ActionType.KEY_PRESS, key, timestamp_ns=timestamp_ns))
+    return track
+
+
+class TestKeyTrack(unittest.TestCase):
+    """Test cases for KeyTrack and track merging."""
+    
+    def test_should_store_and_rebuild_actions(self):
+        """Test that a track round-trips its actions."""
+        track = make_track("main", "char:a", [0, 10])
+        track.set_duration(0, 5)
+        
+        sequence = track.to_sequence()
+        self.assertEqual(sequence.name, "main")
+        self.assertEqual([a.timestamp_ns for a in sequence.actions], [0, 10])
+        self.assertEqual(sequence.actions[0].duration_ns, 5)
+    
+    def test_should_merge_tracks_by_timestamp(self):
+        """Test k-way merge of several tracks."""
+        tracks = [make_track("a", "char:a", [0, 30, 60]),
+                  make_track("b", "char:b", [10, 40]),
+                  make_track("c", "char:c", [20])]
+        
+        merged = merge_tracks(tracks, "merged")
+        self.assertEqual([a.key for a in merged.actions],
+                         ["char:a", "char:b", "char:c", "char:a", "char:b", "char:a"])
+    
+    def test_should_merge_lazily(self):
+        """Test that merging streams instead of materializing the tracks."""
+        merged = iter_merged([make_track("a", "char:a", range(0, 1000, 2)),
+                              make_track("b", "char:b", range(1, 1000, 2))])
+        
+        self.assertEqual(next(merged).timestamp_ns, 0)
+        self.assertEqual(next(merged).timestamp_ns, 1)
+    
+    def test_should_route_recorded_keys_to_tracks(self):
+        """Test multi-track recording in KeyRecorder."""
+        recorder = KeyRecorder()
+        recorder.set_tracks({"left": ["char:a"]})
+        recorder.is_recording = True
+        a = keyboard.KeyCode.from_char('a')
+        b = keyboard.KeyCode.from_char('b')
+        recorder._process_event(EVENT_PRESS, a, 0)
+        recorder._process_event(EVENT_PRESS, b, 1)
+        recorder._process_event(EVENT_RELEASE, a, 5)
+        recorder._process_event(EVENT_RELEASE, b, 6)
+        
+        tracks = {track.name: track for track in recorder.get_tracks()}
+        self.assertEqual(len(tracks["left"]), 2)
+        self.assertEqual(tracks["left"].durations_ns[0], 5)
+        self.assertEqual(len(tracks["other"]), 2)
+        
+        sequence = recorder.stop_recording()
+        self.assertEqual([a.timestamp_ns for a in sequence.actions], [0, 1, 5, 6])
+        
+        # Merged tracks are released and rebuilt from the sequence on demand
+        self.assertFalse(any(recorder.tracks.values()))
+        tracks = {track.name: track for track in recorder.get_tracks()}
+        self.assertEqual(list(tracks["left"].timestamps_ns), [0, 5])
+        self.assertEqual(tracks["left"].durations_ns[0], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
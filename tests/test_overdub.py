@@ -0,0 +1,97 @@
+import unittest
+import time
+import sys
+import os
+from unittest.mock import patch
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from pynput import keyboard
+
+from core.injection_ledger import InjectionLedger
+from core.key_player import KeyPlayer
+from core.key_recorder import KeyRecorder
+from core.output_backend import RecordingBackend, EVENT_PRESS, EVENT_RELEASE
+from core.overdub import OverdubSession
+from data.key_sequence import KeySequence, KeyAction, ActionType
+from utils.key_registry import key_registry
+
+KEY_A = key_registry.intern("char:a")
+
+
+class TestInjectionLedger(unittest.TestCase):
+    """Test cases for InjectionLedger."""
+    
+    def test_should_claim_injected_event_once(self):
+        """Test that each injection matches one observed event."""
+        ledger = InjectionLedger()
+        ledger.record(EVENT_PRESS, KEY_A, 1000)
+        
+        self.assertFalse(ledger.claim(EVENT_RELEASE, KEY_A, 2000))
+        self.assertTrue(ledger.claim(EVENT_PRESS, KEY_A, 2000))
+        self.assertFalse(ledger.claim(EVENT_PRESS, KEY_A, 3000))
+    
+    def test_should_expire_unreported_injections(self):
+        """Test that a stale injection cannot hide a real key press."""
+        ledger = InjectionLedger(match_window_ms=1)
+        ledger.record(EVENT_PRESS, KEY_A, 0)
+        
+        self.assertFalse(ledger.claim(EVENT_PRESS, KEY_A, 5_000_000))
+        self.assertEqual(len(ledger), 0)
+
+
+class TestOverdubSession(unittest.TestCase):
+    """Test cases for OverdubSession."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.backend = RecordingBackend()
+        self.player = KeyPlayer(backend=self.backend)
+        self.recorder = KeyRecorder()
+        self.session = OverdubSession(self.recorder, self.player, lead_in_ms=0)
+        
+        self.base = KeySequence("base")
+        self.base.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", timestamp_ns=0))
+        self.base.add_action(KeyAction(ActionType.KEY_RELEASE, "char:a", timestamp_ns=20_000_000))
+    
+    def tearDown(self):
+        """Shut down the playback worker."""
+        self.player.shutdown()
+    
+    def _wait_for_playback(self, timeout: float = 5.0):
+        """Block until the player goes idle."""
+        deadline = time.time() + timeout
+        while self.player.is_playing and time.time() < deadline:
+            time.sleep(0.005)
+    
+    @patch('core.key_recorder.keyboard.Listener')
+    def test_should_record_only_real_input_over_playback(self, mock_listener):
+        """Test that injected keys are filtered and both layers merge."""
+        self.assertTrue(self.session.start(self.base))
+        self._wait_for_playback()
+        
+        # The hook reports our own injections, then the user plays a key
+        for event in self.backend.events:
+            if event.kind == EVENT_PRESS:
+                self.recorder._on_key_press(event.key)
+            else:
+                self.recorder._on_key_release(event.key)
+        self.recorder._on_key_press(keyboard.KeyCode.from_char('b'))
+        self.recorder._on_key_release(keyboard.KeyCode.from_char('b'))
+        
+        merged = self.session.stop()
+        
+        base, overdub = self.session.get_layers()
+        self.assertEqual([a.key for a in overdub], ["char:b", "char:b"])
+        self.assertEqual(list(base.timestamps_ns), [0, 20_000_000])
+        self.assertEqual([a.key for a in merged.actions], ["char:a", "char:a", "char:b", "char:b"])
+        self.assertIs(self.player.backend, self.backend)
+        self.assertEqual(self.session.ledger.claimed, 2)
+        mock_listener.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
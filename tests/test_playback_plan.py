@@ -0,0 +1,203 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from pynput import keyboard
+
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from core.playback_plan import (
+    compile_sequence, compile_faithful, OP_TAP, OP_CHORD, OP_PRESS, OP_RELEASE
+)
+from data.key_sequence import KeySequence, KeyAction, ActionType
+
+
+class TestCompileSequence(unittest.TestCase):
+    """Test cases for compile_sequence."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sequence = KeySequence()
+    
+    def test_should_space_presses_by_time_between_presses(self):
+        """Test default spacing between consecutive key presses."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.1))
+        
+        plan = compile_sequence(self.sequence, 20)
+        
+        self.assertEqual(list(plan.offsets_ns), [0, 20_000_000])
+        self.assertEqual(plan.period_ns, 40_000_000)
+        self.assertEqual(list(plan.opcodes), [OP_TAP, OP_TAP])
+    
+    def test_should_scale_repetition_gap_with_speed(self):
+        """Test that the pause before the next repetition is warped like the others."""
+        for i, key in enumerate("abcd"):
+            self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, f"char:{key}", i * 0.5))
+        
+        plan = compile_sequence(self.sequence, 500, speed=2.0)
+        self.assertEqual(list(plan.offsets_ns), [0, 250_000_000, 500_000_000, 750_000_000])
+        self.assertEqual(plan.period_ns, 1_000_000_000)
+        
+        plan = compile_sequence(self.sequence, 500, idle_threshold_ns=400_000_000,
+                                idle_max_ns=100_000_000)
+        self.assertEqual(plan.period_ns, 400_000_000)
+    
+    def test_should_use_explicit_delay_instead_of_default_spacing(self):
+        """Test that a DELAY action replaces the default spacing."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.DELAY, "", 0.25, 0.25))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.35))
+        
+        plan = compile_sequence(self.sequence, 20)
+        
+        self.assertEqual(list(plan.offsets_ns), [0, 250_000_000])
+        self.assertEqual(list(plan.action_indices), [0, 2])
+    
+    def test_should_resolve_combinations_once(self):
+        """Test that combos compile to a chord with modifiers first."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "combo:ctrl+c", 0.0))
+        
+        plan = compile_sequence(self.sequence, 20)
+        
+        self.assertEqual(plan.opcodes[0], OP_CHORD)
+        self.assertEqual(plan.keys[0],
+                         (keyboard.Key.ctrl, keyboard.KeyCode.from_char('c')))
+    
+    def test_should_ignore_key_releases(self):
+        """Test that recorded releases do not produce plan entries."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:a", 0.1))
+        
+        plan = compile_sequence(self.sequence, 20)
+        
+        self.assertEqual(len(plan), 1)
+
+    
+    def test_should_batch_events_due_at_same_deadline(self):
+        """Test that a zero delay merges presses into one batch."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.DELAY, "", 0.0, 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.0))
+        
+        plan = compile_sequence(self.sequence, 20)
+        
+        self.assertEqual(list(plan.batch_offsets_ns), [0])
+        self.assertEqual([kind for kind, key in plan.batch_events[0]],
+                         [EVENT_PRESS, EVENT_RELEASE, EVENT_PRESS, EVENT_RELEASE])
+    
+    def test_should_expand_chord_into_nested_events(self):
+        """Test that chords release in reverse order of pressing."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "combo:ctrl+shift+s", 0.0))
+        
+        plan = compile_sequence(self.sequence, 20)
+        
+        ctrl, shift, s = plan.keys[0]
+        self.assertEqual(plan.batch_events[0], (
+            (EVENT_PRESS, ctrl), (EVENT_PRESS, shift), (EVENT_PRESS, s),
+            (EVENT_RELEASE, s), (EVENT_RELEASE, shift), (EVENT_RELEASE, ctrl)
+        ))
+
+
+
+class TestCompileFaithful(unittest.TestCase):
+    """Test cases for compile_faithful."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sequence = KeySequence()
+    
+    def test_should_replay_overlapping_holds_at_recorded_offsets(self):
+        """Test that presses and releases keep their recorded timing."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "key:shift", 1.0, 0.3))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 1.1, 0.1))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:a", 1.2))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "key:shift", 1.3))
+        
+        plan = compile_faithful(self.sequence, 20)
+        
+        self.assertEqual(list(plan.opcodes), [OP_PRESS, OP_PRESS, OP_RELEASE, OP_RELEASE])
+        self.assertEqual(list(plan.offsets_ns),
+                         [0, 100_000_000, 200_000_000, 300_000_000])
+        self.assertEqual(plan.period_ns, 320_000_000)
+    
+    def test_should_synthesise_release_from_duration(self):
+        """Test that an unreleased press is released after its duration."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0, 0.5))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.1))
+        
+        plan = compile_faithful(self.sequence, 20)
+        
+        self.assertEqual(list(plan.opcodes), [OP_PRESS, OP_TAP, OP_RELEASE])
+        self.assertEqual(plan.offsets_ns[-1], 500_000_000)
+    
+    def test_should_drop_stray_releases_and_repeats(self):
+        """Test that unmatched releases and auto-repeat presses are ignored."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:x", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.1))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.2))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:a", 0.3))
+        
+        plan = compile_faithful(self.sequence, 20)
+        
+        self.assertEqual(list(plan.opcodes), [OP_PRESS, OP_RELEASE])
+    
+    def test_should_report_keys_held_at_interruption(self):
+        """Test held key tracking for interrupted playback."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.1))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:a", 0.2))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:b", 0.3))
+        
+        plan = compile_faithful(self.sequence, 20)
+        
+        self.assertEqual(plan.held_keys_after(2), [plan.keys[0][0], plan.keys[1][0]])
+        self.assertEqual(plan.held_keys_after(3), [plan.keys[1][0]])
+    
+    def test_should_seek_by_action_across_checkpoints(self):
+        """Test batch lookup by action index and held keys far into a long plan."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "key:shift", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.DELAY, "", 0.001, 0.001))
+        for i in range(1, 300):
+            self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", i * 0.01))
+            self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "char:a", i * 0.01 + 0.005))
+        self.sequence.add_action(KeyAction(ActionType.KEY_RELEASE, "key:shift", 6.0))
+        
+        plan = compile_faithful(self.sequence, 20)
+        
+        self.assertEqual(plan.batch_for_action(0), 0)
+        self.assertEqual(plan.batch_for_action(1), 1)
+        self.assertEqual(plan.batch_for_action(60), 59)
+        self.assertEqual(plan.batch_for_action(len(self.sequence)), len(plan.batch_offsets_ns))
+        self.assertEqual(plan.held_keys_after(551), [plan.keys[0][0]])
+        self.assertEqual(len(plan.held_keys_after(550)), 2)
+        self.assertEqual(plan.held_keys_after(len(plan.batch_offsets_ns)), [])
+
+    
+    def test_should_scale_gaps_by_playback_speed(self):
+        """Test that the speed factor is applied at compile time."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 1.0))
+        
+        plan = compile_faithful(self.sequence, 20, speed=4.0)
+        
+        self.assertEqual(list(plan.offsets_ns), [0, 250_000_000])
+    
+    def test_should_clamp_idle_gaps(self):
+        """Test that long idle gaps are warped down to the maximum."""
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:a", 0.0))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:b", 0.1))
+        self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, "char:c", 600.1))
+        
+        plan = compile_faithful(self.sequence, 20, idle_threshold_ns=2_000_000_000,
+                                idle_max_ns=500_000_000)
+        
+        self.assertEqual(list(plan.offsets_ns), [0, 100_000_000, 600_000_000])
+
+
+if __name__ == '__main__':
+    unittest.main()
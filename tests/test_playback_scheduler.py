@@ -0,0 +1,95 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.playback_scheduler import DeadlineScheduler
+from core.precision_timer import PrecisionTimer
+
+
+class TestDeadlineScheduler(unittest.TestCase):
+    """Test cases for DeadlineScheduler class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stop_event = threading.Event()
+        self.scheduler = DeadlineScheduler(self.stop_event)
+    
+    def test_should_anchor_deadlines_to_origin(self):
+        """Test that deadlines are absolute offsets from the origin."""
+        self.scheduler.start(origin_ns=1_000)
+        
+        self.assertEqual(self.scheduler.deadline(500), 1_500)
+    
+    def test_should_absorb_overshoot_instead_of_accumulating(self):
+        """Test that a late action does not delay later deadlines."""
+        self.scheduler.start()
+        
+        # Simulate an action that overruns its 5 ms slot by 15 ms
+        time.sleep(0.02)
+        self.assertTrue(self.scheduler.wait_until(5_000_000))
+        first_late_ns = time.perf_counter_ns() - self.scheduler.deadline(5_000_000)
+        self.assertTrue(self.scheduler.wait_until(60_000_000))
+        second_late_ns = time.perf_counter_ns() - self.scheduler.deadline(60_000_000)
+        
+        elapsed_ns = time.perf_counter_ns() - self.scheduler.origin_ns
+        self.assertGreaterEqual(first_late_ns, 10_000_000)
+        self.assertLess(second_late_ns, first_late_ns)
+        self.assertLess(elapsed_ns, 80_000_000)
+    
+    def test_should_never_wake_before_deadline(self):
+        """Test that waits never complete early."""
+        self.scheduler.start()
+        
+        for i in range(1, 6):
+            self.scheduler.wait_until(i * 2_000_000)
+            deadline = self.scheduler.deadline(i * 2_000_000)
+            self.assertGreaterEqual(time.perf_counter_ns(), deadline)
+    
+    def test_should_return_false_when_stopped(self):
+        """Test that a stop request interrupts the wait."""
+        self.scheduler.start()
+        self.stop_event.set()
+        
+        self.assertFalse(self.scheduler.wait_until(10_000_000_000))
+
+
+
+class TestPrecisionTimer(unittest.TestCase):
+    """Test cases for PrecisionTimer class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stop_event = threading.Event()
+        self.timer = PrecisionTimer(self.stop_event, spin_margin_ns=2_000_000)
+    
+    def test_should_report_accuracy_stats(self):
+        """Test that completed waits are reflected in the stats."""
+        for _ in range(3):
+            self.assertTrue(self.timer.wait(0.001))
+        
+        stats = self.timer.get_stats()
+        self.assertEqual(stats['waits'], 3)
+        self.assertGreaterEqual(stats['max_error_us'], stats['mean_error_us'])
+        self.assertEqual(stats['spin_margin_ms'], 2.0)
+    
+    def test_should_stop_during_spin_phase(self):
+        """Test that a stop request ends the spin phase promptly."""
+        self.timer.spin_margin_ns = 1_000_000_000
+        threading.Timer(0.02, self.stop_event.set).start()
+        
+        start = time.perf_counter()
+        result = self.timer.wait(1.0)
+        
+        self.assertFalse(result)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
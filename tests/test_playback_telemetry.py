@@ -0,0 +1,60 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.playback_telemetry import PlaybackTelemetry
+
+
+class TestPlaybackTelemetry(unittest.TestCase):
+    """Test cases for PlaybackTelemetry class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.telemetry = PlaybackTelemetry(capacity=4)
+    
+    def test_should_compute_lateness_percentiles(self):
+        """Test percentiles, drift and rate over recorded events."""
+        for i, late_us in enumerate([10, 20, 30, 40]):
+            scheduled = i * 1_000_000
+            self.telemetry.record(scheduled, scheduled + late_us * 1000)
+        
+        summary = self.telemetry.summary()
+        self.assertEqual(summary['events'], 4)
+        self.assertEqual(summary['p50_lateness_us'], 30.0)
+        self.assertEqual(summary['p99_lateness_us'], 40.0)
+        self.assertEqual(summary['max_drift_us'], 40.0)
+        self.assertGreater(summary['events_per_sec'], 0)
+    
+    def test_should_keep_most_recent_events_when_full(self):
+        """Test that the ring buffer overwrites the oldest events."""
+        for i in range(6):
+            self.telemetry.record(0, i)
+        
+        self.assertEqual(self.telemetry.get_lateness(), [2, 3, 4, 5])
+        self.assertEqual(self.telemetry.summary()['events'], 6)
+    
+    def test_should_export_summary_and_rows(self):
+        """Test JSON summary and CSV per-event exports."""
+        self.telemetry.record(0, 500)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'run.json')
+            csv_path = os.path.join(directory, 'run.csv')
+            
+            self.assertTrue(self.telemetry.export(json_path))
+            self.assertTrue(self.telemetry.export(csv_path))
+            
+            with open(json_path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['events'], 1)
+            with open(csv_path, encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), ['scheduled_ns,actual_ns,lateness_ns', '0,500,500'])
+
+
+if __name__ == '__main__':
+    unittest.main()
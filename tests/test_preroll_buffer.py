@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.preroll_buffer import PrerollBuffer
+
+
+class TestPrerollBuffer(unittest.TestCase):
+    """Test cases for PrerollBuffer class."""
+    
+    def test_should_keep_most_recent_events(self):
+        """Test that the oldest events are overwritten when full."""
+        buffer = PrerollBuffer(capacity=3, window_seconds=60)
+        for i in range(5):
+            buffer.push(0, f"k{i}", i)
+        
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual([key for _, key, _ in buffer.snapshot(10)], ["k2", "k3", "k4"])
+    
+    def test_should_limit_snapshot_to_time_window(self):
+        """Test that events older than the window are left out."""
+        buffer = PrerollBuffer(capacity=10, window_seconds=1)
+        buffer.push(0, "old", 0)
+        buffer.push(0, "new", 1_500_000_000)
+        
+        self.assertEqual([key for _, key, _ in buffer.snapshot(2_000_000_000)], ["new"])
+    
+    def test_should_clear(self):
+        """Test clearing the buffer."""
+        buffer = PrerollBuffer(capacity=4)
+        buffer.push(0, "a", 0)
+        buffer.clear()
+        
+        self.assertEqual(buffer.snapshot(0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
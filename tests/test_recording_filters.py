@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from utils.key_registry import key_registry
+from core.recording_filters import (
+    RecordingFilterChain, HotkeyFilter, KeyListFilter, DebounceFilter,
+    ModifierNoiseFilter, parse_hotkey
+)
+
+P, R = EVENT_PRESS, EVENT_RELEASE
+
+
+def run_chain(chain, events):
+    """Feed (kind, key_code) events 1 ms apart and collect the survivors."""
+    passed = []
+    for i, (kind, key_code) in enumerate(events):
+        survivors = chain.process(kind, key_registry.intern(key_code), i * 1_000_000)
+        passed.extend((k, key_registry.code(key_id)) for k, key_id, _ in survivors)
+    return passed
+
+
+class TestRecordingFilters(unittest.TestCase):
+    """Test cases for recording filter stages."""
+    
+    def test_should_parse_hotkey_strings(self):
+        """Test hotkey parsing into main key and modifiers."""
+        self.assertEqual(parse_hotkey("F1"), ("key:f1", frozenset()))
+        self.assertEqual(parse_hotkey("Ctrl+Shift+A"), ("char:a", frozenset({'ctrl', 'shift'})))
+    
+    def test_should_exclude_hotkeys_only_with_their_modifiers(self):
+        """Test that Ctrl+F2 is dropped but a plain F2 is kept."""
+        chain = RecordingFilterChain([HotkeyFilter(["F1", "Ctrl+F2"])])
+        events = [(P, "key:f1"), (R, "key:f1"),
+                  (P, "key:f2"), (R, "key:f2"),
+                  (P, "key:ctrl_l"), (P, "key:f2"), (R, "key:f2"), (R, "key:ctrl_l")]
+        
+        self.assertEqual(run_chain(chain, events),
+                         [(P, "key:f2"), (R, "key:f2"), (P, "key:ctrl_l"), (R, "key:ctrl_l")])
+        self.assertEqual(chain.get_stats(), {'hotkeys': 4})
+    
+    def test_should_apply_allow_and_deny_lists(self):
+        """Test key allow/deny filtering."""
+        chain = RecordingFilterChain([KeyListFilter(allow=["char:a", "char:b"], deny=["char:b"])])
+        events = [(P, "char:a"), (P, "char:b"), (P, "char:c")]
+        
+        self.assertEqual(run_chain(chain, events), [(P, "char:a")])
+        self.assertEqual(chain.get_stats()['key_list'], 2)
+    
+    def test_should_debounce_chattering_key(self):
+        """Test that a bounce right after a release is dropped with its release."""
+        chain = RecordingFilterChain([DebounceFilter(window_ms=5)])
+        events = [(P, "char:a"), (R, "char:a"), (P, "char:a"), (R, "char:a")]
+        
+        self.assertEqual(run_chain(chain, events), [(P, "char:a"), (R, "char:a")])
+        self.assertEqual(chain.get_stats()['debounce'], 2)
+    
+    def test_should_drop_lone_modifiers_but_keep_combinations(self):
+        """Test modifier-only noise filtering."""
+        chain = RecordingFilterChain([ModifierNoiseFilter()])
+        events = [(P, "key:shift_l"), (P, "key:shift_l"), (R, "key:shift_l"),
+                  (P, "key:ctrl_l"), (P, "char:c"), (R, "char:c"), (R, "key:ctrl_l")]
+        
+        self.assertEqual(run_chain(chain, events),
+                         [(P, "key:ctrl_l"), (P, "char:c"), (R, "char:c"), (R, "key:ctrl_l")])
+        self.assertEqual(chain.get_stats()['modifier_noise'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from pynput import keyboard
+
+from core.key_recorder import KeyRecorder
+from core.output_backend import EVENT_PRESS, EVENT_RELEASE
+from data.key_sequence import KeyAction, ActionType
+from data.recording_journal import RecordingJournal
+
+
+class TestRecordingJournal(unittest.TestCase):
+    """Test cases for RecordingJournal class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'journal', 'recording.jsonl')
+        self.journal = RecordingJournal(self.path, flush_interval=0.01)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.journal.close()
+        self.directory.cleanup()
+    
+    def test_should_recover_finished_journal(self):
+        """Test that a closed journal rebuilds the sequence with hold durations."""
+        self.assertTrue(self.journal.open("session"))
+        self.journal.append(KeyAction(ActionType.KEY_PRESS, "char:a", timestamp_ns=1_000))
+        self.journal.append(KeyAction(ActionType.KEY_RELEASE, "char:a", timestamp_ns=5_000))
+        self.journal.close()
+        
+        sequence = RecordingJournal.recover(self.path)
+        self.assertEqual(sequence.name, "session")
+        self.assertEqual(len(sequence), 2)
+        self.assertEqual(sequence.actions[0].duration_ns, 4_000)
+    
+    def test_should_ignore_truncated_last_line(self):
+        """Test that an interrupted journal is still recoverable."""
+        self.journal.open()
+        self.journal.append(KeyAction(ActionType.KEY_PRESS, "char:a", timestamp_ns=1_000))
+        self.journal.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"action_type": "key_pr')
+        
+        sequence = RecordingJournal.recover(self.path)
+        self.assertEqual(len(sequence), 1)
+    
+    def test_should_write_actions_as_appended(self):
+        """Test that changing an action after appending it doesn't change the journal."""
+        self.journal.open()
+        press = KeyAction(ActionType.KEY_PRESS, "char:a", timestamp_ns=1_000)
+        self.journal.append(press)
+        press.duration_ns = 9_000
+        self.journal.close()
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            record = json.loads(f.read().splitlines()[1])
+        self.assertEqual(record['duration_ns'], 0)
+    
+    def test_should_discard_journal_file(self):
+        """Test that discarding removes the file."""
+        self.journal.open()
+        self.journal.discard()
+        
+        self.assertFalse(RecordingJournal.exists(self.path))
+        self.assertIsNone(RecordingJournal.recover(self.path))
+    
+    def test_should_bound_recorder_memory_and_reload_on_stop(self):
+        """Test that the recorder keeps a window in memory and reloads on stop."""
+        recorder = KeyRecorder()
+        recorder.set_journal(True, self.path, window=4)
+        recorder.journal.flush_interval = 0.01
+        recorder.journal.open()
+        recorder.is_recording = True
+        
+        key = keyboard.KeyCode.from_char('a')
+        for i in range(10):
+            recorder._process_event(EVENT_PRESS, key, i * 2)
+            recorder._process_event(EVENT_RELEASE, key, i * 2 + 1)
+            self.assertLess(len(recorder.current_sequence), 8)
+        
+        recorder.stop_recording()
+        self.assertEqual(len(recorder.current_sequence), 20)
+        self.assertEqual(recorder.current_sequence.actions[0].duration_ns, 1)
+    
+    def test_should_bound_each_track_by_the_window(self):
+        """Test that track recordings are trimmed too and reloaded whole on stop."""
+        recorder = KeyRecorder()
+        recorder.set_tracks({"left": ["char:a"]})
+        recorder.set_journal(True, self.path, window=4)
+        recorder.journal.flush_interval = 0.01
+        recorder.journal.open()
+        recorder.is_recording = True
+        
+        for i in range(10):
+            for j, char in enumerate("ab"):
+                key = keyboard.KeyCode.from_char(char)
+                recorder._process_event(EVENT_PRESS, key, i * 4 + j)
+                recorder._process_event(EVENT_RELEASE, key, i * 4 + j + 2)
+            for track in recorder.tracks.values():
+                self.assertLess(len(track), 8)
+        
+        sequence = recorder.stop_recording()
+        self.assertEqual(len(sequence), 40)
+        self.assertFalse(any(recorder.tracks.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
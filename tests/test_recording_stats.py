@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.recording_stats import RecordingStats
+
+SECOND = 1_000_000_000
+
+
+class TestRecordingStats(unittest.TestCase):
+    """Test cases for RecordingStats class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stats = RecordingStats(window_seconds=2, lag_smoothing=1.0)
+    
+    def test_should_compute_rolling_key_rate(self):
+        """Test that only presses inside the window are counted."""
+        for i in range(10):
+            self.stats.record(i * SECOND // 10, i * SECOND // 10, True)
+        self.assertAlmostEqual(self.stats.snapshot(SECOND)['keys_per_sec'], 10.0)
+        
+        # Three seconds later the burst has left the window
+        self.assertEqual(self.stats.snapshot(5 * SECOND)['keys_per_sec'], 0.0)
+    
+    def test_should_track_lag_and_reset_worst_per_snapshot(self):
+        """Test lag average and per-interval maximum."""
+        self.stats.record(0, 4_000_000, False)
+        self.stats.record(0, 1_000_000, False)
+        
+        snapshot = self.stats.snapshot(SECOND)
+        self.assertEqual(snapshot['lag_avg_ms'], 1.0)
+        self.assertEqual(snapshot['lag_max_ms'], 4.0)
+        self.assertEqual(self.stats.snapshot(SECOND)['lag_max_ms'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import time
+import sys
+import os
+import json
+import tempfile
+
+# Add src directory to path for imports
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.key_player import KeyPlayer
+from core.output_backend import RecordingBackend, EVENT_PRESS
+from core.playback_plan import compile_sequence
+from data.action_storage import ActionStorage
+from data.key_sequence import KeySequence, KeyAction, ActionType
+from data.sequence_view import SequenceView
+
+
+class TestSequenceView(unittest.TestCase):
+    """Test cases for SequenceView."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sequence = KeySequence("parent")
+        for i in range(10):
+            self.sequence.add_action(KeyAction(ActionType.KEY_PRESS, f"char:{chr(ord('a') + i)}", i * 0.1))
+    
+    def keys(self, sequence):
+        """Get the key characters of a sequence's actions."""
+        return [action.key[-1] for action in sequence]
+    
+    def test_should_view_range_without_copying(self):
+        """Test that a view reads through to the parent's storage."""
+        view = SequenceView(self.sequence, 2, 5)
+        
+        self.assertEqual(self.keys(view), ["c", "d", "e"])
+        self.assertEqual(view.get_duration_ns(), 200_000_000)
+        self.assertEqual(view.get_summary()['key_count'], 3)
+        self.assertEqual(view.index_at_time(300_000_000), 1)
+        
+        self.sequence.set_duration_ns(3, 7)
+        self.assertEqual(view.actions[1].duration_ns, 7)
+        self.assertFalse(view.is_materialized)
+    
+    def test_should_view_strided_ranges_and_views_of_views(self):
+        """Test strides of ranges and flattening of nested views."""
+        view = SequenceView.strided(self.sequence, 0, 2, 4)
+        self.assertEqual(self.keys(view), ["a", "b", "e", "f", "i", "j"])
+        
+        nested = SequenceView(view, 1, 5)
+        self.assertIs(nested.parent, self.sequence)
+        self.assertEqual(self.keys(nested), ["b", "e", "f", "i"])
+        self.assertEqual(nested.time_at_index(-1), 800_000_000)
+    
+    def test_should_cache_time_index_until_written(self):
+        """Test that an out-of-order view builds its time order once."""
+        view = SequenceView.from_ranges(self.sequence, [(5, 8), (0, 3)])
+        
+        self.assertEqual(view.index_at_time(550_000_000), 1)
+        order = view._time_order
+        self.assertEqual(view.index_at_time(100_000_000), 4)
+        self.assertIs(view._time_order, order)
+        
+        view.set_duration_ns(0, 1)
+        view.delete_actions(0)
+        self.assertIsNone(view._time_order)
+        self.assertEqual(view.index_at_time(550_000_000), 0)
+    
+    def test_should_copy_on_write(self):
+        """Test that changing a view copies it and leaves the parent alone."""
+        view = SequenceView(self.sequence, 0, 3)
+        
+        view.actions[0] = KeyAction(ActionType.KEY_PRESS, "char:z", 0.0)
+        
+        self.assertTrue(view.is_materialized)
+        self.assertEqual(self.keys(view), ["z", "b", "c"])
+        self.assertEqual(self.sequence.actions[0].key, "char:a")
+        self.assertEqual(view.get_key_histogram(), {"char:z": 1, "char:b": 1, "char:c": 1})
+    
+    def test_should_compile_play_and_export_views(self):
+        """Test that the compiler, player and storage accept a view."""
+        view = SequenceView(self.sequence, 7)
+        self.assertEqual(len(compile_sequence(view, 20).offsets_ns), 3)
+        
+        backend = RecordingBackend()
+        player = KeyPlayer(backend=backend)
+        player.set_timing(1)
+        self.assertTrue(player.start_playback(view))
+        deadline = time.time() + 5.0
+        while player.is_playing and time.time() < deadline:
+            time.sleep(0.005)
+        pressed = [event.key.char for event in backend.events if event.kind == EVENT_PRESS]
+        self.assertEqual(pressed, ["h", "i", "j"])
+        
+        with tempfile.TemporaryDirectory() as directory:
+            storage = ActionStorage(directory)
+            self.assertTrue(storage.save_sequence(view, "view.json"))
+            with open(os.path.join(directory, "view.json"), encoding='utf-8') as f:
+                data = json.load(f)
+        self.assertEqual(data['summary']['action_count'], 3)
+        self.assertEqual(len(data['sequence']['actions']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()